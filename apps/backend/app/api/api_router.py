@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.endpoints import companies, reports, news,analytics
+from app.api.endpoints import companies, reports, news,analytics, admin, bundle
 
 # 전체 API 라우터 생성
 api_router = APIRouter()
@@ -8,5 +8,7 @@ api_router = APIRouter()
 # tags: Swagger UI(/docs)에서 API를 그룹핑해서 보여줄 이름입니다.
 api_router.include_router(companies.router, tags=["Companies"])
 api_router.include_router(reports.router, tags=["Report"])
+api_router.include_router(bundle.router, tags=["Report"])
 api_router.include_router(news.router, tags=["News"])
-api_router.include_router(analytics.router,prefix="/analytics", tags=["Analytics"])
\ No newline at end of file
+api_router.include_router(analytics.router,prefix="/analytics", tags=["Analytics"])
+api_router.include_router(admin.router, tags=["Admin"])
@@ -0,0 +1,169 @@
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple
+from urllib.parse import urlparse
+from google.cloud import bigquery
+
+from app.schemas.response_dto import NewsDetailResponse
+from app.api.deps import run_query, PROJECT_ID, DATASET_ID, COMBINED_TABLE_NAME, ARTICLE_DETAIL_TABLE_NAME
+from app.api.cache import RESPONSE_CACHE_TTL
+
+# =========================================================
+# [기사 상세 서빙] article_id -> 상세 응답을 LRU 캐시에 보관하고, 없는 것만 한 번의 쿼리로 모아서 읽습니다.
+#   - 읽는 곳 : TABLE_ARTICLE_DETAIL (article_id 클러스터링, 본문 앞 300자만) / 없으면 통합 뷰
+#   - 여러 건 : WHERE article_id IN UNNEST(@ids) -> /news?ids=1,2,3 와 목록 화면 미리 읽기(prefetch)가 같은 경로 사용
+#   - 무효화 : 데이터 버전(적재 테이블 수정 시각)이 바뀌면 응답 캐시와 함께 비움
+#   - TTL : summary / career_insight / sentiment는 적재 후에 채워지므로 응답 캐시와 같은 TTL(RESPONSE_CACHE_TTL)
+#           아직 요약(summary)이 없는 기사는 캐시하지 않음 (채워지는 즉시 다음 조회에 반영)
+# =========================================================
+ARTICLE_CACHE_MAX_ENTRIES = int(os.getenv("ARTICLE_CACHE_MAX_ENTRIES", "20000"))
+MAX_BATCH_IDS = 100 # 쿼리 한 번에 조회할 최대 기사 수 (/news?ids= 요청 상한과 같음)
+
+
+def _to_news_detail(article: bigquery.Row) -> NewsDetailResponse:
+    #URL 파싱
+    source_name = "언론사"
+    if article.url:
+        try:
+            source_name = urlparse(article.url).netloc.replace("www.", "")
+        except:
+            pass
+
+    # 요약 우선 순위 : career_insight 컬럼 -> summary 컬럼 -> 본문 300자(혹시 모를)
+    final_summary = "요약 없음"
+
+    if article.career_insight:
+        final_summary = article.career_insight
+    elif article.summary:
+        # 요약이 너무 길 경우를 대비해 300자로 자름
+        final_summary = article.summary[:300] + ("..." if len(article.summary) > 300 else "")
+    elif article.content_head:
+        final_summary = article.content_head + "..."
+
+    return NewsDetailResponse(
+        article_id=article.article_id,
+        title=article.title,
+        source=source_name,
+        published_at=article.published_at,
+        sentiment=article.sentiment if article.sentiment else "중립",
+        key_summary=final_summary,
+        ai_summary=article.summary,
+        original_link=article.url
+    )
+
+
+def fetch_article_details(client: bigquery.Client, article_ids: List[int]) -> Dict[int, NewsDetailResponse]:
+    """article_id 목록을 쿼리 한 번으로 조회 (없는 기사는 결과에서 빠짐)"""
+    if ARTICLE_DETAIL_TABLE_NAME:
+        table_id = f"{PROJECT_ID}.{DATASET_ID}.{ARTICLE_DETAIL_TABLE_NAME}"
+        content_head = "content_head"
+    else:
+        table_id = f"{PROJECT_ID}.{DATASET_ID}.{COMBINED_TABLE_NAME}"
+        content_head = "SUBSTR(content, 1, 300) AS content_head" # 본문 전체는 전송하지 않음
+
+    sql = f"""
+        SELECT
+            article_id,
+            title,
+            {content_head},
+            published_at,
+            url,
+            summary,
+            career_insight,
+            sentiment
+        FROM `{table_id}`
+        WHERE article_id IN UNNEST(@article_ids)
+    """
+    job_config = bigquery.QueryJobConfig(
+        query_parameters=[
+            # 정렬해서 넘겨야 같은 id 묶음이 같은 쿼리로 합쳐짐 (single-flight)
+            bigquery.ArrayQueryParameter("article_ids", "INT64", sorted(article_ids))
+        ]
+    )
+
+    details = {}
+    for row in run_query(client, sql, job_config):
+        details.setdefault(row.article_id, _to_news_detail(row)) # 뷰에 같은 기사가 여러 행이면 첫 행
+    return details
+
+
+def _is_enriched(detail: NewsDetailResponse) -> bool:
+    """요약 생성이 끝난 기사인지 (summary가 NULL이면 아직 보강 전)"""
+    return detail.ai_summary is not None
+
+
+class ArticleCache:
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.version = 1
+        self._entries: "OrderedDict[int, Tuple[float, NewsDetailResponse]]" = OrderedDict() # id -> (저장 시각, 상세)
+        self._lock = threading.Lock()
+        self._prefetcher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="article-prefetch")
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(
+        self, article_ids: List[int], fetch: Callable[[List[int]], Dict[int, NewsDetailResponse]]
+    ) -> Dict[int, NewsDetailResponse]:
+        """캐시에 있는 기사는 바로, 없는 기사만 fetch()로 MAX_BATCH_IDS개씩 모아서 읽습니다."""
+        found: Dict[int, NewsDetailResponse] = {}
+        missing: List[int] = []
+        now = time.monotonic()
+        with self._lock:
+            version = self.version
+            for article_id in article_ids:
+                entry = self._entries.get(article_id)
+                if entry is not None and now - entry[0] < self.ttl:
+                    self._entries.move_to_end(article_id)
+                    found[article_id] = entry[1]
+                elif article_id not in missing:
+                    missing.append(article_id)
+            self.hits += len(found)
+            self.misses += len(missing)
+
+        for start in range(0, len(missing), MAX_BATCH_IDS):
+            fetched = fetch(missing[start:start + MAX_BATCH_IDS])
+            found.update(fetched)
+            self._store(version, fetched)
+        return found
+
+    def prefetch(self, article_ids: List[int], fetch: Callable[[List[int]], Dict[int, NewsDetailResponse]]) -> None:
+        """목록 응답 직후 백그라운드에서 상세를 미리 캐시 (사용자가 기사를 누를 때는 캐시 적중)"""
+        def run():
+            try:
+                self.get_many(article_ids, fetch)
+            except Exception as e:
+                logging.warning(f"Article prefetch failed: {e}")
+        self._prefetcher.submit(run)
+
+    def _store(self, version: int, details: Dict[int, NewsDetailResponse]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if version != self.version:
+                return # 조회 도중 무효화됨
+            for article_id, detail in details.items():
+                if not _is_enriched(detail):
+                    self._entries.pop(article_id, None) # 보강 전 기사는 다음 조회 때 다시 읽음
+                    continue
+                self._entries[article_id] = (now, detail)
+                self._entries.move_to_end(article_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# 프로세스 전체 공유 캐시
+article_cache = ArticleCache(ARTICLE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL)
@@ -0,0 +1,143 @@
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Hashable, Tuple
+
+# =========================================================
+# [응답 캐시] 리포트/분석 API 응답을 프로세스 메모리에 보관합니다.
+# 데이터는 하루 한 번 적재 파이프라인이 돌 때만 바뀌므로, 같은 기업을 다시 조회하면 빅쿼리를 거치지 않습니다.
+#   - 키 : (엔드포인트, 정규화된 파라미터, 날짜 버킷, 데이터 버전)
+#   - LRU : 항목 수 상한(RESPONSE_CACHE_MAX_ENTRIES) 초과 시 가장 오래 안 쓴 항목부터 제거
+#   - TTL : RESPONSE_CACHE_TTL 초 동안은 그대로 반환 (fresh)
+#   - stale-while-revalidate : TTL이 지나도 RESPONSE_CACHE_STALE_TTL 초 안이면 이전 응답을 즉시 반환하고
+#                              백그라운드 스레드에서 새로 계산해 교체
+#   - 데이터 버전 : 적재 대상 테이블들의 마지막 수정 시각(ms) (data_version.py가 주기적으로 확인)
+#                   -> 모든 인스턴스가 같은 값을 보므로, 적재 후 모든 인스턴스의 캐시가 바뀌고 ETag도 같아짐
+#   - 무효화 : 버전이 바뀌면 apply_data_version()이 전체 삭제. POST /api/cache/invalidate는 즉시 확인 + 삭제
+# =========================================================
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2048"))
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "3600"))          # 1시간
+RESPONSE_CACHE_STALE_TTL = float(os.getenv("RESPONSE_CACHE_STALE_TTL", "86400")) # 하루 (다음 적재 전까지)
+CACHE_INVALIDATE_TOKEN = os.getenv("CACHE_INVALIDATE_TOKEN") # 무효화 API 인증 토큰 (없으면 무효화 API 비활성화)
+
+
+def normalize_name(name: str) -> str:
+    """캐시 키용 기업명 정규화 (앞뒤 공백 제거, 연속 공백 하나로)"""
+    return " ".join(name.split())
+
+
+def day_bucket() -> str:
+    """시간 범위 조건(최근 7일, 3개월 등)을 하루 단위로 고정하기 위한 날짜 버킷"""
+    return date.today().isoformat()
+
+
+def days_ago(days: int) -> datetime:
+    """오늘 0시 기준 days일 전 (datetime.now() 기준이면 호출마다 파라미터가 달라져 캐시가 맞지 않음)"""
+    return datetime.combine(date.today(), datetime.min.time()) - timedelta(days=days)
+
+
+class _Entry:
+    __slots__ = ("value", "created_at", "refreshing")
+
+    def __init__(self, value: Any):
+        self.value = value
+        self.created_at = time.monotonic()
+        self.refreshing = False
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int, ttl: float, stale_ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.data_version = 0 # 0: 아직 공유 데이터 버전을 확인하기 전 (기동 직후)
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(max_workers=4, thread_name_prefix="cache-refresh")
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def make_key(self, endpoint: str, *params: Hashable) -> Tuple:
+        return (endpoint, params, day_bucket(), self.data_version)
+
+    def get_or_compute(self, key: Tuple, compute: Callable[[], Any]) -> Any:
+        """
+        캐시된 응답을 반환하거나, 없으면 compute()로 만들어 저장합니다.
+        compute()에서 난 예외(404 등)는 캐시하지 않고 그대로 전달합니다.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = now - entry.created_at
+                if age < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry.value
+                if age < self.ttl + self.stale_ttl:
+                    self._entries.move_to_end(key)
+                    self.stale_hits += 1
+                    if not entry.refreshing:
+                        entry.refreshing = True
+                        self._refresher.submit(self._refresh, key, compute)
+                    return entry.value
+                del self._entries[key] # 너무 오래됨
+            self.misses += 1
+
+        value = compute()
+        self._store(key, value)
+        return value
+
+    def _refresh(self, key: Tuple, compute: Callable[[], Any]) -> None:
+        try:
+            self._store(key, compute())
+        except Exception as e:
+            logging.warning(f"Background cache refresh failed for {key[0]}: {e}")
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.refreshing = False # 다음 요청에서 다시 시도
+
+    def _store(self, key: Tuple, value: Any) -> None:
+        with self._lock:
+            if key[-1] != self.data_version:
+                return # 계산 도중 무효화됨 -> 이전 데이터 버전의 결과는 저장하지 않음
+            self._entries[key] = _Entry(value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def apply_data_version(self, version: int) -> bool:
+        """공유 상태에서 읽은 데이터 버전으로 맞춥니다. 바뀌었으면 모든 항목을 제거하고 True"""
+        with self._lock:
+            if version == self.data_version:
+                return False
+            self.data_version = version # 계산 중이던 이전 버전 결과는 _store에서 버려짐
+            self._entries.clear()
+            return True
+
+    def invalidate(self) -> int:
+        """모든 항목을 제거합니다. (데이터 버전은 공유 상태에서만 바뀜, 현재 버전 반환)"""
+        with self._lock:
+            self._entries.clear()
+            return self.data_version
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "data_version": self.data_version,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+            }
+
+
+# 프로세스 전체 공유 캐시
+response_cache = ResponseCache(RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL, RESPONSE_CACHE_STALE_TTL)
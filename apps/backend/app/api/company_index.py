@@ -0,0 +1,165 @@
+import os
+import heapq
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+from google.cloud import bigquery
+from app.api.deps import PROJECT_ID, DATASET_ID, COMBINED_TABLE_NAME, SUMMARY_TABLE_NAME
+
+# =========================================================
+# [기업명 자동완성 인덱스] 기업명 목록을 메모리에 올려두고 빅쿼리 없이 검색합니다.
+#   - 부분 문자열 검색 : 글자 bigram 역색인으로 후보를 좁힌 뒤 확인 ("전자" -> 삼성전자, LG전자)
+#   - 초성 검색       : "ㅅㅅㅈㅈ" -> 삼성전자
+#   - 순위            : 완전 일치 > 앞부분 일치 > 중간 일치, 같은 순위는 기사 수가 많은 기업 먼저
+#   - company_id     : 기업명 해시로 만든 고정 값 (프로세스/재시작과 무관하게 같은 기업은 같은 id)
+# 앱 시작 시 백그라운드에서 로드하고 COMPANY_INDEX_REFRESH_SECONDS마다 다시 읽습니다. (main.py lifespan)
+# =========================================================
+COMPANY_INDEX_REFRESH_SECONDS = float(os.getenv("COMPANY_INDEX_REFRESH_SECONDS", "3600"))
+
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_CHOSEONG_SET = set(_CHOSEONG)
+
+# 순위 (작을수록 먼저)
+_EXACT, _PREFIX, _SUBSTRING = 0, 1, 2
+
+
+def company_id_for(name: str) -> int:
+    """기업명 -> 고정 company_id (31비트 양수, 파이썬 hash()와 달리 프로세스마다 바뀌지 않음)"""
+    return int.from_bytes(hashlib.blake2b(name.encode("utf-8"), digest_size=4).digest(), "big") & 0x7FFFFFFF
+
+
+def normalize(text: str) -> str:
+    """검색용 정규화: 공백 제거 + 소문자 ("LG 전자" == "lg전자")"""
+    return "".join(text.split()).lower()
+
+
+def to_choseong(text: str) -> str:
+    """한글 음절은 초성으로, 나머지 글자는 그대로 ("삼성전자" -> "ㅅㅅㅈㅈ", "SK하이닉스" -> "skㅎㅇㄴㅅ")"""
+    out = []
+    for ch in text:
+        code = ord(ch) - 0xAC00
+        out.append(_CHOSEONG[code // 588] if 0 <= code < 11172 else ch)
+    return "".join(out)
+
+
+def is_choseong_query(query: str) -> bool:
+    """초성이 하나 이상 있고 한글 음절이 없으면 초성 검색 ("ㅅㅅ", "skㅎㅇ")"""
+    has_choseong = any(ch in _CHOSEONG_SET for ch in query)
+    return has_choseong and not any(0xAC00 <= ord(ch) <= 0xD7A3 for ch in query)
+
+
+def _grams(text: str) -> Set[str]:
+    """bigram 집합 (한 글자면 그 글자)"""
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class _Field:
+    """한 종류의 검색 대상 문자열(정규화된 이름 또는 초성)에 대한 bigram/글자 역색인"""
+
+    def __init__(self, values: List[str]):
+        self.values = values
+        self.postings: Dict[str, Set[int]] = {}
+        for i, value in enumerate(values):
+            for gram in _grams(value) | set(value): # 한 글자 질의용으로 글자 단위도 색인
+                self.postings.setdefault(gram, set()).add(i)
+
+    def candidates(self, query: str) -> Set[int]:
+        grams = sorted(_grams(query), key=lambda g: len(self.postings.get(g, ())))
+        if not grams:
+            return set()
+        result = set(self.postings.get(grams[0], ()))
+        for gram in grams[1:]:
+            result &= self.postings.get(gram, set())
+            if not result:
+                break
+        return result
+
+    def rank(self, i: int, query: str) -> Optional[int]:
+        value = self.values[i]
+        if value == query:
+            return _EXACT
+        if value.startswith(query):
+            return _PREFIX
+        if query in value:
+            return _SUBSTRING
+        return None
+
+
+class CompanyIndex:
+    def __init__(self, companies: List[Tuple[str, int]]):
+        """companies: (기업명, 기사 수) 목록"""
+        self.names = [name for name, _ in companies]
+        self.weights = [count or 0 for _, count in companies]
+        self.ids = [company_id_for(name) for name in self.names]
+        self._name_set = set(self.names)
+        # 같은 순위 안의 정렬 기준(기사 수 많은 순 > 짧은 이름 > 가나다)을 미리 하나의 정수로 계산
+        order = sorted(range(len(self.names)), key=lambda i: (-self.weights[i], len(self.names[i]), self.names[i]))
+        self._tiebreak = [0] * len(self.names)
+        for position, i in enumerate(order):
+            self._tiebreak[i] = position
+        self._by_name = _Field([normalize(name) for name in self.names])
+        self._by_choseong = _Field([to_choseong(normalize(name)) for name in self.names])
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._name_set
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[int, str]]:
+        """(company_id, 기업명) 목록을 순위대로 반환합니다."""
+        q = normalize(query)
+        if not q:
+            return []
+        field = self._by_choseong if is_choseong_query(q) else self._by_name
+
+        scored = []
+        for i in field.candidates(q):
+            tier = field.rank(i, q)
+            if tier is not None:
+                scored.append((tier, self._tiebreak[i], i))
+        return [(self.ids[i], self.names[i]) for _, _, i in heapq.nsmallest(limit, scored)]
+
+
+def load_companies(client: bigquery.Client, table_id: str, name_column: str, weight_sql: str) -> List[Tuple[str, int]]:
+    sql = f"""
+        SELECT {name_column} AS name, {weight_sql} AS weight
+        FROM `{table_id}`
+        WHERE {name_column} IS NOT NULL AND {name_column} != ''
+        GROUP BY name
+    """
+    return [(row.name, row.weight) for row in client.query(sql).result()]
+
+
+class CompanyIndexHolder:
+    """현재 인덱스를 들고 있다가 refresh() 때 통째로 교체 (검색 중인 요청은 이전 인덱스를 그대로 사용)"""
+
+    def __init__(self):
+        self.index: Optional[CompanyIndex] = None
+        self._refresh_lock = threading.Lock()
+
+    def refresh(self, client: bigquery.Client) -> None:
+        if not self._refresh_lock.acquire(blocking=False):
+            return # 이미 갱신 중
+        try:
+            if SUMMARY_TABLE_NAME: # 서빙 테이블이 있으면 기업당 1행이라 훨씬 적게 읽음
+                companies = load_companies(
+                    client, f"{PROJECT_ID}.{DATASET_ID}.{SUMMARY_TABLE_NAME}", "company_name", "MAX(fetched_count)"
+                )
+            else:
+                companies = load_companies(
+                    client, f"{PROJECT_ID}.{DATASET_ID}.{COMBINED_TABLE_NAME}", "search_keyword", "COUNT(*)"
+                )
+            self.index = CompanyIndex(companies)
+            logging.info(f"Company index loaded: {len(self.index)} companies")
+        except Exception as e:
+            logging.warning(f"Company index refresh failed (keeping previous index): {e}")
+        finally:
+            self._refresh_lock.release()
+
+
+# 프로세스 전체 공유 인덱스
+company_index = CompanyIndexHolder()
@@ -0,0 +1,66 @@
+import os
+import logging
+from typing import List, Optional
+from google.cloud import bigquery
+from google.api_core.exceptions import NotFound
+
+from app.api.deps import (
+    PROJECT_ID, DATASET_ID, RAW_TABLE_NAME, REPORT_TABLE_NAME, SUMMARY_TABLE_NAME, ARTICLE_DETAIL_TABLE_NAME
+)
+from app.api.cache import response_cache
+from app.api.article_store import article_cache
+
+# =========================================================
+# [데이터 버전 동기화] 적재 대상 테이블의 마지막 수정 시각을 주기적으로 확인해 캐시 데이터 버전으로 씁니다.
+#   - 무효화 API는 요청을 받은 인스턴스 하나만 비우므로, 나머지 인스턴스는 이 확인으로 새 적재를 알아챔
+#     (늦어도 DATA_VERSION_POLL_SECONDS 안에 모든 인스턴스의 응답 캐시/기사 캐시/자동완성 인덱스가 갱신됨)
+#   - 테이블 메타데이터 조회(get_table)라 쿼리 작업/비용 없음
+#   - 버전 = 감시 테이블 수정 시각 중 최댓값(ms) -> 인스턴스마다 같은 값이라 ETag도 인스턴스와 무관하게 일치
+# 기사 통합 테이블은 뷰라서 수정 시각이 바뀌지 않으므로 원본 테이블(TABLE_NEWS_RAW)을 감시합니다.
+# =========================================================
+DATA_VERSION_POLL_SECONDS = float(os.getenv("DATA_VERSION_POLL_SECONDS", "60"))
+
+if not RAW_TABLE_NAME:
+    # 뉴스 적재로 바뀌는 테이블은 원본 테이블뿐 -> 없으면 기사 데이터는 TTL로만 갱신됨
+    logging.warning("TABLE_NEWS_RAW is not set: news loads will not change the cache data version (TTL refresh only).")
+
+
+def _watched_tables() -> List[str]:
+    names = [RAW_TABLE_NAME, REPORT_TABLE_NAME, SUMMARY_TABLE_NAME, ARTICLE_DETAIL_TABLE_NAME]
+    return [f"{PROJECT_ID}.{DATASET_ID}.{name}" for name in names if name]
+
+
+def fetch_data_version(client: bigquery.Client) -> Optional[int]:
+    """
+    감시 테이블들의 마지막 수정 시각 중 최댓값(epoch ms).
+    아직 만들어지지 않은 테이블(첫 빌드 전의 상세 테이블 등)은 건너뛰고,
+    그 외 조회 실패 시에는 None (일부 테이블만으로 계산하면 버전이 거꾸로 바뀔 수 있으므로 현재 버전 유지)
+    """
+    modified = []
+    for table_id in _watched_tables():
+        try:
+            table = client.get_table(table_id, timeout=10)
+        except NotFound:
+            continue
+        except Exception as e:
+            logging.warning(f"Data version check failed for {table_id}: {e}")
+            return None
+        if table.modified is not None:
+            modified.append(table.modified)
+    return int(max(modified).timestamp() * 1000) if modified else None
+
+
+def sync_data_version(client: bigquery.Client) -> bool:
+    """
+    공유 데이터 버전을 확인해 바뀌었으면 응답 캐시와 기사 캐시를 비웁니다.
+    기동 직후 첫 확인이 아닌데 버전이 바뀌었으면 True (-> 호출부에서 자동완성 인덱스 갱신)
+    """
+    previous = response_cache.data_version
+    version = fetch_data_version(client)
+    if version is None or not response_cache.apply_data_version(version):
+        return False
+    article_cache.invalidate()
+    if not previous:
+        return False # 첫 확인: 캐시는 거의 비어 있고 인덱스는 lifespan이 이미 로드 중
+    logging.info(f"Data version changed {previous} -> {version}. Caches cleared.")
+    return True
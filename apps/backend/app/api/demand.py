@@ -0,0 +1,105 @@
+import os
+import logging
+import threading
+from collections import Counter
+from datetime import date
+from typing import Dict
+from google.cloud import bigquery
+
+from app.api.deps import PROJECT_ID, DATASET_ID, DEMAND_TABLE_NAME
+from app.api.company_index import company_index
+
+# =========================================================
+# [기업 조회 수 집계] 리포트 조회를 기업별로 세어 두었다가 주기적으로 빅쿼리 수요 테이블에 적재합니다.
+#   - 데이터플로우 크롤 스케줄러가 이 테이블(TABLE_COMPANY_DEMAND)을 읽어 많이 조회되는 기업을 더 자주 수집
+#   - 리포트 페이지 진입 API(/report/summary, /report/bundle)에서 캐시 적중 여부와 무관하게 1회씩 기록
+#   - 행 형식 : (company_name, request_count, event_date) -> 인스턴스/주기마다 행이 여러 개여도 스케줄러가 SUM
+#   - 자동완성 인덱스가 로드되어 있으면 인덱스에 있는 기업만 집계 (임의 문자열로 테이블이 불어나지 않도록)
+# DEMAND_FLUSH_SECONDS마다 적재하고, 종료 시 남은 값을 한 번 더 적재합니다. (main.py lifespan)
+# =========================================================
+DEMAND_FLUSH_SECONDS = float(os.getenv("DEMAND_FLUSH_SECONDS", "300"))
+DEMAND_MAX_COMPANIES = int(os.getenv("DEMAND_MAX_COMPANIES", "20000")) # 적재 전까지 보관할 기업 수 상한
+
+_DEMAND_SCHEMA = [
+    bigquery.SchemaField("company_name", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("request_count", "INT64", mode="REQUIRED"),
+    bigquery.SchemaField("event_date", "DATE", mode="REQUIRED"),
+]
+
+
+class DemandCounter:
+    """요청 스레드에서 record(), 백그라운드 태스크에서 flush() (락으로 카운터를 통째로 교체)"""
+
+    def __init__(self):
+        self._counts: Counter = Counter()
+        self._lock = threading.Lock()
+        self._table_ready = False
+        self.flushed_rows = 0
+        self.dropped = 0 # 상한 초과로 세지 못한 조회 수
+
+    def record(self, company_name: str) -> None:
+        if not DEMAND_TABLE_NAME:
+            return
+        index = company_index.index
+        if index is not None and company_name not in index:
+            return
+        with self._lock:
+            if company_name not in self._counts and len(self._counts) >= DEMAND_MAX_COMPANIES:
+                self.dropped += 1
+                return
+            self._counts[company_name] += 1
+
+    def _restore(self, counts: Dict[str, int]) -> None:
+        """적재 실패 시 다음 주기에 다시 적재하도록 되돌림"""
+        with self._lock:
+            for name, count in counts.items():
+                if name in self._counts or len(self._counts) < DEMAND_MAX_COMPANIES:
+                    self._counts[name] += count
+                else:
+                    self.dropped += count
+
+    def _ensure_table(self, client: bigquery.Client, table_id: str) -> None:
+        if self._table_ready:
+            return
+        table = bigquery.Table(table_id, schema=_DEMAND_SCHEMA)
+        table.time_partitioning = bigquery.TimePartitioning(field="event_date")
+        client.create_table(table, exists_ok=True)
+        self._table_ready = True
+
+    def flush(self, client: bigquery.Client) -> int:
+        """쌓인 조회 수를 수요 테이블에 적재하고 적재한 행 수를 반환합니다. (실패한 행은 값을 되돌림)"""
+        if not DEMAND_TABLE_NAME:
+            return 0
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+        if not counts:
+            return 0
+
+        table_id = f"{PROJECT_ID}.{DATASET_ID}.{DEMAND_TABLE_NAME}"
+        today = date.today().isoformat()
+        rows = [{"company_name": name, "request_count": count, "event_date": today} for name, count in counts.items()]
+        try:
+            self._ensure_table(client, table_id)
+            errors = client.insert_rows_json(table_id, rows)
+        except Exception as e:
+            logging.warning(f"Company demand flush failed (will retry): {e}")
+            self._restore(counts)
+            return 0
+
+        # 일부 행만 거부된 경우: 거부된 행(index)만 되돌림 (나머지는 이미 적재되었으므로 되돌리면 중복 집계)
+        rejected = {err["index"] for err in errors}
+        if rejected:
+            logging.warning(f"Company demand flush: {len(rejected)} rows rejected (will retry): {errors[:3]}")
+            self._restore({rows[i]["company_name"]: rows[i]["request_count"] for i in rejected})
+        flushed = len(rows) - len(rejected)
+        self.flushed_rows += flushed
+        return flushed
+
+    def stats(self) -> dict:
+        with self._lock:
+            pending = len(self._counts)
+        return {"pending_companies": pending, "flushed_rows": self.flushed_rows, "dropped": self.dropped}
+
+
+# 프로세스 전체 공유 카운터
+demand_counter = DemandCounter()
@@ -1,8 +1,11 @@
 import os
 import ast
-from typing import List, Generator, Any
+import logging
+from typing import List, Any, Optional
+from fastapi import Request
 from google.cloud import bigquery
 from dotenv import load_dotenv
+from app.api.singleflight import SingleFlight
 
 # .env 파일 로드 (파일이 없으면 시스템 환경변수 사용)
 load_dotenv()
@@ -14,46 +17,116 @@ PROJECT_ID = os.getenv("GCP_PROJECT_ID")
 DATASET_ID = os.getenv("BIGQUERY_DATASET_ID")
 COMBINED_TABLE_NAME = os.getenv("TABLE_NEWS_COMBINED") # 뷰
 REPORT_TABLE_NAME = os.getenv("TABLE_WEEKLY_REPORT")
+SUMMARY_TABLE_NAME = os.getenv("TABLE_COMPANY_SUMMARY") # (선택) 기업별 요약 서빙 테이블 (dataflow company_rollup.py)
+ARTICLE_DETAIL_TABLE_NAME = os.getenv("TABLE_ARTICLE_DETAIL") # (선택) 기사 상세 서빙 테이블 (dataflow article_detail.py)
+RAW_TABLE_NAME = os.getenv("TABLE_NEWS_RAW") # (선택) 뷰의 원본 테이블 (적재 시각 확인용, 조회하지 않음)
+DEMAND_TABLE_NAME = os.getenv("TABLE_COMPANY_DEMAND") # (선택) 기업별 조회 수 테이블 (dataflow 크롤 스케줄러가 읽음)
 
 # 필수 설정값 체크 (배포 시 실수 방지용)
 if not all([PROJECT_ID, DATASET_ID, COMBINED_TABLE_NAME, REPORT_TABLE_NAME]):
     raise ValueError("필수 환경변수(.env)가 설정되지 않았습니다. GCP_PROJECT_ID 등을 확인하세요.")
 
-def get_bq_client() -> Generator[bigquery.Client, None, None]:
+# 공유 클라이언트의 HTTP 커넥션 풀 크기 (FastAPI 동기 엔드포인트 스레드풀 기본값 40과 맞춤)
+BQ_HTTP_POOL_SIZE = int(os.getenv("BQ_HTTP_POOL_SIZE", "40"))
+
+def create_bq_client() -> bigquery.Client:
+    """
+    [앱 시작 시 1회] 모든 요청이 공유할 빅쿼리 클라이언트를 생성합니다. (main.py의 lifespan에서 호출)
+    - 인증 정보 로드/토큰 갱신은 여기서 한 번만 (요청마다 하지 않음)
+    - HTTP 커넥션 풀을 스레드풀 크기만큼 늘려 keep-alive 연결을 재사용 (기본 풀 10개로는 동시 요청 시 연결을 새로 맺음)
+    """
+    import google.auth
+    from google.auth.transport.requests import AuthorizedSession
+    from requests.adapters import HTTPAdapter
+
+    credentials, _ = google.auth.default(scopes=["https://www.googleapis.com/auth/cloud-platform"])
+    session = AuthorizedSession(credentials)
+    adapter = HTTPAdapter(pool_connections=BQ_HTTP_POOL_SIZE, pool_maxsize=BQ_HTTP_POOL_SIZE, max_retries=3)
+    session.mount("https://", adapter)
+    return bigquery.Client(project=PROJECT_ID, credentials=credentials, _http=session)
+
+def check_bq_client(client: bigquery.Client) -> bool:
     """
-    [DI] 빅쿼리 클라이언트를 생성.
-        1. 시작 : client 생성 + yield( API 함수에 전달)
-        2. 처리 : API 함수가 이 client를 사용해 DB 조회
-        3. 종료 : finally 실행 -> client.close()
+    [헬스 체크] 데이터셋 메타데이터 조회로 인증/연결 상태를 확인합니다. (쿼리 작업을 만들지 않아 비용 없음)
+    앱 시작 시 호출하면 토큰 발급과 첫 연결을 미리 끝내 두는 워밍업 역할도 합니다.
     """
-    client = bigquery.Client(project=PROJECT_ID)
     try:
-        yield client
-    finally:
-        client.close()
+        client.get_dataset(f"{PROJECT_ID}.{DATASET_ID}", timeout=10)
+        return True
+    except Exception as e:
+        logging.warning(f"BigQuery health check failed: {e}")
+        return False
+
+def get_bq_client(request: Request) -> bigquery.Client:
+    """
+    [DI] lifespan에서 만든 공유 빅쿼리 클라이언트를 반환합니다.
+    (요청마다 생성/종료하지 않음 -> 인증/커넥션 설정 비용이 API 지연에서 빠짐)
+    """
+    return request.app.state.bq_client
+
+# 동시에 들어온 같은 쿼리(SQL + 파라미터)는 빅쿼리 작업 하나로 합침
+query_flight = SingleFlight()
+
+def run_query(client: bigquery.Client, sql: str, job_config: Optional[bigquery.QueryJobConfig] = None) -> List[bigquery.Row]:
+    """
+    [쿼리 실행] 빅쿼리 쿼리를 실행하고 결과 행 리스트를 반환합니다.
+    같은 쿼리가 이미 실행 중이면 새 작업을 만들지 않고 그 결과를 함께 받습니다. (single-flight)
+    반환된 리스트는 여러 요청이 공유하므로 수정하지 말 것.
+    """
+    params = tuple(
+        str(p.to_api_repr()) for p in (job_config.query_parameters if job_config else []) # 배열 파라미터 포함
+    )
+    return query_flight.do((sql, params), lambda: list(client.query(sql, job_config=job_config).result()))
+
+def get_company_summary(client: bigquery.Client, company_name: str) -> Optional[bigquery.Row]:
+    """
+    [서빙 테이블] 기업별 요약 1행을 company_name으로 조회합니다.
+    테이블이 설정되지 않았거나 해당 기업 행이 없으면 None (-> 호출부에서 원본 테이블로 직접 계산)
+    """
+    if not SUMMARY_TABLE_NAME:
+        return None
+    sql = f"""
+        SELECT *
+        FROM `{PROJECT_ID}.{DATASET_ID}.{SUMMARY_TABLE_NAME}`
+        WHERE company_name = @company_name
+        LIMIT 1
+    """
+    job_config = bigquery.QueryJobConfig(
+        query_parameters=[bigquery.ScalarQueryParameter("company_name", "STRING", company_name)]
+    )
+    try:
+        rows = run_query(client, sql, job_config)
+    except Exception as e:
+        logging.warning(f"Company summary lookup failed, falling back to raw tables: {e}")
+        return None
+    return rows[0] if rows else None
 
 def parse_keywords(keyword_data: Any) -> List[str]:
     """
     [유틸리티]
-    빅 쿼리에 저장된 키워드 데이터가 다양한 형태(문자열, 리스트, 구조체 등)로 저장될 가능성이 있어서
-    안전하게 파이썬 리스트['키워드1', '키워드2']로 반환
+    빅 쿼리에 저장된 키워드 데이터가 다양한 형태(ARRAY, STRUCT 배열, "['a', 'b']", "[('a', 10), ...]", "a, b" 등)로
+    저장될 가능성이 있어서 안전하게 파이썬 리스트['키워드1', '키워드2']로 반환
+    (dataflow company_rollup.normalize_keywords와 같은 규칙 -> 서빙 테이블에 저장되는 키워드와 같은 목록)
     """
     if not keyword_data:
         return []
-    
-    # Case 1: 이미 리스트(ARRAY) 형태인 경우
-    if isinstance(keyword_data, list):
-        # 내부가 딕셔너리(Struct)인 경우 처리
-        if keyword_data and isinstance(keyword_data[0], dict):
-             return [item.get('keyword', item) for item in keyword_data]
-        return keyword_data
-
-    # Case 2: 문자열("[('키워드', 10), ...]") 형태인 경우
-    try:
-        data = ast.literal_eval(str(keyword_data))
-        # [('키워드', 10), ...] 튜플 형태라면 키워드만 추출
-        if isinstance(data, list) and data and isinstance(data[0], tuple):
-            return [k for k, v in data]
-        return data if isinstance(data, list) else []
-    except:
-        return []
\ No newline at end of file
+    if isinstance(keyword_data, str):
+        try:
+            keyword_data = ast.literal_eval(keyword_data)
+        except (ValueError, SyntaxError, TypeError):
+            # 파이썬 리터럴이 아닌 문자열: 괄호/따옴표를 지우고 쉼표로 분리
+            raw = keyword_data.replace('[', '').replace(']', '').replace("'", "").replace('"', "")
+            keyword_data = raw.split(',')
+    if not isinstance(keyword_data, (list, tuple)):
+        keyword_data = [keyword_data]
+
+    keywords = []
+    for item in keyword_data:
+        if isinstance(item, dict):
+            item = item.get('keyword') # STRUCT
+        elif isinstance(item, (list, tuple)):
+            item = item[0] if item else None # ('키워드', 10)
+        text = str(item).strip() if item is not None else ""
+        if text:
+            keywords.append(text)
+    return keywords
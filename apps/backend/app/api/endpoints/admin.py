@@ -0,0 +1,51 @@
+import hmac
+from typing import Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException
+from google.cloud import bigquery
+
+from app.api.cache import response_cache, CACHE_INVALIDATE_TOKEN
+from app.api.article_store import article_cache
+from app.api.company_index import company_index
+from app.api.data_version import sync_data_version
+from app.api.demand import demand_counter
+from app.api.deps import get_bq_client, query_flight
+
+router = APIRouter()
+
+def require_cache_token(x_cache_token: Optional[str] = Header(None)) -> None:
+    """[DI] X-Cache-Token 헤더가 CACHE_INVALIDATE_TOKEN 환경변수와 같아야 합니다. (환경변수가 없으면 운영 API 비활성화)"""
+    if not CACHE_INVALIDATE_TOKEN:
+        raise HTTPException(403, "캐시 운영 API가 비활성화되어 있습니다.")
+    if not x_cache_token or not hmac.compare_digest(x_cache_token, CACHE_INVALIDATE_TOKEN):
+        raise HTTPException(401, "잘못된 토큰입니다.")
+
+@router.post("/cache/invalidate", dependencies=[Depends(require_cache_token)])
+def invalidate_cache(
+    background_tasks: BackgroundTasks,
+    client: bigquery.Client = Depends(get_bq_client),
+):
+    """
+    [운영] 응답 캐시 무효화. 적재 파이프라인(bq_full_load 등)이 새 데이터를 올린 뒤 호출합니다.
+    이 인스턴스는 바로 데이터 버전(적재 테이블 수정 시각)을 다시 확인하고 캐시를 비웁니다.
+    다른 인스턴스는 주기적인 데이터 버전 확인(DATA_VERSION_POLL_SECONDS)으로 같은 적재를 반영합니다.
+    새로 적재된 기업이 자동완성에 바로 보이도록 기업명 인덱스도 응답 후 다시 로드합니다.
+    """
+    sync_data_version(client)
+    article_cache.invalidate()
+    background_tasks.add_task(company_index.refresh, client)
+    return {"data_version": response_cache.invalidate()}
+
+@router.get("/cache/stats", dependencies=[Depends(require_cache_token)])
+def get_cache_stats():
+    """
+    [운영] 응답 캐시 상태 (항목 수, 적중/미스 횟수, 데이터 버전) + 빅쿼리 쿼리 합치기(single-flight) 횟수
+    무효화 API와 같은 X-Cache-Token이 필요합니다.
+    """
+    return {
+        **response_cache.stats(),
+        "queries_executed": query_flight.executed,
+        "queries_coalesced": query_flight.coalesced,
+        "company_index_size": len(company_index.index) if company_index.index is not None else None,
+        "article_cache": article_cache.stats(),
+        "company_demand": demand_counter.stats(),
+    }
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from google.cloud import bigquery
-from datetime import datetime, timedelta
 from collections import Counter
+from typing import List
 
 from app.schemas import response_dto
 # deps.py에 REPORT_TABLE_NAME이 꼭 추가되어 있어야 합니다.
-from app.api.deps import get_bq_client, PROJECT_ID, DATASET_ID, REPORT_TABLE_NAME
+from app.api.deps import get_bq_client, run_query, parse_keywords, PROJECT_ID, DATASET_ID, REPORT_TABLE_NAME
+from app.api.cache import normalize_name, days_ago
+from app.api.responses import PreparedResponse, cached_prepared
 
 router = APIRouter()
 
@@ -15,37 +17,51 @@ router = APIRouter()
 # --------------------------------------------------------------------------
 @router.get("/points", response_model=response_dto.CorePointsResponse)
 def get_core_points(
+    request: Request,
     company_name: str,
     client: bigquery.Client = Depends(get_bq_client)
 ):
     """
     [트렌드 분석] 오늘 기준 최근 7일(1주) 내에 발행된 모든 주간 리포트를 조회하여 긍정/리스크 요인을 반환합니다.
     """
-    table_id = f"{PROJECT_ID}.{DATASET_ID}.{REPORT_TABLE_NAME}"
-    # 최근 7일(1주) 전 날짜 계산
-    one_week_ago = datetime.now() - timedelta(days=7)
+    return prepared_core_points(client, normalize_name(company_name)).to_response(request)
+
+def prepared_core_points(client: bigquery.Client, company_name: str) -> PreparedResponse:
+    """캐시된 핵심 포인트 응답 (/report/bundle과 같은 캐시 항목 공유, company_name은 정규화된 값)"""
+    return cached_prepared("analytics_points", (company_name,), lambda: _build_core_points(client, company_name))
 
+def _latest_report(client: bigquery.Client, company_name: str) -> List[bigquery.Row]:
+    """
+    최근 7일(1주) 내 가장 최근 주간 리포트 1건.
+    포인트/키워드 API가 같은 쿼리를 쓰므로 동시에 요청되면(/report/bundle 등) 빅쿼리 작업 하나로 합쳐집니다.
+    """
+    table_id = f"{PROJECT_ID}.{DATASET_ID}.{REPORT_TABLE_NAME}"
     sql = f"""
-        SELECT 
-            report_end_date, 
-            positive_points, 
-            risk_factors
+        SELECT
+            report_end_date,
+            positive_points,
+            risk_factors,
+            keywords
         FROM `{table_id}`
         WHERE company_name = @company_name
           AND report_end_date >= @start_date
         ORDER BY report_end_date DESC
         LIMIT 1
     """
-    
+
     job_config = bigquery.QueryJobConfig(
         query_parameters=[
             bigquery.ScalarQueryParameter("company_name", "STRING", company_name),
             # BigQuery DATE/TIMESTAMP 비교를 위해 파이썬 timestamp 객체 전달
-            bigquery.ScalarQueryParameter("start_date", "DATE", one_week_ago.date())
+            bigquery.ScalarQueryParameter("start_date", "DATE", days_ago(7).date())
         ]
     )
-    
-    rows = list(client.query(sql, job_config=job_config).result())
+    return run_query(client, sql, job_config)
+
+def _build_core_points(client: bigquery.Client, company_name: str) -> response_dto.CorePointsResponse:
+    # 서빙 테이블(company_summary)은 bq_full_load 때만 다시 만들어져 새 주간 리포트를 늦게 반영하므로,
+    # 포인트/키워드는 항상 리포트 테이블에서 직접 읽음 (1행 쿼리, 키워드 API와 합쳐짐)
+    rows = _latest_report(client, company_name)
     
     points = []
     
@@ -101,56 +117,28 @@ def get_core_points(
 # --------------------------------------------------------------------------
 @router.get("/keywords", response_model=response_dto.CoreKeywordsResponse)
 def get_core_keywords(
+    request: Request,
     company_name: str,
     client: bigquery.Client = Depends(get_bq_client)
 ):
     """
     [트렌드 분석] 최근 7일(1주) 내 리포트에서 키워드를 추출하고, 많이 등장한 순서대로 반환합니다.
     """
-    table_id = f"{PROJECT_ID}.{DATASET_ID}.{REPORT_TABLE_NAME}"
-    one_week_ago = datetime.now() - timedelta(days=7)
-    
-    #날짜 조건 추가
-    sql = f"""
-        SELECT keywords, report_end_date
-        FROM `{table_id}`
-        WHERE company_name = @company_name
-          AND report_end_date >= @start_date
-        ORDER BY report_end_date DESC
-        LIMIT 1
-    """
-    
-    job_config = bigquery.QueryJobConfig(
-        query_parameters=[
-            bigquery.ScalarQueryParameter("company_name", "STRING", company_name),
-            bigquery.ScalarQueryParameter("start_date", "DATE", one_week_ago.date())
-        ]
-    )
-    
-    rows = list(client.query(sql, job_config=job_config).result())
-    
-    
-    keyword_items = []
-    
-    for report in rows:
-        if report.keywords:
-            k_list = []
-            if isinstance(report.keywords, list):
-                k_list = report.keywords
-            else:
-                raw_str = str(report.keywords).replace('[','').replace(']','').replace("'", "").replace('"', "")
-                k_list = raw_str.split(',')
-            
-            for k in k_list:
-                clean_k = k.strip()
-                if clean_k:
-                    # 중복 제거 없이 있는 그대로 다 넣거나, 
-                    # 중복만 제거하고 싶다면 Set을 썼다가 List로 변환하면 됩니다.
-                    # 여기서는 요청대로 "리스트로 쭉쭉쭉 던져주는" 방식 (중복 허용 여부에 따라 조정 가능)
-                    keyword_items.append(response_dto.CoreKeywordItem(
-                        keyword=clean_k
-                    ))
-    
+    return prepared_core_keywords(client, normalize_name(company_name)).to_response(request)
+
+def prepared_core_keywords(client: bigquery.Client, company_name: str) -> PreparedResponse:
+    """캐시된 핵심 키워드 응답 (/report/bundle과 같은 캐시 항목 공유, company_name은 정규화된 값)"""
+    return cached_prepared("analytics_keywords", (company_name,), lambda: _build_core_keywords(client, company_name))
+
+def _build_core_keywords(client: bigquery.Client, company_name: str) -> response_dto.CoreKeywordsResponse:
+    # 포인트 API와 같은 이유로 리포트 테이블에서 직접 읽음 (서빙 테이블은 새 리포트를 늦게 반영)
+    rows = _latest_report(client, company_name)
+
+    # 서빙 테이블과 같은 정규화 규칙 (튜플 문자열 "[('키워드', 10)]"도 키워드만 추출)
+    keyword_items = [
+        response_dto.CoreKeywordItem(keyword=k) for report in rows for k in parse_keywords(report.keywords)
+    ]
+
     return response_dto.CoreKeywordsResponse(
         company_name=company_name,
         keywords=keyword_items
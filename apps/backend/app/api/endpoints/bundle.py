@@ -0,0 +1,63 @@
+import os
+from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from google.cloud import bigquery
+
+from app.schemas import response_dto
+from app.api.deps import get_bq_client
+from app.api.cache import normalize_name, response_cache
+from app.api.responses import PreparedResponse
+from app.api.demand import demand_counter
+from app.api.endpoints.reports import prepared_report_summary, prepared_report_news
+from app.api.endpoints.analytics import prepared_core_points, prepared_core_keywords
+
+router = APIRouter()
+
+# 묶음 API가 하위 응답(뉴스/포인트/키워드)을 동시에 계산할 때 쓰는 스레드 (요청 스레드는 요약을 직접 계산)
+BUNDLE_FANOUT_WORKERS = int(os.getenv("BUNDLE_FANOUT_WORKERS", "16"))
+_fanout = ThreadPoolExecutor(max_workers=BUNDLE_FANOUT_WORKERS, thread_name_prefix="bundle")
+
+@router.get("/report/bundle", response_model=response_dto.ReportBundleResponse)
+def get_report_bundle(
+    request: Request,
+    company_name: str,
+    limit_per_topic: Optional[int] = Query(
+        None, ge=1, le=100, description="뉴스 목록의 토픽별 최대 기사 수 (없으면 /report/news와 같이 전체 목록)"
+    ),
+    client: bigquery.Client = Depends(get_bq_client)
+):
+    """
+    [리포트 페이지 한 번에] /report/summary, /report/news(limit_per_topic이 있으면 첫 페이지), /analytics/points, /analytics/keywords 를 합친 응답.
+    - 네 응답을 동시에 계산하고, 개별 API와 같은 캐시 항목을 공유 (어느 쪽으로 먼저 조회해도 재사용)
+    - 포인트/키워드는 같은 주간 리포트 쿼리라 single-flight로 빅쿼리 작업 하나로 합쳐짐
+    - 묶음 응답 자체는 캐시하지 않음: 하위 항목이 갱신될 때 함께 바뀌도록 매번 하위 캐시에서 조립
+      (묶음을 따로 캐시하면 stale 하위 응답을 새 항목으로 저장해 최대 TTL 두 배만큼 늦어질 수 있음)
+    """
+    company_name = normalize_name(company_name)
+    demand_counter.record(company_name) # 리포트 페이지 진입 1회 (크롤 스케줄러 수요)
+    data_version = response_cache.data_version # 하위 응답을 읽기 전 버전 (ETag용)
+    bundle = _build_report_bundle(client, company_name, limit_per_topic)
+    return PreparedResponse(bundle, data_version).to_response(request)
+
+def _build_report_bundle(
+    client: bigquery.Client, company_name: str, limit_per_topic: Optional[int]
+) -> response_dto.ReportBundleResponse:
+    news = _fanout.submit(prepared_report_news, client, company_name, limit_per_topic=limit_per_topic)
+    points = _fanout.submit(prepared_core_points, client, company_name)
+    keywords = _fanout.submit(prepared_core_keywords, client, company_name)
+
+    try:
+        summary = prepared_report_summary(client, company_name).value
+    except HTTPException as e:
+        if e.status_code != 404:
+            raise
+        summary = None # 기사 데이터가 없어도 리포트(포인트/키워드)는 있을 수 있음
+
+    return response_dto.ReportBundleResponse(
+        company_name=company_name,
+        summary=summary,
+        news=news.result().value,
+        points=points.result().value,
+        keywords=keywords.result().value,
+    )
@@ -3,16 +3,22 @@ from typing import List
 from google.cloud import bigquery
 
 from app.schemas.response_dto import CompanyItem
-from app.api.deps import get_bq_client, PROJECT_ID, DATASET_ID, COMBINED_TABLE_NAME
+from app.api.deps import get_bq_client, run_query, PROJECT_ID, DATASET_ID, COMBINED_TABLE_NAME
+from app.api.company_index import company_index, company_id_for
 
 router = APIRouter()
 
 @router.get("/companies", response_model=List[CompanyItem])
 def search_companies(
-    query: str = Query(..., description="검색할 기업명 (예: 삼성)"),
+    query: str = Query(..., description="검색할 기업명 (예: 삼성, ㅅㅅ)"),
     client: bigquery.Client = Depends(get_bq_client)
 ):
-    # 뷰 테이블 사용
+    # 메모리 인덱스가 로드되어 있으면 빅쿼리 없이 바로 응답 (부분 일치 + 초성 검색)
+    index = company_index.index
+    if index is not None:
+        return [CompanyItem(company_id=company_id, name_ko=name) for company_id, name in index.search(query, limit=10)]
+
+    # 인덱스 로드 전(앱 시작 직후) 또는 로드 실패 시: 뷰 테이블 직접 검색
     table_id = f"{PROJECT_ID}.{DATASET_ID}.{COMBINED_TABLE_NAME}"
 
     sql = f"""
@@ -21,7 +27,7 @@ def search_companies(
         WHERE search_keyword LIKE @query_pattern
         LIMIT 10
     """
-    
+
     # SQL 파라미터 바인딩 (SQL Injection 방지)
     job_config = bigquery.QueryJobConfig(
         query_parameters=[
@@ -29,11 +35,10 @@ def search_companies(
         ]
     )
 
-    query_job = client.query(sql, job_config=job_config)
-    results = query_job.result()
+    results = run_query(client, sql, job_config)
+
 
-    
     return [
-        CompanyItem(company_id=abs(hash(row.name_ko)) % 100000, name_ko=row.name_ko) 
+        CompanyItem(company_id=company_id_for(row.name_ko), name_ko=row.name_ko)
         for row in results if row.name_ko
-    ]
\ No newline at end of file
+    ]
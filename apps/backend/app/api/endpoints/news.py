@@ -1,77 +1,46 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from google.cloud import bigquery
-from datetime import datetime
-from urllib.parse import urlparse
+from typing import List
 
 from app.schemas.response_dto import NewsDetailResponse
-from app.api.deps import get_bq_client, PROJECT_ID, DATASET_ID, COMBINED_TABLE_NAME
+from app.api.deps import get_bq_client
+from app.api.article_store import article_cache, fetch_article_details, MAX_BATCH_IDS
 
 router = APIRouter()
 
 
 
+@router.get("/news", response_model=List[NewsDetailResponse])
+def get_news_details(
+    ids: str = Query(..., description=f"쉼표로 구분한 article_id 목록 (최대 {MAX_BATCH_IDS}개, 예: 1,2,3)"),
+    client: bigquery.Client = Depends(get_bq_client)
+):
+    """
+    [여러 건 조회] 목록 화면에서 기사 상세를 한 번에 미리 받아 둘 때 사용합니다.
+    요청한 순서대로 반환하며, 없는 기사는 결과에서 빠집니다.
+    """
+    try:
+        article_ids = list(dict.fromkeys(int(x) for x in ids.split(",") if x.strip())) # 중복 제거, 순서 유지
+    except ValueError:
+        raise HTTPException(400, "ids는 쉼표로 구분한 숫자여야 합니다.")
+    if not article_ids:
+        return []
+    if len(article_ids) > MAX_BATCH_IDS:
+        raise HTTPException(400, f"ids는 최대 {MAX_BATCH_IDS}개까지 요청할 수 있습니다.")
+
+    details = article_cache.get_many(article_ids, lambda missing: fetch_article_details(client, missing))
+    return [details[article_id] for article_id in article_ids if article_id in details]
+
+
 @router.get("/news/{article_id}", response_model=NewsDetailResponse)
 def get_news_detail(
     article_id: int,
     client: bigquery.Client = Depends(get_bq_client)
-):  
-    table_id = f"{PROJECT_ID}.{DATASET_ID}.{COMBINED_TABLE_NAME}"
-    
-    # [수정됨] JOIN 제거. career_insight는 없어서 뺐습니다.
-    sql = f"""
-        SELECT 
-            article_id, 
-            title, 
-            content, 
-            published_at, 
-            url,
-            summary,
-            career_insight,
-            sentiment
-        FROM `{table_id}`
-        WHERE article_id = @article_id
-        LIMIT 1
-    """
-    
-    job_config = bigquery.QueryJobConfig(
-        query_parameters=[
-            bigquery.ScalarQueryParameter("article_id", "INT64", article_id)
-        ]
-    )
-    
-    rows = list(client.query(sql, job_config=job_config).result())
-    
-    if not rows:
+):
+    # 캐시(목록 화면에서 미리 읽어 둔 것 포함)에 있으면 빅쿼리를 거치지 않음
+    details = article_cache.get_many([article_id], lambda missing: fetch_article_details(client, missing))
+
+    if article_id not in details:
         raise HTTPException(404, "해당 뉴스를 찾을 수 없습니다.")
-        
-    article = rows[0]
-    
-    #URL 파싱
-    source_name = "언론사"
-    if article.url:
-        try:
-            source_name = urlparse(article.url).netloc.replace("www.", "")
-        except:
-            pass
-    
-    # 요약 우선 순위 : career_insight 컬럼 -> summary 컬럼 -> 본문 300자(혹시 모를)
-    final_summary = "요약 없음"
-    
-    if article.career_insight:
-        final_summary = article.career_insight
-    elif article.summary:
-        # 요약이 너무 길 경우를 대비해 300자로 자름
-        final_summary = article.summary[:300] + ("..." if len(article.summary) > 300 else "")
-    elif article.content:
-        final_summary = article.content[:300] + "..."
 
-    return NewsDetailResponse(
-        article_id=article.article_id,
-        title=article.title,
-        source=source_name,
-        published_at=article.published_at,
-        sentiment=article.sentiment if article.sentiment else "중립",
-        key_summary=final_summary,
-        ai_summary=article.summary,
-        original_link=article.url
-    )
\ No newline at end of file
+    return details[article_id]
@@ -1,106 +1,133 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+import json
+import base64
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from google.cloud import bigquery
-from typing import List, Optional
-from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from datetime import datetime
 from urllib.parse import urlparse
 
 from app.schemas import response_dto
-from app.api.deps import get_bq_client, PROJECT_ID, DATASET_ID, COMBINED_TABLE_NAME
+from app.api.deps import (
+    get_bq_client, run_query, get_company_summary, PROJECT_ID, DATASET_ID, COMBINED_TABLE_NAME, ARTICLE_DETAIL_TABLE_NAME
+)
+from app.api.article_store import article_cache, fetch_article_details
+from app.api.cache import normalize_name, days_ago
+from app.api.responses import PreparedResponse, cached_prepared
+from app.api.demand import demand_counter
 
 router = APIRouter()
 
+# 감정 분류 조건 (sentiment 컬럼에 'positive'/'긍정' 등 자유 형식 문자열이 들어 있음)
+POSITIVE_SQL = "(LOWER(sentiment) LIKE '%positive%' OR sentiment LIKE '%긍정%')"
+NEGATIVE_SQL = "(LOWER(sentiment) LIKE '%negative%' OR sentiment LIKE '%부정%')"
+
+DEFAULT_LIMIT_PER_TOPIC = 20 # 페이지 조회(topic/cursor)인데 limit_per_topic이 없을 때
+LEGACY_MAX_ARTICLES = 2000   # 페이지 파라미터 없는 전체 목록의 최대 기사 수 (기존 응답과 같음)
+
 @router.get("/report/summary", response_model=response_dto.ReportSummaryResponse)
 def get_report_summary(
+    request: Request,
     company_name: str,
     client: bigquery.Client = Depends(get_bq_client)
 ):
+    company_name = normalize_name(company_name)
+    demand_counter.record(company_name) # 리포트 페이지 진입 1회 (크롤 스케줄러 수요)
+    return prepared_report_summary(client, company_name).to_response(request)
+
+def prepared_report_summary(client: bigquery.Client, company_name: str) -> PreparedResponse:
+    """캐시된 요약 응답 (/report/bundle과 같은 캐시 항목 공유, company_name은 정규화된 값)"""
+    return cached_prepared("report_summary", (company_name,), lambda: _build_report_summary(client, company_name))
+
+def _build_report_summary(client: bigquery.Client, company_name: str) -> response_dto.ReportSummaryResponse:
+    """
+    요약 통계: 서빙 테이블(TABLE_COMPANY_SUMMARY) 단건 조회, 없으면 빅쿼리 집계 쿼리 한 번으로 계산합니다.
+    (기사 2000건을 받아 파이썬에서 세던 방식 대신 COUNTIF / ARRAY_AGG ... LIMIT 3 -> 숫자와 문장 6개만 전송)
+    """
+    # 서빙 테이블이 있으면 미리 계산된 집계를 단건 조회로 사용
+    rollup = get_company_summary(client, company_name)
+    if rollup is not None:
+        return _summary_from_rollup(company_name, rollup)
+
     # 뷰 테이블 사용
     table_id = f"{PROJECT_ID}.{DATASET_ID}.{COMBINED_TABLE_NAME}"
-    
-    # ---------------------------------------------------------
-    # 1. [추가된 로직] 최근 3개월 기사 개수 별도 조회
-    # ---------------------------------------------------------
-    three_months_ago = datetime.now() - timedelta(days=90)
-    
-    count_sql = f"""
-        SELECT COUNT(*) as total_count
-        FROM `{table_id}`
-        WHERE search_keyword = @company_name
-        AND published_at >= @start_date
+    three_months_ago = days_ago(90) # 하루 단위로 고정 (캐시 키와 쿼리 파라미터가 하루 동안 같도록)
+
+    # - total_count : 최근 3개월 기사 개수
+    # - 긍/부정 비율과 요약 문장 : 최근 기사 2000건 기준 (기존과 동일)
+    sql = f"""
+        WITH recent AS (
+            SELECT
+                title,
+                published_at,
+                {POSITIVE_SQL} AS is_positive,
+                {NEGATIVE_SQL} AS is_negative,
+                COALESCE(NULLIF(one_sentence_summary, ''), title) AS point
+            FROM `{table_id}`
+            WHERE search_keyword = @company_name
+            ORDER BY published_at DESC
+            LIMIT 2000
+        )
+        SELECT
+            (
+                SELECT COUNT(*)
+                FROM `{table_id}`
+                WHERE search_keyword = @company_name
+                  AND published_at >= @start_date
+            ) AS total_count,
+            COUNT(*) AS fetched_count,
+            COUNTIF(is_positive) AS pos,
+            COUNTIF(NOT is_positive AND is_negative) AS neg,
+            ARRAY_AGG(IF(is_positive, point, NULL) IGNORE NULLS ORDER BY published_at DESC LIMIT 3) AS pos_points,
+            ARRAY_AGG(IF(is_negative, point, NULL) IGNORE NULLS ORDER BY published_at DESC LIMIT 3) AS neg_points
+        FROM recent
     """
-    
-    count_job_config = bigquery.QueryJobConfig(
+
+    job_config = bigquery.QueryJobConfig(
         query_parameters=[
             bigquery.ScalarQueryParameter("company_name", "STRING", company_name),
             # BigQuery의 DATETIME/TIMESTAMP 타입에 맞춰 파이썬 timestamp 객체를 넘김
-            bigquery.ScalarQueryParameter("start_date", "TIMESTAMP", three_months_ago) 
+            bigquery.ScalarQueryParameter("start_date", "TIMESTAMP", three_months_ago)
         ]
     )
-    
-    # 개수 조회 실행
-    count_result = list(client.query(count_sql, job_config=count_job_config).result())
-    real_total_count = count_result[0].total_count if count_result else 0
-
-    # ---------------------------------------------------------
-    # 2. 리포트 분석용 데이터 조회
-    # ---------------------------------------------------------
-    
-    sql = f"""
-        SELECT 
-            article_id, 
-            title, 
-            sentiment, 
-            one_sentence_summary
-        FROM `{table_id}`
-        WHERE search_keyword = @company_name
-        ORDER BY published_at DESC
-        LIMIT 2000
-    """
-    
-    job_config = bigquery.QueryJobConfig(
-        query_parameters=[
-            bigquery.ScalarQueryParameter("company_name", "STRING", company_name)
-        ]
+
+    rows = run_query(client, sql, job_config)
+    summary = rows[0] if rows else None
+    if not summary:
+        raise HTTPException(404, "해당 기업의 분석 데이터를 찾을 수 없습니다.")
+    return _make_summary_response(
+        company_name, summary.total_count, summary.fetched_count, summary.pos, summary.neg,
+        summary.pos_points, summary.neg_points
+    )
+
+def _summary_from_rollup(company_name: str, rollup: bigquery.Row) -> response_dto.ReportSummaryResponse:
+    """서빙 테이블(TABLE_COMPANY_SUMMARY) 행 -> 요약 응답"""
+    return _make_summary_response(
+        company_name, rollup.total_count_3m, rollup.fetched_count, rollup.positive_count, rollup.negative_count,
+        rollup.article_positive_points, rollup.article_risk_points
     )
-    
-    rows = list(client.query(sql, job_config=job_config).result())
-    
-    if not rows:
+
+def _make_summary_response(
+    company_name: str, total_count: int, fetched_count: int, pos: int, neg: int,
+    pos_points: Optional[List[str]], neg_points: Optional[List[str]]
+) -> response_dto.ReportSummaryResponse:
+    if not fetched_count:
         raise HTTPException(404, "해당 기업의 분석 데이터를 찾을 수 없습니다.")
 
-    # ---------------------------------------------------------
-    # 3. 긍/부정 비율 및 요약 추출
-    # ---------------------------------------------------------
-    fetched_count = len(rows)
-    pos = 0
-    neg = 0
-    
-    for r in rows:
-        if not r.sentiment: continue
-        s = r.sentiment.lower()
-        if "positive" in s or "긍정" in s: pos += 1
-        elif "negative" in s or "부정" in s: neg += 1
-            
+    # 긍/부정 비율 (감정이 없거나 둘 다 아닌 기사는 중립)
     neu = fetched_count - (pos + neg)
-    
+
     ratio = response_dto.SentimentRatio(
-        positive=round(pos/fetched_count, 2) if fetched_count else 0,
-        negative=round(neg/fetched_count, 2) if fetched_count else 0,
-        neutral=round(neu/fetched_count, 2) if fetched_count else 0
+        positive=round(pos/fetched_count, 2),
+        negative=round(neg/fetched_count, 2),
+        neutral=round(neu/fetched_count, 2)
     )
 
-    def is_positive(text): return text and ("positive" in text.lower() or "긍정" in text)
-    def is_negative(text): return text and ("negative" in text.lower() or "부정" in text)
-
-    pos_points = [r.one_sentence_summary or r.title for r in rows if is_positive(r.sentiment)][:3]
-    neg_points = [r.one_sentence_summary or r.title for r in rows if is_negative(r.sentiment)][:3]
-    
-    if not pos_points: pos_points = [r.title for r in rows if is_positive(r.sentiment)][:3]
-    if not neg_points: neg_points = [r.title for r in rows if is_negative(r.sentiment)][:3]
+    pos_points = list(pos_points or [])
+    neg_points = list(neg_points or [])
 
     return response_dto.ReportSummaryResponse(
         company_name=company_name,
-        total_article_count=real_total_count,  # 3개월치 카운트 반환
+        total_article_count=total_count or 0,  # 3개월치 카운트 반환
         sentiment_ratio=ratio,
         positive_points=pos_points if pos_points else ["긍정적인 주요 이슈가 없습니다."],
         risk_factors=neg_points if neg_points else ["부정적인 주요 리스크가 없습니다."]
@@ -108,51 +135,152 @@ def get_report_summary(
 
 @router.get("/report/news", response_model=response_dto.ReportNewsResponse)
 def get_report_news_list(
+    request: Request,
     company_name: str,
     sentiment: Optional[str] = Query(None),
     sort_order: str = "newest",
+    topic: Optional[str] = Query(None, description="이 토픽의 기사만 조회 (다음 페이지 요청 시 필수)"),
+    limit_per_topic: Optional[int] = Query(
+        None, ge=1, le=100, description=f"토픽별 최대 기사 수 (페이지 조회 시 기본 {DEFAULT_LIMIT_PER_TOPIC})"
+    ),
+    cursor: Optional[str] = Query(None, description="이전 응답 keyword_groups[].next_cursor 값"),
     client: bigquery.Client = Depends(get_bq_client)
 ):
-    table_id = f"{PROJECT_ID}.{DATASET_ID}.{COMBINED_TABLE_NAME}"
-    
-    sql = f"""
-        SELECT 
-            article_id, 
-            title, 
-            published_at, 
-            url,
-            sentiment, 
-            topic, 
-            one_sentence_summary
-        FROM `{table_id}`
-        WHERE search_keyword = @company_name
     """
-    
+    토픽별 뉴스 목록.
+    - 페이지 파라미터 없음 : 기존과 같이 전체 목록 (최신/오래된 순 최대 LEGACY_MAX_ARTICLES건, next_cursor 없음)
+    - keyset 페이지네이션 (limit_per_topic, topic, cursor 중 하나라도 보내면)
+      - 첫 요청 : 토픽마다 최신(또는 오래된) 기사 limit_per_topic건 + 토픽별 전체 기사 수(total_count)
+      - 다음 페이지 : topic=<keyword>&cursor=<next_cursor> -> 그 토픽의 다음 limit_per_topic건
+    """
+    return prepared_report_news(
+        client, normalize_name(company_name), sentiment, sort_order, topic, limit_per_topic, cursor
+    ).to_response(request)
+
+def prepared_report_news(
+    client: bigquery.Client, company_name: str, sentiment: Optional[str] = None, sort_order: str = "newest",
+    topic: Optional[str] = None, limit_per_topic: Optional[int] = None, cursor: Optional[str] = None
+) -> PreparedResponse:
+    """
+    캐시된 뉴스 목록 응답 (/report/bundle과 같은 캐시 항목 공유, company_name은 정규화된 값)
+    limit_per_topic이 None이고 topic/cursor도 없으면 토픽별로 자르지 않은 전체 목록
+    """
+    sentiment = sentiment if sentiment in ("positive", "negative") else None # 그 외 값은 필터 없음과 같음
+    sort_order = "oldest" if sort_order == "oldest" else "newest"
+    if cursor and not topic:
+        raise HTTPException(400, "cursor는 topic과 함께 보내야 합니다.")
+    if limit_per_topic is None and (topic or cursor):
+        limit_per_topic = DEFAULT_LIMIT_PER_TOPIC
+    after = _decode_cursor(cursor) if cursor else None
+    return cached_prepared(
+        "report_news", (company_name, sentiment, sort_order, topic, limit_per_topic, cursor),
+        lambda: _build_report_news(client, company_name, sentiment, sort_order, topic, limit_per_topic, after)
+    )
+
+# NULL 발행일은 정렬 방향과 관계없이 항상 맨 뒤 (기존 NULLS LAST와 동일). keyset 비교를 위해 값으로 치환
+_NULL_SORT_KEY = {
+    "newest": "TIMESTAMP '1970-01-01 00:00:00+00'",
+    "oldest": "TIMESTAMP '9999-12-31 23:59:59+00'",
+}
+
+def _encode_cursor(sort_key: datetime, article_id: int) -> str:
+    """(정렬 기준 발행일, article_id) -> URL에 그대로 넣을 수 있는 불투명 문자열"""
+    raw = json.dumps({"t": sort_key.isoformat(), "id": article_id}).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        return datetime.fromisoformat(data["t"]), int(data["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(400, "잘못된 cursor 값입니다.")
+
+def _build_report_news(
+    client: bigquery.Client, company_name: str, sentiment: Optional[str], sort_order: str,
+    topic: Optional[str], limit_per_topic: Optional[int], after: Optional[Tuple[datetime, int]]
+) -> response_dto.ReportNewsResponse:
+    """
+    토픽 분류/토픽별 개수/페이지 자르기를 모두 빅쿼리에서 처리합니다.
+    (기존: 기사 최대 2000건을 전부 받아 파이썬에서 토픽별로 묶음 -> 토픽당 limit_per_topic + 1건만 전송)
+    """
+    table_id = f"{PROJECT_ID}.{DATASET_ID}.{COMBINED_TABLE_NAME}"
+
+    direction = "ASC" if sort_order == "oldest" else "DESC"
+    filters = ["search_keyword = @company_name"]
     if sentiment == "positive":
-        sql += " AND (LOWER(sentiment) LIKE '%positive%' OR sentiment LIKE '%긍정%')"
+        filters.append(POSITIVE_SQL)
     elif sentiment == "negative":
-        sql += " AND (LOWER(sentiment) LIKE '%negative%' OR sentiment LIKE '%부정%')"
-        
-    
-    if sort_order == "oldest":
-        sql += " ORDER BY published_at ASC NULLS LAST"
-    else:
-        sql += " ORDER BY published_at DESC NULLS LAST"
-        
-    sql += " LIMIT 2000"
+        filters.append(NEGATIVE_SQL)
+    if topic:
+        filters.append("COALESCE(NULLIF(topic, ''), '기타') = @topic")
 
-    job_config = bigquery.QueryJobConfig(
-        query_parameters=[
-            bigquery.ScalarQueryParameter("company_name", "STRING", company_name)
-        ]
-    )
+    # keyset 조건: 커서 위치 다음 행부터 (토픽 전체 개수는 커서와 무관하게 계산한 뒤 적용)
+    keyset = ""
+    if after:
+        op = ">" if direction == "ASC" else "<"
+        keyset = f"WHERE (sort_key {op} @after_ts OR (sort_key = @after_ts AND article_id {op} @after_id))"
 
-    rows = list(client.query(sql, job_config=job_config).result())
+    sql = f"""
+        WITH counted AS (
+            SELECT
+                article_id,
+                title,
+                published_at,
+                url,
+                sentiment,
+                one_sentence_summary,
+                COALESCE(NULLIF(topic, ''), '기타') AS topic_key,
+                COALESCE(published_at, {_NULL_SORT_KEY[sort_order]}) AS sort_key,
+                COUNT(*) OVER (PARTITION BY COALESCE(NULLIF(topic, ''), '기타')) AS topic_total
+            FROM `{table_id}`
+            WHERE {" AND ".join(filters)}
+        ),
+        ranked AS (
+            SELECT
+                *,
+                ROW_NUMBER() OVER (PARTITION BY topic_key ORDER BY sort_key {direction}, article_id {direction}) AS rn
+            FROM counted
+            {keyset}
+        )
+        SELECT article_id, title, published_at, url, sentiment, one_sentence_summary, topic_key, sort_key, topic_total, rn
+        FROM ranked
+        {"WHERE rn <= @limit_per_topic + 1" if limit_per_topic else ""}
+        ORDER BY sort_key {direction}, article_id {direction}
+        {"" if limit_per_topic else "LIMIT @max_articles"}
+    """
+    # 페이지 조회에는 전체 LIMIT을 두지 않음: 토픽당 최대 limit_per_topic + 1행이라 결과 크기는 이미 제한되고,
+    # 전체를 자르면 뒤쪽 토픽의 기사와 다음 페이지 판단용(limit + 1번째) 행이 빠짐
 
+    params = [bigquery.ScalarQueryParameter("company_name", "STRING", company_name)]
+    if limit_per_topic:
+        params.append(bigquery.ScalarQueryParameter("limit_per_topic", "INT64", limit_per_topic))
+    else:
+        params.append(bigquery.ScalarQueryParameter("max_articles", "INT64", LEGACY_MAX_ARTICLES))
+    if topic:
+        params.append(bigquery.ScalarQueryParameter("topic", "STRING", topic))
+    if after:
+        params.append(bigquery.ScalarQueryParameter("after_ts", "TIMESTAMP", after[0]))
+        params.append(bigquery.ScalarQueryParameter("after_id", "INT64", after[1]))
+    job_config = bigquery.QueryJobConfig(query_parameters=params)
+
+    rows = run_query(client, sql, job_config)
+
+    # 전체 정렬 순서대로 돌면서 묶으므로 그룹 순서는 기존과 같음 (각 토픽의 첫 기사 순)
     groups = {}
+    last_sort_keys = {} # 토픽별 마지막으로 담은 기사의 정렬 기준값 (커서용)
     for row in rows:
-        main_kwd = row.topic if row.topic else "기타"
-        
+        group = groups.get(row.topic_key)
+        if group is None:
+            group = groups[row.topic_key] = response_dto.KeywordGroup(
+                keyword=row.topic_key, news_items=[], total_count=row.topic_total
+            )
+        if limit_per_topic and row.rn > limit_per_topic:
+            # limit + 1번째 행이 있으면 다음 페이지가 있음 -> 마지막으로 보낸 기사 위치를 커서로
+            last = group.news_items[-1]
+            group.next_cursor = _encode_cursor(last_sort_keys[row.topic_key], last.article_id)
+            continue
+
         source_name = "언론사"
         if row.url:
             try:
@@ -161,10 +289,7 @@ def get_report_news_list(
             except:
                 pass
 
-        if main_kwd not in groups:
-            groups[main_kwd] = []
-            
-        groups[main_kwd].append(response_dto.NewsSimpleItem(
+        group.news_items.append(response_dto.NewsSimpleItem(
             article_id=row.article_id,
             title=row.title,
             one_line_summary=row.one_sentence_summary if row.one_sentence_summary else row.title,
@@ -173,12 +298,13 @@ def get_report_news_list(
             # 날짜 없으면 현재 시간으로 채움 (Swagger/프론트 오류 방지)
             published_at=row.published_at if row.published_at else datetime.now()
         ))
-    
-    result_groups = [
-        response_dto.KeywordGroup(keyword=k, news_items=v)
-        for k, v in groups.items()
-    ]
-    
+        last_sort_keys[row.topic_key] = row.sort_key
+
+    # 상세 서빙 테이블이 있으면 이 페이지 기사들의 상세를 미리 캐시 (기사를 누를 때 빅쿼리 대기 없음)
+    if ARTICLE_DETAIL_TABLE_NAME:
+        article_ids = [item.article_id for group in groups.values() for item in group.news_items]
+        article_cache.prefetch(article_ids, lambda missing: fetch_article_details(client, missing))
+
     return response_dto.ReportNewsResponse(
-        keyword_groups=result_groups
-    )
\ No newline at end of file
+        keyword_groups=list(groups.values())
+    )
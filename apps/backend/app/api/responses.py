@@ -0,0 +1,54 @@
+import os
+import gzip
+import hashlib
+from typing import Callable, Hashable, Optional, Tuple
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from app.api.cache import response_cache
+
+# =========================================================
+# [완성된 응답 캐시] 응답 모델 대신 직렬화된 JSON 바이트(+gzip 압축본, ETag)를 캐시에 저장합니다.
+#   - 직렬화 : pydantic-core(Rust)의 model_dump_json -> 캐시 적중 시에는 직렬화/검증 없이 바이트만 전송
+#   - 압축   : RESPONSE_GZIP_MIN_BYTES 이상이면 저장할 때 한 번만 gzip (Accept-Encoding: gzip 요청에만 사용)
+#   - ETag   : "v<데이터 버전>-<본문 해시>" -> If-None-Match가 같으면 본문 없이 304
+#              (Cache-Control: no-cache 로 브라우저가 매번 재검증하므로 새 적재 후에는 바로 새 응답)
+# =========================================================
+RESPONSE_GZIP_MIN_BYTES = int(os.getenv("RESPONSE_GZIP_MIN_BYTES", "1024"))
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match: "a", W/"b" 또는 * 형식 비교 (약한 비교)"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class PreparedResponse:
+    __slots__ = ("value", "body", "gzip_body", "etag")
+
+    def __init__(self, value: BaseModel, data_version: int):
+        self.value = value # 응답 모델 (번들 API 등에서 재사용)
+        self.body = value.model_dump_json().encode()
+        self.gzip_body = gzip.compress(self.body, compresslevel=6) if len(self.body) >= RESPONSE_GZIP_MIN_BYTES else None
+        self.etag = f'"v{data_version}-{hashlib.blake2b(self.body, digest_size=8).hexdigest()}"'
+
+    def to_response(self, request: Request) -> Response:
+        headers = {"ETag": self.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if _etag_matches(request.headers.get("if-none-match"), self.etag):
+            return Response(status_code=304, headers=headers)
+        if self.gzip_body is not None and "gzip" in request.headers.get("accept-encoding", ""):
+            headers["Content-Encoding"] = "gzip"
+            return Response(self.gzip_body, media_type="application/json", headers=headers)
+        return Response(self.body, media_type="application/json", headers=headers)
+
+
+def cached_prepared(endpoint: str, params: Tuple[Hashable, ...], compute: Callable[[], BaseModel]) -> PreparedResponse:
+    """응답 모델을 만들어 직렬화까지 끝낸 상태로 캐시 (response_cache의 키/TTL/무효화 규칙)"""
+    key = response_cache.make_key(endpoint, *params)
+    return response_cache.get_or_compute(key, lambda: PreparedResponse(compute(), key[-1]))
+
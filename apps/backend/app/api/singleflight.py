@@ -0,0 +1,56 @@
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+# =========================================================
+# [Single-flight] 같은 키의 작업이 이미 실행 중이면 새로 실행하지 않고 그 결과를 같이 받습니다.
+# 인기 기업 조회가 몰릴 때 같은 빅쿼리 쿼리가 동시에 수십 번 실행되는 것을 한 번으로 줄입니다.
+# (동기 엔드포인트는 스레드풀에서 실행되므로 스레드 기반. 결과는 완료 즉시 잊음 -> 캐시는 cache.py 담당)
+# =========================================================
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.executed = 0  # 실제로 실행한 횟수
+        self.coalesced = 0 # 다른 요청의 결과를 받아 간 횟수
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """key가 같은 동시 호출은 fn을 한 번만 실행하고, 결과(또는 예외)를 모두에게 돌려줍니다."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key] # 이후 요청은 새로 실행 (끝난 결과를 재사용하지 않음)
+            call.done.set()
@@ -5,12 +5,62 @@ import os
 # DB 접속 정보 등을 config.py가 읽기 전에 메모리에 올려야 에러가 안 납니다.
 load_dotenv()
 
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
 from app.api.api_router import api_router
+from app.api.deps import create_bq_client, check_bq_client
+from app.api.company_index import company_index, COMPANY_INDEX_REFRESH_SECONDS
+from app.api.demand import demand_counter, DEMAND_FLUSH_SECONDS
+from app.api.data_version import sync_data_version, DATA_VERSION_POLL_SECONDS
 from fastapi.middleware.cors import CORSMiddleware
 
+async def refresh_company_index_forever(client):
+    """기업명 자동완성 인덱스를 바로 한 번 로드하고, 이후 주기적으로 다시 로드합니다. (기동을 막지 않도록 백그라운드 태스크)"""
+    while True:
+        await run_in_threadpool(company_index.refresh, client)
+        await asyncio.sleep(COMPANY_INDEX_REFRESH_SECONDS)
+
+async def sync_data_version_forever(client):
+    """적재 테이블 수정 시각을 주기적으로 확인해, 새 적재가 있으면 이 인스턴스의 캐시를 비웁니다."""
+    while True:
+        if await run_in_threadpool(sync_data_version, client):
+            await run_in_threadpool(company_index.refresh, client) # 새로 적재된 기업이 자동완성에 보이도록
+        await asyncio.sleep(DATA_VERSION_POLL_SECONDS)
+
+async def flush_demand_forever(client):
+    """기업 조회 수를 주기적으로 빅쿼리 수요 테이블에 적재합니다. (크롤 스케줄러 입력)"""
+    while True:
+        await asyncio.sleep(DEMAND_FLUSH_SECONDS)
+        await run_in_threadpool(demand_counter.flush, client)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    [앱 수명 주기] 시작 시 공유 빅쿼리 클라이언트를 만들고 워밍업, 종료 시 닫습니다.
+    (워밍업 실패는 로그만 남기고 기동은 계속 -> /healthz 에서 확인)
+    기업명 자동완성 인덱스는 백그라운드에서 로드 (로드 전에는 /companies가 빅쿼리로 직접 검색)
+    데이터 버전(적재 테이블 수정 시각)은 주기적으로 확인 -> 다른 인스턴스가 받은 무효화도 반영
+    기업 조회 수는 주기적으로 적재하고, 종료 시 남은 값을 한 번 더 적재
+    """
+    app.state.bq_client = await run_in_threadpool(create_bq_client)
+    await run_in_threadpool(check_bq_client, app.state.bq_client)
+    index_task = asyncio.create_task(refresh_company_index_forever(app.state.bq_client))
+    version_task = asyncio.create_task(sync_data_version_forever(app.state.bq_client))
+    demand_task = asyncio.create_task(flush_demand_forever(app.state.bq_client))
+    try:
+        yield
+    finally:
+        index_task.cancel()
+        version_task.cancel()
+        demand_task.cancel()
+        await run_in_threadpool(demand_counter.flush, app.state.bq_client)
+        app.state.bq_client.close()
+
 # FastAPI 앱 인스턴스 생성
-app = FastAPI(title="InsightBee API")
+app = FastAPI(title="InsightBee API", lifespan=lifespan)
 
 origins = [
     "http://localhost:5173",
@@ -35,3 +85,9 @@ app.include_router(api_router, prefix="/api")
 def read_root():
     """서버 상태 확인용 기본 루트 API"""
     return {"message": "InsightBee API Server Running (Modularized)"}
+
+@app.get("/healthz")
+async def health_check(request: Request):
+    """빅쿼리 연결 상태 확인용 헬스 체크 API (실패 시 503)"""
+    ok = await run_in_threadpool(check_bq_client, request.app.state.bq_client)
+    return JSONResponse({"status": "ok" if ok else "unavailable", "bigquery": ok}, status_code=200 if ok else 503)
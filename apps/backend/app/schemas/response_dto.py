@@ -55,6 +55,8 @@ class KeywordGroup(BaseModel):
     """
     keyword: str
     news_items: List[NewsSimpleItem]
+    total_count: Optional[int] = None  # 이 키워드(토픽)의 전체 기사 수 (news_items는 그중 한 페이지)
+    next_cursor: Optional[str] = None  # 다음 페이지 커서 (topic=keyword, cursor=next_cursor로 요청). 없으면 마지막 페이지
 
 class ReportNewsResponse(BaseModel):
     """
@@ -93,4 +95,16 @@ class CorePointsResponse(BaseModel):
 class CoreKeywordsResponse(BaseModel):
     """핵심 키워드 응답"""
     company_name: str
-    keywords: List[CoreKeywordItem]
\ No newline at end of file
+    keywords: List[CoreKeywordItem]
+
+# --- 3. 리포트 페이지 한 번에 ---
+
+class ReportBundleResponse(BaseModel):
+    """
+    [리포트 페이지 묶음] 요약 + 뉴스 목록(첫 페이지) + 핵심 포인트 + 핵심 키워드
+    """
+    company_name: str
+    summary: Optional[ReportSummaryResponse]  # 기사 데이터가 없으면 null (/report/summary는 404)
+    news: ReportNewsResponse
+    points: CorePointsResponse
+    keywords: CoreKeywordsResponse
@@ -0,0 +1,71 @@
+"""
+[기사 상세 서빙 테이블] TABLE_ARTICLE_DETAIL을 article_id 클러스터링 테이블로 다시 만듭니다.
+bq_full_load 적재 후(자동) 또는 `python -m apps.dataflow.article_detail`로 실행합니다.
+
+백엔드 /news/{article_id}, /news?ids=는 뷰(TABLE_NEWS_COMBINED) 대신 이 테이블을 읽습니다.
+- article_id 클러스터링 : 단건/여러 건 조회 시 해당 블록만 읽음 (뷰는 매번 조인 + 전체 스캔)
+- 본문은 앞 300자만 저장 (상세 화면에서 요약이 없을 때만 쓰는 값, 본문 전체가 스캔 바이트 대부분)
+"""
+import argparse
+
+from google.cloud import bigquery
+
+from apps.dataflow.common import metrics
+from apps.dataflow import config
+
+CONTENT_HEAD_CHARS = 300 # 백엔드 news.py의 본문 대체 요약 길이와 같아야 함
+
+
+def _table_id(name: str) -> str:
+    return f"{config.GCP_PROJECT_ID}.{config.BIGQUERY_DATASET_ID}.{name}"
+
+
+def article_detail_sql(source_id: str, dest_id: str) -> str:
+    """상세 화면에 필요한 컬럼만 뽑아 article_id로 클러스터링된 테이블을 통째로 다시 만듦"""
+    return f"""
+        CREATE OR REPLACE TABLE `{dest_id}`
+        CLUSTER BY article_id
+        AS
+        SELECT
+            article_id,
+            title,
+            SUBSTR(content, 1, {CONTENT_HEAD_CHARS}) AS content_head,
+            published_at,
+            url,
+            summary,
+            career_insight,
+            sentiment
+        FROM `{source_id}`
+        WHERE article_id IS NOT NULL
+        QUALIFY ROW_NUMBER() OVER (PARTITION BY article_id ORDER BY published_at DESC) = 1
+    """
+
+
+def run_article_detail_rollup(client: bigquery.Client = None) -> int:
+    """서빙 테이블을 다시 만들고 행 수를 반환합니다."""
+    if not config.TABLE_ARTICLE_DETAIL:
+        print("[DETAIL] TABLE_ARTICLE_DETAIL is not set. Skipping.")
+        return 0
+    client = client or bigquery.Client(project=config.GCP_PROJECT_ID)
+
+    dest_id = _table_id(config.TABLE_ARTICLE_DETAIL)
+    with metrics.timer("bq_stage_seconds", mode="article_detail", stage="build"):
+        client.query(article_detail_sql(_table_id(config.TABLE_NEWS_COMBINED), dest_id)).result()
+    rows = client.get_table(dest_id).num_rows or 0
+    metrics.inc("bq_rows_exported_total", rows, mode="article_detail")
+    print(f"[DETAIL] rebuilt {config.TABLE_ARTICLE_DETAIL} with {rows} articles")
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the article detail serving table in BigQuery")
+    parser.add_argument("--print-sql", action="store_true", help="실행하지 않고 SQL만 출력")
+    args = parser.parse_args()
+
+    try:
+        if args.print_sql:
+            print(article_detail_sql(_table_id(config.TABLE_NEWS_COMBINED), _table_id(config.TABLE_ARTICLE_DETAIL or "article_detail")))
+        else:
+            run_article_detail_rollup()
+    finally:
+        metrics.write_report(config.METRICS_REPORT_DIR, "article_detail")
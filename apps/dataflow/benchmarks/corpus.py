@@ -0,0 +1,186 @@
+# apps/dataflow/benchmarks/corpus.py
+"""
+[벤치마크 코퍼스] 네트워크 없이 재현 가능한 합성 데이터 생성기
+같은 (size, seed)면 항상 같은 데이터를 만듭니다. (저장소에 대용량 파일을 두지 않기 위해 생성 방식 사용)
+
+- 합성 한국어 기사 : 기업명 + 필터 키워드 + 일반 문장 조합, 일부는 다른 언론사의 거의 같은 기사(클러스터링용)
+- 기사 HTML       : config.SPIDER_RULES 선택자 구조 + 메뉴/광고/스크립트 등 잡음
+- 링크 수집 결과   : 기업별 링크 목록 (기업 간 중복, DB에 이미 있는 링크 포함)
+- DB 행           : bq_full_load.to_bq_row 입력과 같은 dict
+"""
+import hashlib
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List, Set, Tuple
+
+from apps.dataflow import config
+from apps.dataflow.news_pipeline import keywords
+
+COMPANIES = [
+    "삼성전자", "SK하이닉스", "LG에너지솔루션", "현대자동차", "기아", "NAVER", "카카오", "POSCO홀딩스",
+    "LG화학", "셀트리온", "KB금융", "신한지주", "삼성바이오로직스", "한화에어로스페이스", "HD현대중공업",
+    "KT", "SK텔레콤", "LG유플러스", "CJ제일제당", "아모레퍼시픽",
+]
+
+_SUBJECTS = ["회사는", "업계에서는", "관계자는", "증권가에서는", "노조는", "경영진은", "시장에서는", "정부는"]
+_OBJECTS = [
+    "올해 하반기 전략을", "신규 투자 계획을", "글로벌 시장 진출을", "공급망 재편을", "인공지능 사업을",
+    "수출 실적을", "원가 절감 방안을", "해외 법인 운영을", "친환경 전환을", "주주환원 정책을",
+]
+_VERBS = ["발표했다", "검토하고 있다", "강조했다", "추진한다고 밝혔다", "점검했다", "논의 중이다", "확정했다"]
+_FILLERS = [
+    "이번 조치는 중장기 성장 전략의 일환이다.", "전문가들은 향후 흐름을 지켜봐야 한다고 분석했다.",
+    "관련 업계의 관심이 집중되고 있다.", "세부 내용은 다음 달 공개될 예정이다.",
+    "시장 반응은 대체로 긍정적인 것으로 나타났다.", "다만 일부에서는 신중론도 제기된다.",
+]
+
+
+def _keyword_pool() -> List[str]:
+    return sorted(keywords.ALL_KEYWORDS.keys())
+
+
+def _sentence(rng: random.Random, company: str, keyword_pool: List[str]) -> str:
+    roll = rng.random()
+    if roll < 0.25:
+        return f"{company}{rng.choice(['은', '는', '이', '가'])} {rng.choice(keyword_pool)} 관련 {rng.choice(_OBJECTS)} {rng.choice(_VERBS)}."
+    if roll < 0.7:
+        return f"{rng.choice(_SUBJECTS)} {rng.choice(_OBJECTS)} {rng.choice(_VERBS)}."
+    return rng.choice(_FILLERS)
+
+
+def generate_articles(size: int, seed: int = 42, duplicate_ratio: float = 0.2) -> List[Dict]:
+    """합성 기사 size개. duplicate_ratio 비율은 앞선 기사를 조금 바꾼 '다른 언론사의 같은 기사'"""
+    rng = random.Random(seed)
+    keyword_pool = _keyword_pool()
+    presses = sorted(config.SPIDER_RULES.keys())
+    base_time = datetime(2025, 1, 1, 9, 0)
+    articles: List[Dict] = []
+
+    for i in range(size):
+        press = rng.choice(presses)
+        if articles and rng.random() < duplicate_ratio:
+            source = rng.choice(articles)
+            sentences = source["content"].split(". ")
+            sentences[rng.randrange(len(sentences))] = rng.choice(_FILLERS).rstrip(".")
+            company, title, content = source["search_keyword"], source["title"], ". ".join(sentences)
+        else:
+            company = rng.choice(COMPANIES)
+            title = f"{company}, {rng.choice(keyword_pool)} {rng.choice(_OBJECTS).split()[0]} {rng.choice(_VERBS)}"
+            content = " ".join(_sentence(rng, company, keyword_pool) for _ in range(rng.randint(8, 24)))
+
+        url = f"https://www.{press}/article/{i:08d}"
+        articles.append({
+            "url": url,
+            "url_hash": hashlib.md5(url.encode()).hexdigest(),
+            "press": press,
+            "search_keyword": company,
+            "api_title": title,
+            "api_pubDate": "",
+            "title": title,
+            "content": content,
+            "published_at": base_time + timedelta(minutes=7 * i),
+        })
+    return articles
+
+
+def _container(selector: str) -> Tuple[str, str]:
+    """'div#article_body' / 'section.article-body' -> (태그, 속성 문자열)"""
+    if "#" in selector:
+        tag, ident = selector.split("#", 1)
+        return tag, f'id="{ident}"'
+    tag, cls = selector.split(".", 1)
+    return tag, f'class="{cls}"'
+
+
+def render_html(article: Dict, rng: random.Random) -> str:
+    """기사 1개를 언론사 페이지처럼 보이는 HTML로 렌더링"""
+    tag, attrs = _container(config.SPIDER_RULES[article["press"]])
+    paragraphs = "".join(f"<p>{s.strip()}.</p>" for s in article["content"].split(". ") if s.strip())
+    # 실제 언론사 페이지처럼 본문보다 메뉴/스크립트가 훨씬 큼 (페이지당 약 20~40KB)
+    nav = "".join(f'<li><a href="/section/{n}">메뉴 {n}</a></li>' for n in range(rng.randint(150, 400)))
+    tracking = ",".join(str(rng.randint(0, 10**6)) for _ in range(rng.randint(500, 1500)))
+    related = "".join(
+        f'<li><a href="/article/{rng.randint(0, 10**8)}">관련 기사 {n}</a></li>' for n in range(rng.randint(5, 15))
+    )
+    published = article["published_at"].isoformat()
+    return (
+        "<!DOCTYPE html><html lang=\"ko\"><head><meta charset=\"utf-8\">"
+        f"<title>{article['title']} - {article['press']}</title>"
+        f"<meta property=\"og:title\" content=\"{article['title']}\">"
+        f"<meta property=\"article:published_time\" content=\"{published}\">"
+        "<script>window.dataLayer=window.dataLayer||[];function gtag(){dataLayer.push(arguments);}"
+        f"var slots=[{tracking}];</script>"
+        "<style>body{font-family:sans-serif}.ad{display:block}</style></head><body>"
+        f"<header><nav><ul>{nav}</ul></nav></header>"
+        f"<main><h1>{article['title']}</h1><div class=\"byline\">기자 {published}</div>"
+        f"<{tag} {attrs}>{paragraphs}</{tag}>"
+        "<div class=\"ad\">광고</div>"
+        f"<aside><ul>{related}</ul></aside></main>"
+        "<footer>Copyright. 무단 전재 및 재배포 금지</footer></body></html>"
+    )
+
+
+MAX_DISTINCT_PAGES = 2000 # 100k 페이지를 모두 만들면 수 GB가 되므로, 서로 다른 페이지는 이 개수까지만 만들고 반복
+
+
+def generate_html_pages(size: int, seed: int = 42) -> List[Tuple[str, str, str]]:
+    """(url, html, press) 튜플 size개 (MAX_DISTINCT_PAGES개를 순환 사용)"""
+    rng = random.Random(seed + 1)
+    distinct = [
+        (a["url"], render_html(a, rng), a["press"])
+        for a in generate_articles(min(size, MAX_DISTINCT_PAGES), seed)
+    ]
+    return [distinct[i % len(distinct)] for i in range(size)]
+
+
+def generate_link_results(size: int, seed: int = 42) -> Tuple[List[List[Dict[str, str]]], Set[str]]:
+    """
+    collect_all_links가 받는 것과 같은 기업별 링크 목록(총 size개)과 DB에 이미 있는 해시 집합.
+    약 30%는 다른 기업 검색 결과와 겹치고, 약 20%는 이미 DB에 있는 링크.
+    """
+    rng = random.Random(seed + 2)
+    presses = sorted(config.ALLOWED_PRESS_HOSTS)
+    per_company = max(1, size // len(COMPANIES))
+    pool: List[str] = []
+    results: List[List[Dict[str, str]]] = []
+    produced = 0
+
+    for company in COMPANIES:
+        links = []
+        for _ in range(per_company if company != COMPANIES[-1] else size - produced):
+            if pool and rng.random() < 0.3:
+                url = rng.choice(pool)
+            else:
+                press = rng.choice(presses)
+                url = f"https://www.{press}/news/{rng.randint(0, 10**9)}"
+                pool.append(url)
+            links.append({
+                "url": url, "press": url.split("/")[2].removeprefix("www."), "search_keyword": company,
+                "api_title": f"{company} 관련 기사", "api_pubDate": "Mon, 06 Jan 2025 10:00:00 +0900",
+            })
+        produced += len(links)
+        results.append(links)
+
+    existing = {hashlib.md5(url.encode()).hexdigest() for url in rng.sample(pool, len(pool) // 5)}
+    return results, existing
+
+
+def generate_db_rows(size: int, seed: int = 42) -> List[Dict]:
+    """news_articles 행 (iter_article_chunks가 내주는 mapping과 같은 키)"""
+    rows = []
+    for i, a in enumerate(generate_articles(size, seed)):
+        rows.append({
+            "article_id": i + 1,
+            "company_id": COMPANIES.index(a["search_keyword"]) + 1,
+            "title": a["title"],
+            "url": a["url"],
+            "url_hash": a["url_hash"],
+            "content": a["content"],
+            "published_at": a["published_at"],
+            "search_keyword": a["search_keyword"],
+            "score": 20,
+            "matched_keywords": "[('채용', 20)]",
+            "is_passed_rule": True,
+            "updated_at": a["published_at"] + timedelta(hours=1),
+        })
+    return rows
@@ -0,0 +1,107 @@
+# apps/dataflow/benchmarks/e2e_load.py
+"""
+[종단 부하 테스트] mock 서버(mock_server.py)를 같은 프로세스에 띄우고
+링크 수집(collect_all_links) -> 고속 스크래핑(scrape_fast) 경로를 실제 aiohttp 코드 그대로 실행합니다.
+DB에는 쓰지 않으며, 처리량/결과 분포를 출력하고 실행 리포트(metrics)를 남깁니다.
+
+    python -m apps.dataflow.benchmarks.e2e_load --companies 20 --articles 300 --concurrency 50 \\
+        --latency-ms 150 --error-rate 0.03 --rate-429 0.01 --slow-hosts www.hani.co.kr
+
+동시성 설정은 --concurrency / --link-concurrency로 바꿔 가며 비교합니다. (config 값을 실행 중에만 덮어씀)
+"""
+from apps.dataflow.benchmarks import use_dummy_db_env
+
+use_dummy_db_env() # config import 전에
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from collections import Counter
+
+import aiohttp
+
+from apps.dataflow import config
+from apps.dataflow.benchmarks import corpus
+from apps.dataflow.benchmarks.mock_server import add_mock_arguments, mock_config_from_args, start_mock_server
+from apps.dataflow.common import metrics
+
+
+async def run_load_test(args: argparse.Namespace) -> dict:
+    from apps.dataflow.news_pipeline import fetch_policy, scraper
+    from apps.dataflow.news_pipeline.host_router import HostRouter
+
+    base_url = f"http://{args.host}:{args.port}"
+    runner = await start_mock_server(mock_config_from_args(args), args.host, args.port)
+
+    # 파이프라인을 mock 서버로 향하게 함 (이 프로세스 안에서만)
+    config.NAVER_API_BASE_URL = base_url
+    config.SCRAPE_URL_REWRITE_BASE = base_url
+    config.NAVER_API_PAGE_DELAY = args.page_delay
+    config.NAVER_CLIENT_ID = config.NAVER_CLIENT_ID or "mock"
+    config.NAVER_CLIENT_SECRET = config.NAVER_CLIENT_SECRET or "mock"
+    config.CONCURRENT_REQUESTS_LINKS = args.link_concurrency
+    config.CONCURRENT_REQUESTS_SCRAPE_FAST = args.concurrency
+
+    n = len(corpus.COMPANIES)
+    companies = [corpus.COMPANIES[i % n] + (str(i // n) if i >= n else "") for i in range(args.companies)]
+    try:
+        started = time.perf_counter()
+        links = await scraper.collect_all_links(companies, set(), {c: args.articles for c in companies})
+        collect_seconds = time.perf_counter() - started
+
+        router = HostRouter() if args.router else None
+        semaphore = asyncio.Semaphore(config.CONCURRENT_REQUESTS_SCRAPE_FAST)
+        connector = aiohttp.TCPConnector(limit=config.CONCURRENT_REQUESTS_SCRAPE_FAST)
+        started = time.perf_counter()
+        async with aiohttp.ClientSession(connector=connector) as session:
+            results = await asyncio.gather(*(scraper.scrape_fast(session, l, semaphore, router) for l in links))
+        scrape_seconds = time.perf_counter() - started
+
+        outcomes = Counter(
+            "selenium" if r is None else ("dropped" if r is scraper.DROPPED else "success") for r in results
+        )
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"{base_url}/stats") as response:
+                server_stats = await response.json()
+    finally:
+        await runner.cleanup()
+
+    return {
+        "companies": len(companies),
+        "links": len(links),
+        "collect_seconds": round(collect_seconds, 3),
+        "scrape_seconds": round(scrape_seconds, 3),
+        "scrape_per_sec": round(len(links) / scrape_seconds, 1) if scrape_seconds > 0 else None,
+        "outcomes": dict(outcomes),
+        "retries_spent": fetch_policy.retry_budget.spent,
+        "retries_denied": fetch_policy.retry_budget.denied,
+        "server": server_stats,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="End-to-end load test against the local mock server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--companies", type=int, default=20)
+    parser.add_argument("--articles", type=int, default=300, help="기업별 수집 건수 (max_articles)")
+    parser.add_argument("--concurrency", type=int, default=config.CONCURRENT_REQUESTS_SCRAPE_FAST)
+    parser.add_argument("--link-concurrency", type=int, default=config.CONCURRENT_REQUESTS_LINKS)
+    parser.add_argument("--page-delay", type=float, default=0.0, help="Naver API 페이지 간 대기(초)")
+    parser.add_argument("--router", action="store_true", help="HostRouter 사용 (기본: JAVASCRIPT_REQUIRED_SITES)")
+    parser.add_argument("--report-dir", default=config.METRICS_REPORT_DIR)
+    add_mock_arguments(parser)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, force=True)
+    summary = asyncio.run(run_load_test(args))
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    metrics.write_report(args.report_dir, "e2e_load")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
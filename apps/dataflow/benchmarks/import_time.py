@@ -0,0 +1,130 @@
+# apps/dataflow/benchmarks/import_time.py
+"""
+[콜드 스타트 프로파일] 진입점 모듈을 새 인터프리터에서 import하는 데 걸리는 시간을 `python -X importtime`으로 측정합니다.
+무거운 의존성(selenium, pandas, torch 등)이 import 시점에 딸려 오면 실패로 표시합니다. (해당 단계가 실행될 때만 로드해야 함)
+
+    python -m apps.dataflow.benchmarks.import_time
+    python -m apps.dataflow.benchmarks.import_time --module apps.dataflow.news_pipeline.stages --top 30
+    python -m apps.dataflow.benchmarks.import_time --max-seconds 1.0    # 초과하거나 무거운 모듈이 로드되면 exit 1
+
+run.py --import-profile 로 처리량 벤치마크와 함께 실행할 수도 있습니다.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+from apps.dataflow.benchmarks import DUMMY_DB_ENV
+
+DEFAULT_MODULES = ["apps.dataflow.news_pipeline.main", "apps.dataflow.news_pipeline.stages"]
+
+# 진입점 import만으로는 로드되면 안 되는 최상위 패키지
+HEAVY_MODULES = [
+    "selenium", "webdriver_manager", "newspaper", "trafilatura", "bs4",
+    "pandas", "numpy", "torch", "sentence_transformers", "google.cloud.bigquery",
+]
+
+_MARKER = "--- target import ---" # 이 줄 이후의 importtime 출력만 대상 모듈의 것 (인터프리터 시작/프로브 자체 제외)
+# __import__: import 문과 같은 경로 (importlib.import_module로 부르면 대상 모듈 자체가 -X importtime에 잡히지 않음)
+_PROBE = (
+    "import json, sys, time\n"
+    "sys.stderr.write({marker!r} + '\\n'); sys.stderr.flush()\n"
+    "started = time.perf_counter()\n"
+    "__import__({module!r})\n"
+    "elapsed = time.perf_counter() - started\n"
+    "print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {heavy!r} if m in sys.modules]}}))\n"
+)
+
+
+def _parse_importtime(stderr: str) -> List[Dict]:
+    """'import time: self [us] | cumulative | imported package' 줄을 파싱"""
+    entries = []
+    _, _, stderr = stderr.rpartition(_MARKER)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            entries.append({
+                "module": name.strip(),
+                "depth": (len(name) - len(name.lstrip())) // 2,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+            })
+        except ValueError:
+            continue
+    return entries
+
+
+def profile_import(module: str, top: int = 15) -> Dict:
+    """새 인터프리터에서 module을 import하고 소요 시간, 누적 시간 상위 모듈, 로드된 무거운 모듈을 반환합니다."""
+    env = {**DUMMY_DB_ENV, **os.environ}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES, marker=_MARKER)],
+        capture_output=True, text=True, env=env,
+    )
+    if proc.returncode != 0:
+        error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit {proc.returncode}"
+        return {"module": module, "error": error}
+
+    probe = json.loads(proc.stdout.strip().splitlines()[-1])
+    entries = _parse_importtime(proc.stderr)
+    # 진입점 패키지(depth 0)와 그 직접 import(depth 1)만 표시 (더 깊은 모듈은 이 안에 누적됨)
+    top_level = sorted((e for e in entries if e["depth"] <= 1), key=lambda e: e["cumulative_ms"], reverse=True)
+    return {
+        "module": module,
+        "seconds": round(probe["seconds"], 4),
+        "heavy_loaded": probe["loaded"],
+        "top": top_level[:top],
+    }
+
+
+def print_profile(result: Dict) -> None:
+    if "error" in result:
+        print(f"{result['module']}: import FAILED ({result['error']})")
+        return
+    heavy = ", ".join(result["heavy_loaded"]) or "-"
+    print(f"{result['module']}: {result['seconds']:.3f}s (heavy modules loaded: {heavy})")
+    for e in result["top"]:
+        print(f"  {e['cumulative_ms']:>9.1f} ms  {e['module']}")
+
+
+def check(results: List[Dict], max_seconds: Optional[float]) -> List[str]:
+    """실패 사유 목록 (import 오류, 무거운 모듈 로드, 시간 초과)"""
+    problems = []
+    for r in results:
+        if "error" in r:
+            problems.append(f"{r['module']}: {r['error']}")
+            continue
+        if r["heavy_loaded"]:
+            problems.append(f"{r['module']}: loads {', '.join(r['heavy_loaded'])} at import time")
+        if max_seconds is not None and r["seconds"] > max_seconds:
+            problems.append(f"{r['module']}: {r['seconds']:.3f}s > {max_seconds:.3f}s")
+    return problems
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Cold-start import profile for dataflow entry points")
+    parser.add_argument("--module", nargs="+", default=DEFAULT_MODULES)
+    parser.add_argument("--top", type=int, default=15, help="누적 시간 상위 N개 모듈 출력")
+    parser.add_argument("--max-seconds", type=float, default=None, help="허용 import 시간(초)")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args(argv)
+
+    results = [profile_import(m, args.top) for m in args.module]
+    for r in results:
+        print_profile(r)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    problems = check(results, args.max_seconds)
+    for line in problems:
+        print(f"[COLD START] {line}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+# apps/dataflow/benchmarks/mock_server.py
+"""
+[로컬 mock 서버] Naver 뉴스 검색 API와 언론사 기사 페이지를 대신하는 aiohttp 서버 (부하 테스트용)
+실제 Naver/언론사에 요청하지 않으므로 API 할당량을 쓰지 않고, 지연/오류/429를 마음대로 재현할 수 있습니다.
+
+    python -m apps.dataflow.benchmarks.mock_server --port 8089 --latency-ms 150 --error-rate 0.02 \\
+        --rate-429 0.01 --slow-hosts www.hani.co.kr --slow-latency-ms 8000
+
+파이프라인을 mock 서버로 향하게 하려면 (config.py 참고)
+    NAVER_API_BASE_URL=http://127.0.0.1:8089
+    SCRAPE_URL_REWRITE_BASE=http://127.0.0.1:8089
+
+엔드포인트
+- GET /v1/search/news.json?query=&display=&start=&sort=date : Naver 응답 형식 (items, total, start, display)
+- GET /press/{host}/{path}  : 기사 HTML (--html-dir의 녹화 파일 또는 corpus.render_html로 생성)
+- GET /stats                : 상태 코드별 응답 수
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import zlib
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from typing import Dict, List, Optional, Set
+
+from aiohttp import web
+
+from apps.dataflow.benchmarks import corpus
+
+
+@dataclass
+class MockConfig:
+    articles_per_company: int = 300     # 검색어마다 존재하는 기사 수 (total)
+    latency_ms: float = 100.0           # 기사 페이지 평균 지연 (지수 분포)
+    api_latency_ms: float = 50.0        # Naver API 평균 지연
+    error_rate: float = 0.0             # 기사 페이지 5xx 비율
+    not_found_rate: float = 0.0         # 기사 페이지 404 비율
+    rate_429: float = 0.0               # 기사 페이지 429 비율
+    api_rate_429: float = 0.0           # Naver API 429 비율
+    slow_hosts: Set[str] = field(default_factory=set)      # 이 호스트들은 slow_latency_ms로 응답
+    slow_latency_ms: float = 5000.0
+    forbidden_hosts: Set[str] = field(default_factory=set) # 403 (봇 차단 -> Selenium 경로)
+    html_dir: Optional[str] = None      # 녹화된 기사 HTML 디렉터리 (<dir>/<host>/*.html 또는 <dir>/*.html)
+    seed: int = 42
+
+
+def _load_recorded_pages(html_dir: str) -> Dict[str, List[str]]:
+    """호스트별 녹화 HTML 목록. 호스트 하위 디렉터리가 아닌 파일은 '*' (모든 호스트 공용)"""
+    pages: Dict[str, List[str]] = {}
+    for root, _, files in os.walk(html_dir):
+        rel = os.path.relpath(root, html_dir)
+        key = "*" if rel == "." else rel.split(os.sep)[0]
+        for name in sorted(files):
+            if name.endswith((".html", ".htm")):
+                with open(os.path.join(root, name), encoding="utf-8", errors="replace") as f:
+                    pages.setdefault(key, []).append(f.read())
+    return pages
+
+
+class MockServer:
+    def __init__(self, cfg: MockConfig):
+        self.cfg = cfg
+        self.rng = random.Random(cfg.seed)
+        self.stats: Counter = Counter()
+        self.recorded = _load_recorded_pages(cfg.html_dir) if cfg.html_dir else {}
+        self.presses = sorted(corpus.config.ALLOWED_PRESS_HOSTS)
+
+    async def _delay(self, mean_ms: float) -> None:
+        if mean_ms > 0:
+            await asyncio.sleep(self.rng.expovariate(1000.0 / mean_ms))
+
+    def _respond(self, kind: str, response: web.StreamResponse) -> web.StreamResponse:
+        self.stats[f"{kind}:{response.status}"] += 1
+        return response
+
+    # --- Naver 뉴스 검색 API ---
+    async def naver_news(self, request: web.Request) -> web.Response:
+        if "X-Naver-Client-Id" not in request.headers:
+            return self._respond("api", web.json_response({"errorMessage": "Not Exist Client ID"}, status=401))
+        await self._delay(self.cfg.api_latency_ms)
+        if self.rng.random() < self.cfg.api_rate_429:
+            return self._respond("api", web.json_response({"errorCode": "012"}, status=429))
+
+        query = request.query.get("query", "")
+        display = min(int(request.query.get("display", 10)), 100)
+        start = int(request.query.get("start", 1))
+        total = self.cfg.articles_per_company
+        company_key = zlib.crc32(query.encode())
+        now = datetime.now(timezone(timedelta(hours=9)))
+
+        items = []
+        for n in range(start, min(start + display, total + 1)):
+            article_no = f"{company_key:08x}-{n:04d}"
+            press = self.presses[zlib.crc32(article_no.encode()) % len(self.presses)]
+            url = f"https://www.{press}/article/{article_no}"
+            items.append({
+                "title": f"<b>{query}</b> 관련 기사 {n}",
+                "originallink": url,
+                "link": url,
+                "description": f"<b>{query}</b> 기사 요약",
+                "pubDate": format_datetime(now - timedelta(minutes=17 * n)),
+            })
+        body = {"lastBuildDate": format_datetime(now), "total": total, "start": start, "display": len(items), "items": items}
+        return self._respond("api", web.json_response(body))
+
+    # --- 언론사 기사 페이지 ---
+    def _render_article(self, host: str, path: str) -> str:
+        page_seed = int(hashlib.md5(f"{host}/{path}".encode()).hexdigest()[:8], 16)
+        recorded = self.recorded.get(host) or self.recorded.get("*")
+        if recorded:
+            return recorded[page_seed % len(recorded)]
+
+        press = host.removeprefix("www.")
+        article = corpus.generate_articles(1, seed=page_seed)[0]
+        if press in corpus.config.SPIDER_RULES:
+            article["press"] = press # 해당 언론사 선택자 구조로 렌더링
+        return corpus.render_html(article, random.Random(page_seed))
+
+    async def press_article(self, request: web.Request) -> web.Response:
+        host = request.match_info["host"]
+        path = request.match_info["path"]
+        if host in self.cfg.forbidden_hosts:
+            return self._respond("press", web.Response(status=403, text="Forbidden"))
+
+        await self._delay(self.cfg.slow_latency_ms if host in self.cfg.slow_hosts else self.cfg.latency_ms)
+        roll = self.rng.random()
+        if roll < self.cfg.rate_429:
+            return self._respond("press", web.Response(status=429, headers={"Retry-After": "1"}, text="Too Many Requests"))
+        roll -= self.cfg.rate_429
+        if roll < self.cfg.error_rate:
+            return self._respond("press", web.Response(status=503, text="Service Unavailable"))
+        roll -= self.cfg.error_rate
+        if roll < self.cfg.not_found_rate:
+            return self._respond("press", web.Response(status=404, text="Not Found"))
+
+        html = self._render_article(host, path)
+        return self._respond("press", web.Response(text=html, content_type="text/html", charset="utf-8"))
+
+    async def stats_handler(self, request: web.Request) -> web.Response:
+        return web.json_response(dict(self.stats))
+
+
+def create_app(cfg: MockConfig) -> web.Application:
+    server = MockServer(cfg)
+    app = web.Application()
+    app["mock"] = server
+    app.router.add_get("/v1/search/news.json", server.naver_news)
+    app.router.add_get("/press/{host}/{path:.*}", server.press_article)
+    app.router.add_get("/stats", server.stats_handler)
+    return app
+
+
+async def start_mock_server(cfg: MockConfig, host: str = "127.0.0.1", port: int = 8089) -> web.AppRunner:
+    """[비동기] 같은 이벤트 루프에서 mock 서버를 띄웁니다. 종료 시 runner.cleanup() 호출"""
+    runner = web.AppRunner(create_app(cfg), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+def _csv_set(value: str) -> Set[str]:
+    return {v.strip() for v in value.split(",") if v.strip()}
+
+
+def add_mock_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--articles-per-company", type=int, default=300)
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--api-latency-ms", type=float, default=50.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--not-found-rate", type=float, default=0.0)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--api-rate-429", type=float, default=0.0)
+    parser.add_argument("--slow-hosts", type=_csv_set, default=set(), help="쉼표로 구분한 호스트 (e.g. www.hani.co.kr)")
+    parser.add_argument("--slow-latency-ms", type=float, default=5000.0)
+    parser.add_argument("--forbidden-hosts", type=_csv_set, default=set())
+    parser.add_argument("--html-dir", default=None)
+    parser.add_argument("--seed", type=int, default=42)
+
+
+def mock_config_from_args(args: argparse.Namespace) -> MockConfig:
+    return MockConfig(
+        articles_per_company=args.articles_per_company, latency_ms=args.latency_ms,
+        api_latency_ms=args.api_latency_ms, error_rate=args.error_rate, not_found_rate=args.not_found_rate,
+        rate_429=args.rate_429, api_rate_429=args.api_rate_429, slow_hosts=args.slow_hosts,
+        slow_latency_ms=args.slow_latency_ms, forbidden_hosts=args.forbidden_hosts,
+        html_dir=args.html_dir, seed=args.seed,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mock Naver news API + press sites for load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+    web.run_app(create_app(mock_config_from_args(args)), host=args.host, port=args.port, access_log=None)
+
+
+if __name__ == "__main__":
+    main()
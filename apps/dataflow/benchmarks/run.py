@@ -0,0 +1,284 @@
+# apps/dataflow/benchmarks/run.py
+"""
+[오프라인 벤치마크] dataflow 핵심 경로의 처리량(items/s)과 최대 메모리(tracemalloc peak)를 측정합니다.
+네트워크/DB 없이 실행됩니다. (DB 접속 환경 변수가 없으면 더미 값을 채워 config import만 통과시킴)
+
+    python -m apps.dataflow.benchmarks.run                          # 전체, 1k/10k/100k
+    python -m apps.dataflow.benchmarks.run --bench parse filter --sizes 1000 10000
+    python -m apps.dataflow.benchmarks.run --output bench.json      # 결과 저장
+    python -m apps.dataflow.benchmarks.run --baseline bench.json    # 기준 대비 처리량이 tolerance 이상 떨어지면 exit 1
+    python -m apps.dataflow.benchmarks.run --import-profile         # 진입점 콜드 스타트(import 시간)도 측정 (import_time.py)
+
+벤치마크
+- parse   : scraper._parse_content_common (합성 언론사 HTML)
+- filter  : filter.filter_and_score_article
+- cluster : clustering._perform_clustering_logic (기본은 해시 기반 가짜 인코더, --model로 실제 모델 사용)
+- dedupe  : scraper.dedupe_links (collect_all_links의 중복 제거)
+- bq_rows : bq_full_load.to_bq_row + NDJSON 직렬화
+"""
+from apps.dataflow.benchmarks import use_dummy_db_env
+
+use_dummy_db_env() # config import 전에
+
+import argparse
+import gc
+import json
+import logging
+import platform
+import sys
+import time
+import tracemalloc
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from apps.dataflow.benchmarks import corpus
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+
+@dataclass
+class Benchmark:
+    name: str
+    setup: Callable[[int], Any]   # size -> payload (시간 측정 제외)
+    run: Callable[[Any], int]     # payload -> 처리한 항목 수
+    max_size: Optional[int] = None # 이보다 큰 크기는 건너뜀 (O(n^2) 등)
+
+
+# --- 벤치마크 정의 ---
+
+def _setup_parse(size: int):
+    from apps.dataflow.news_pipeline import scraper
+    return scraper, corpus.generate_html_pages(size)
+
+
+def _run_parse(payload) -> int:
+    scraper, pages = payload
+    for url, html, press in pages:
+        try:
+            scraper._parse_content_common(url, html, press)
+        except ValueError:
+            pass # 파싱 실패도 처리한 항목으로 셈 (실패 경로 비용도 실제로 발생하므로)
+    return len(pages)
+
+
+def _setup_filter(size: int):
+    from apps.dataflow.news_pipeline import filter as news_filter
+    return news_filter, corpus.generate_articles(size)
+
+
+def _run_filter(payload) -> int:
+    news_filter, articles = payload
+    for article in articles:
+        news_filter.filter_and_score_article(article)
+    return len(articles)
+
+
+class HashingEncoder:
+    """
+    네트워크 없이 쓰는 가짜 문장 인코더: 문자 bigram을 crc32로 해싱한 L2 정규화 벡터.
+    거의 같은 기사끼리는 코사인 유사도가 높게 나오므로 클러스터링 경로 전체를 돌릴 수 있음.
+    """
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+
+    def encode(self, sentences: List[str]):
+        import numpy as np
+        import torch
+
+        vectors = np.zeros((len(sentences), self.dim), dtype=np.float32)
+        for row, sentence in enumerate(sentences):
+            for i in range(len(sentence) - 1):
+                vectors[row, zlib.crc32(sentence[i:i + 2].encode()) % self.dim] += 1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return torch.from_numpy(vectors / norms)
+
+
+def _make_setup_cluster(model_name: Optional[str]):
+    def setup(size: int):
+        import pandas as pd
+        from apps.dataflow.news_pipeline import clustering
+
+        if model_name:
+            from sentence_transformers import SentenceTransformer
+            model = SentenceTransformer(model_name) # 로컬 캐시에 있어야 함 (오프라인)
+        else:
+            model = HashingEncoder()
+        articles = corpus.generate_articles(size)
+        df = pd.DataFrame({"article_id": range(1, size + 1), "content": [a["content"] for a in articles]})
+        return clustering, df, model
+    return setup
+
+
+def _run_cluster(payload) -> int:
+    clustering, df, model = payload
+    clustering._perform_clustering_logic(df, model)
+    return len(df)
+
+
+def _setup_dedupe(size: int):
+    from apps.dataflow.news_pipeline import scraper
+    results, existing = corpus.generate_link_results(size)
+    return scraper, results, existing
+
+
+def _run_dedupe(payload) -> int:
+    scraper, results, existing = payload
+    scraper.dedupe_links(results, existing)
+    return sum(len(r) for r in results)
+
+
+def _setup_bq_rows(size: int):
+    from apps.dataflow import bq_full_load
+    return bq_full_load, corpus.generate_db_rows(size)
+
+
+def _run_bq_rows(payload) -> int:
+    bq_full_load, rows = payload
+    ingested_at_iso = datetime.now(timezone.utc).isoformat()
+    for r in rows:
+        json.dumps(bq_full_load.to_bq_row(r, ingested_at_iso), ensure_ascii=False)
+    return len(rows)
+
+
+def build_benchmarks(model_name: Optional[str] = None) -> Dict[str, Benchmark]:
+    return {
+        "parse": Benchmark("parse", _setup_parse, _run_parse),
+        "filter": Benchmark("filter", _setup_filter, _run_filter),
+        # 유사도 계산이 O(n^2)이라 100k는 기본 제외
+        "cluster": Benchmark("cluster", _make_setup_cluster(model_name), _run_cluster, max_size=10_000),
+        "dedupe": Benchmark("dedupe", _setup_dedupe, _run_dedupe),
+        "bq_rows": Benchmark("bq_rows", _setup_bq_rows, _run_bq_rows),
+    }
+
+
+# --- 측정 ---
+
+def measure(bench: Benchmark, size: int, repeat: int, with_memory: bool) -> Dict[str, Any]:
+    """repeat번 중 가장 빠른 시간으로 처리량 계산, 메모리는 별도 1회 실행(tracemalloc은 실행을 느리게 하므로)"""
+    best = float("inf")
+    items = 0
+    for _ in range(repeat):
+        payload = bench.setup(size) # 매번 새로 (dedupe처럼 입력을 수정하는 경로가 있으므로)
+        gc.collect()
+        started = time.perf_counter()
+        items = bench.run(payload)
+        best = min(best, time.perf_counter() - started)
+        del payload
+
+    peak_mb = None
+    if with_memory:
+        payload = bench.setup(size)
+        gc.collect()
+        tracemalloc.start()
+        bench.run(payload)
+        peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+        del payload
+
+    return {
+        "bench": bench.name,
+        "size": size,
+        "items": items,
+        "seconds": round(best, 4),
+        "items_per_sec": round(items / best, 1) if best > 0 else None,
+        "peak_mb": round(peak_mb, 2) if peak_mb is not None else None,
+    }
+
+
+def compare(results: List[Dict], baseline: List[Dict], tolerance: float) -> List[str]:
+    """기준 결과 대비 처리량이 tolerance(비율) 이상 떨어진 항목 목록"""
+    base = {(r["bench"], r["size"]): r for r in baseline}
+    regressions = []
+    for r in results:
+        b = base.get((r["bench"], r["size"]))
+        if not b or not b.get("items_per_sec") or not r.get("items_per_sec"):
+            continue
+        ratio = r["items_per_sec"] / b["items_per_sec"]
+        if ratio < 1 - tolerance:
+            regressions.append(
+                f"{r['bench']}@{r['size']}: {r['items_per_sec']:.1f}/s vs baseline {b['items_per_sec']:.1f}/s ({ratio:.0%})"
+            )
+    return regressions
+
+
+def _print_table(results: List[Dict]) -> None:
+    print(f"{'bench':<10}{'size':>9}{'seconds':>11}{'items/s':>14}{'peak MB':>10}")
+    for r in results:
+        peak = f"{r['peak_mb']:.1f}" if r["peak_mb"] is not None else "-"
+        print(f"{r['bench']:<10}{r['size']:>9}{r['seconds']:>11.3f}{r['items_per_sec']:>14.1f}{peak:>10}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="InsightBee dataflow offline benchmarks")
+    parser.add_argument("--bench", nargs="+", default=None, help="실행할 벤치마크 (기본: 전체)")
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3, help="시간 측정 반복 횟수 (가장 빠른 값 사용)")
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc 메모리 측정 생략")
+    parser.add_argument("--model", default=None, help="클러스터링에 쓸 SentenceTransformer 모델 (로컬 캐시 필요)")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", default=None, help="비교할 이전 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="허용 처리량 감소 비율")
+    parser.add_argument("--import-profile", action="store_true", help="진입점 import 시간/무거운 모듈 로드 여부 측정")
+    parser.add_argument("--max-import-seconds", type=float, default=None, help="--import-profile 허용 시간(초)")
+    args = parser.parse_args(argv)
+
+    # 필터/스크래퍼의 기사별 INFO 로그가 측정을 왜곡하지 않도록
+    logging.basicConfig(level=logging.WARNING, force=True)
+
+    benchmarks = build_benchmarks(args.model)
+    names = args.bench or list(benchmarks)
+    unknown = [n for n in names if n not in benchmarks]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)} (choose from {', '.join(benchmarks)})")
+
+    results = []
+    for name in names:
+        bench = benchmarks[name]
+        for size in args.sizes:
+            if bench.max_size and size > bench.max_size:
+                print(f"[skip] {name}@{size} (max_size={bench.max_size})", file=sys.stderr)
+                continue
+            results.append(measure(bench, size, args.repeat, not args.no_memory))
+            print(f"[done] {name}@{size}", file=sys.stderr)
+
+    _print_table(results)
+
+    # 콜드 스타트: 결과 비교(baseline)가 아니라 절대 기준(무거운 모듈 로드 금지, 허용 시간)으로 판정
+    import_results: List[Dict] = []
+    import_problems: List[str] = []
+    if args.import_profile:
+        from apps.dataflow.benchmarks import import_time
+        import_results = [import_time.profile_import(m) for m in import_time.DEFAULT_MODULES]
+        for r in import_results:
+            import_time.print_profile(r)
+        import_problems = import_time.check(import_results, args.max_import_seconds)
+        for line in import_problems:
+            print(f"[COLD START] {line}", file=sys.stderr)
+
+    if args.output:
+        report = {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "results": results,
+            "imports": import_results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f)["results"], args.tolerance)
+        for line in regressions:
+            print(f"[REGRESSION] {line}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 1 if import_problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,88 +1,418 @@
+import argparse
 import asyncio
+import gzip
+import json
+import os
+import tempfile
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timezone
+from typing import AsyncIterator, List, Optional, Tuple
 
 from sqlalchemy import text
 
 from google.cloud import bigquery
+from google.api_core.exceptions import NotFound
 
 from apps.dataflow.common.db_sa import async_engine
-from apps.dataflow import config 
-
-
-async def fetch_all_articles() -> list[dict]:
-    """Cloud SQL(Postgres)에서 news_articles 전체를 가져오는 비동기 함수."""
-    async with async_engine.connect() as conn: 
-        result = await conn.execute(
-            text(
-                """
-                SELECT
-                  article_id,
-                  company_id,
-                  title,
-                  url,
-                  url_hash,
-                  content,
-                  published_at,
-                  search_keyword,
-                  score,
-                  matched_keywords,
-                  is_passed_rule,
-                  updated_at
-                FROM news_articles
-                """
-            )
+from apps.dataflow.common import metrics
+from apps.dataflow import config
+
+
+ARTICLE_COLUMNS_SQL = """
+  article_id,
+  company_id,
+  title,
+  url,
+  url_hash,
+  content,
+  published_at,
+  search_keyword,
+  score,
+  matched_keywords,
+  is_passed_rule,
+  updated_at
+"""
+
+
+async def iter_article_chunks(
+    where_sql: str = "",
+    params: Optional[dict] = None,
+    chunk_size: int = config.BQ_EXPORT_CHUNK_SIZE,
+) -> AsyncIterator[list]:
+    """
+    Cloud SQL(Postgres)의 news_articles를 서버 사이드 커서로 chunk_size개씩 읽어오는 비동기 제너레이터.
+    전체 테이블을 한 번에 메모리에 올리지 않으므로 테이블이 커져도 메모리 사용량이 일정함.
+    where_sql(예: "WHERE updated_at >= :watermark")로 읽을 범위를 제한할 수 있음.
+    """
+    async with async_engine.connect() as conn:
+        result = await conn.stream(
+            text(f"SELECT {ARTICLE_COLUMNS_SQL} FROM news_articles {where_sql}"),
+            params or {},
+            execution_options={"yield_per": chunk_size},
         )
-        rows = result.mappings().all()  # Row -> dict-like
-        return [dict(row) for row in rows]
+        async for partition in result.mappings().partitions(chunk_size):
+            yield partition
+
+
+def to_bq_row(r, ingested_at_iso: str) -> dict:
+    """Postgres 행(dict-like)을 BigQuery 적재용 dict로 변환."""
+    published_at = r["published_at"]
+    updated_at = r["updated_at"]
 
+    return {
+        "article_id":       r["article_id"],
+        "company_id":       r["company_id"],
+        "title":            r["title"],
+        "url":              r["url"],
+        "url_hash":         r["url_hash"],
+        "content":          r["content"],
+        "published_at":     published_at.isoformat() if published_at else None,
+        "search_keyword":   r["search_keyword"],
+        "score":            r["score"],
+        "matched_keywords": r["matched_keywords"],
+        "is_passed_rule" :  r["is_passed_rule"],
+        "updated_at":       updated_at.isoformat() if updated_at else None,
+        "ingested_at":      ingested_at_iso
+    }
 
-async def run_full_load() -> None:
-    # 1) Postgres에서 전체 기사 읽기
-    rows = await fetch_all_articles()
-    print(f"[FULL LOAD] fetched {len(rows)} rows from Cloud SQL")
 
-    # 2) BigQuery 클라이언트
+async def write_articles_ndjson_gz(path: str, where_sql: str = "", params: Optional[dict] = None) -> int:
+    """news_articles를 gzip 압축된 NDJSON 파일로 스트리밍 저장하고 행 수를 반환."""
+    ingested_at_iso = datetime.now(timezone.utc).isoformat()
+    count = 0
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        async for chunk in iter_article_chunks(where_sql, params):
+            for r in chunk:
+                f.write(json.dumps(to_bq_row(r, ingested_at_iso), ensure_ascii=False))
+                f.write("\n")
+            count += len(chunk)
+            print(f"[EXPORT] exported {count} rows...")
+    return count
+
+
+def get_watermark(client: bigquery.Client, table_id: str) -> Optional[datetime]:
+    """
+    BigQuery raw 테이블에 이미 적재된 가장 최근 updated_at(워터마크)을 반환.
+    테이블이 없거나 비어 있으면 None (→ 전체 적재 필요).
+    """
+    try:
+        client.get_table(table_id)
+    except NotFound:
+        return None
+
+    rows = list(client.query(f"SELECT MAX(updated_at) AS watermark FROM `{table_id}`").result())
+    watermark = rows[0].watermark if rows else None
+    if watermark is None:
+        return None
+    # BigQuery TIMESTAMP(UTC) -> Postgres updated_at(naive)과 비교할 수 있도록 tz 제거
+    return watermark.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+async def run_incremental_load() -> None:
+    """
+    워터마크 이후 변경된(updated_at >= watermark) 기사만 staging 테이블에 적재한 뒤
+    article_id 기준으로 raw 테이블에 MERGE.
+    (같은 updated_at 행이 다시 포함되어도 MERGE라서 중복되지 않음)
+    """
     client = bigquery.Client(project=config.GCP_PROJECT_ID)
     table_id = f"{config.GCP_PROJECT_ID}.{config.BIGQUERY_DATASET_ID}.{config.TABLE_NEWS_RAW}"
+    staging_id = f"{table_id}{config.BQ_STAGING_SUFFIX}"
 
-    ingested_at = datetime.now(timezone.utc)
+    watermark = get_watermark(client, table_id)
+    if watermark is None:
+        print(f"[INCREMENTAL] no watermark found in {table_id}. Falling back to full load.")
+        await run_full_load()
+        return
+    print(f"[INCREMENTAL] watermark = {watermark.isoformat()}")
 
-    # 3) BigQuery에 넣을 형태로 가공
-    bq_rows = []
-    for r in rows:
-        published_at = r["published_at"]
-        updated_at = r["updated_at"]
-
-        bq_rows.append(
-            {
-                "article_id":       r["article_id"],
-                "company_id":       r["company_id"],
-                "title":            r["title"],
-                "url":              r["url"],
-                "url_hash":         r["url_hash"],
-                "content":          r["content"],
-                "published_at":     published_at.isoformat() if published_at else None,
-                "search_keyword":   r["search_keyword"],
-                "score":            r["score"],
-                "matched_keywords": r["matched_keywords"],
-                "is_passed_rule" :  r["is_passed_rule"],
-                "updated_at":       updated_at.isoformat() if published_at else None,
-                "ingested_at":      ingested_at.isoformat()
-            }
+    tmp = tempfile.NamedTemporaryFile(suffix=".json.gz", delete=False)
+    tmp.close()
+    try:
+        # 1) 변경분만 Postgres -> 임시 파일
+        with metrics.timer("bq_stage_seconds", mode="incremental", stage="export"):
+            row_count = await write_articles_ndjson_gz(
+                tmp.name, "WHERE updated_at >= :watermark", {"watermark": watermark}
+            )
+        metrics.inc("bq_rows_exported_total", row_count, mode="incremental")
+        metrics.inc("bq_bytes_uploaded_total", os.path.getsize(tmp.name), mode="incremental")
+        print(f"[INCREMENTAL] fetched {row_count} changed rows from Cloud SQL")
+        if row_count == 0:
+            return
+
+        # 2) staging 테이블에 적재 (raw 테이블과 같은 스키마 사용 → MERGE 시 타입 일치)
+        target = client.get_table(table_id)
+        job_config = bigquery.LoadJobConfig(
+            source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
+            write_disposition="WRITE_TRUNCATE",
+            schema=target.schema,
+            ignore_unknown_values=True,
+        )
+        with metrics.timer("bq_stage_seconds", mode="incremental", stage="load"), open(tmp.name, "rb") as f:
+            job = client.load_table_from_file(f, destination=staging_id, job_config=job_config)
+            job.result()
+
+        # 3) staging -> raw MERGE (article_id 기준 upsert)
+        columns = [field.name for field in target.schema]
+        update_set = ",\n              ".join(f"T.{c} = S.{c}" for c in columns if c != "article_id")
+        merge_sql = f"""
+            MERGE `{table_id}` T
+            USING `{staging_id}` S
+            ON T.article_id = S.article_id
+            WHEN MATCHED THEN UPDATE SET
+              {update_set}
+            WHEN NOT MATCHED THEN INSERT ROW
+        """
+        with metrics.timer("bq_stage_seconds", mode="incremental", stage="merge"):
+            client.query(merge_sql).result()
+        print(f"[INCREMENTAL] merged {row_count} rows into {table_id}")
+    finally:
+        os.remove(tmp.name)
+        await async_engine.dispose()
+
+
+async def _full_load_single(client: bigquery.Client, table_id: str) -> None:
+    """[단일 커넥션] 전체 테이블을 gzip NDJSON 하나로 스트리밍한 뒤 WRITE_TRUNCATE 적재."""
+    tmp = tempfile.NamedTemporaryFile(suffix=".json.gz", delete=False)
+    tmp.close()
+    try:
+        # 1) Postgres -> 임시 파일 (gzip NDJSON, 청크 단위 스트리밍)
+        with metrics.timer("bq_stage_seconds", mode="full", stage="export"):
+            row_count = await write_articles_ndjson_gz(tmp.name)
+        metrics.inc("bq_rows_exported_total", row_count, mode="full")
+        metrics.inc("bq_bytes_uploaded_total", os.path.getsize(tmp.name), mode="full")
+        print(f"[FULL LOAD] fetched {row_count} rows from Cloud SQL")
+
+        # 2) BigQuery로 적재 (WRITE_TRUNCATE → full load)
+        # load_table_from_json과 동일하게 NDJSON + 스키마 자동 감지
+        job_config = bigquery.LoadJobConfig(
+            source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
+            write_disposition="WRITE_TRUNCATE",
+            autodetect=True,
         )
+        with metrics.timer("bq_stage_seconds", mode="full", stage="load"), open(tmp.name, "rb") as f:
+            job = client.load_table_from_file(f, destination=table_id, job_config=job_config)
+            job.result()
+        print(f"[FULL LOAD] loaded {row_count} rows into {table_id}")
+    finally:
+        os.remove(tmp.name)
+
+
+# --- 병렬 전체 적재 (article_id 구간 분할) ---
+
+# Parquet 파일 및 staging 테이블 스키마 (NDJSON 자동 감지 결과와 같은 타입)
+BQ_RAW_SCHEMA = [
+    bigquery.SchemaField("article_id", "INT64"),
+    bigquery.SchemaField("company_id", "INT64"),
+    bigquery.SchemaField("title", "STRING"),
+    bigquery.SchemaField("url", "STRING"),
+    bigquery.SchemaField("url_hash", "STRING"),
+    bigquery.SchemaField("content", "STRING"),
+    bigquery.SchemaField("published_at", "TIMESTAMP"),
+    bigquery.SchemaField("search_keyword", "STRING"),
+    bigquery.SchemaField("score", "INT64"),
+    bigquery.SchemaField("matched_keywords", "STRING"),
+    bigquery.SchemaField("is_passed_rule", "BOOL"),
+    bigquery.SchemaField("updated_at", "TIMESTAMP"),
+    bigquery.SchemaField("ingested_at", "TIMESTAMP"),
+]
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """
+    Postgres의 tz 없는 시각을 UTC로 간주해 tz를 붙임 (JSON 적재 경로에서 빅쿼리가 해석하는 방식과 동일).
+    tz 없는 Parquet timestamp는 빅쿼리가 DATETIME으로 읽어 TIMESTAMP 컬럼 적재가 실패하므로 필요.
+    """
+    if value is None:
+        return None
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def write_parquet_part(rows: List[dict], path: str, ingested_at: datetime) -> int:
+    """
+    [워커 프로세스] Postgres 행 목록을 Arrow 테이블로 변환해 Parquet 파일로 저장.
+    (CPU를 쓰는 변환/압축을 이벤트 루프 밖의 별도 프로세스에서 수행)
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
 
-    # 4) BigQuery로 적재 (WRITE_TRUNCATE → full load)
-    job = client.load_table_from_json(
-        json_rows= bq_rows,
-        destination=table_id,
-        job_config=bigquery.LoadJobConfig(write_disposition="WRITE_TRUNCATE"),
+    schema = pa.schema([
+        ("article_id", pa.int64()),
+        ("company_id", pa.int64()),
+        ("title", pa.string()),
+        ("url", pa.string()),
+        ("url_hash", pa.string()),
+        ("content", pa.string()),
+        ("published_at", pa.timestamp("us", tz="UTC")),
+        ("search_keyword", pa.string()),
+        ("score", pa.int64()),
+        ("matched_keywords", pa.string()),
+        ("is_passed_rule", pa.bool_()),
+        ("updated_at", pa.timestamp("us", tz="UTC")),
+        ("ingested_at", pa.timestamp("us", tz="UTC")),
+    ])
+    for r in rows:
+        r["published_at"] = _as_utc(r["published_at"])
+        r["updated_at"] = _as_utc(r["updated_at"])
+        r["ingested_at"] = _as_utc(ingested_at)
+    pq.write_table(pa.Table.from_pylist(rows, schema=schema), path, compression="zstd")
+    return len(rows)
+
+
+async def get_article_id_bounds() -> Optional[Tuple[int, int]]:
+    """news_articles의 (최소 article_id, 최대 article_id). 비어 있으면 None."""
+    async with async_engine.connect() as conn:
+        result = await conn.execute(text("SELECT MIN(article_id), MAX(article_id) FROM news_articles"))
+        lo, hi = result.one()
+    return None if lo is None else (lo, hi)
+
+
+def split_id_ranges(lo: int, hi: int, parts: int) -> List[Tuple[int, int]]:
+    """[lo, hi] 구간을 parts개의 반열린 구간 [start, end)로 나눔."""
+    step = max(1, -(-(hi - lo + 1) // parts)) # 올림 나눗셈
+    return [(start, min(start + step, hi + 1)) for start in range(lo, hi + 1, step)]
+
+
+async def _export_range(
+    id_range: Tuple[int, int],
+    out_dir: str,
+    pool: ProcessPoolExecutor,
+    semaphore: asyncio.Semaphore,
+    ingested_at: datetime,
+) -> List[str]:
+    """article_id 구간 하나를 청크 단위로 읽어 워커 프로세스에서 Parquet 파일로 변환."""
+    loop = asyncio.get_running_loop()
+    lo, hi = id_range
+    paths = []
+    async with semaphore: # 동시에 열리는 DB 커넥션 수 제한
+        async for chunk in iter_article_chunks(
+            "WHERE article_id >= :lo AND article_id < :hi", {"lo": lo, "hi": hi}
+        ):
+            path = os.path.join(out_dir, f"part-{lo}-{len(paths):05d}.parquet")
+            await loop.run_in_executor(pool, write_parquet_part, [dict(r) for r in chunk], path, ingested_at)
+            paths.append(path)
+    return paths
+
+
+def _load_parts_parallel(client: bigquery.Client, paths: List[str], staging_id: str, workers: int) -> None:
+    """Parquet 파일들을 staging 테이블에 병렬 업로드(WRITE_APPEND)."""
+    job_config = bigquery.LoadJobConfig(
+        source_format=bigquery.SourceFormat.PARQUET,
+        write_disposition="WRITE_APPEND",
     )
-    job.result()
-    print(f"[FULL LOAD] loaded {len(bq_rows)} rows into {table_id}")
 
-    # 5) AsyncEngine 정리
-    await async_engine.dispose()
+    def upload(path: str):
+        with open(path, "rb") as f:
+            return client.load_table_from_file(f, destination=staging_id, job_config=job_config)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        jobs = list(executor.map(upload, paths))
+    for job in jobs:
+        job.result()
+
+
+async def _full_load_parallel(client: bigquery.Client, table_id: str, workers: int) -> None:
+    """
+    [병렬] article_id 구간별로 여러 커넥션에서 동시에 읽고, 워커 프로세스에서 Parquet으로 변환.
+    파일들은 staging 테이블에 병렬 적재한 뒤, copy job(WRITE_TRUNCATE)으로 raw 테이블을 한 번에 교체.
+    (적재 도중 실패해도 raw 테이블은 이전 상태 그대로 유지)
+    """
+    bounds = await get_article_id_bounds()
+    if bounds is None:
+        # 단일 커넥션 경로(WRITE_TRUNCATE)와 같게: 빈 staging 테이블을 복사해 raw 테이블을 비움
+        print("[FULL LOAD] news_articles is empty. Truncating the raw table.")
+        id_ranges = []
+    else:
+        # 구간을 워커 수보다 잘게 나눠서 id 분포가 고르지 않아도 부하가 한쪽에 몰리지 않게 함
+        id_ranges = split_id_ranges(bounds[0], bounds[1], workers * 4)
+    ingested_at = datetime.now(timezone.utc)
+    staging_id = f"{table_id}{config.BQ_STAGING_SUFFIX}"
+
+    with tempfile.TemporaryDirectory() as out_dir, ProcessPoolExecutor(max_workers=workers) as pool:
+        # 1) Postgres -> Parquet (구간별 병렬)
+        semaphore = asyncio.Semaphore(workers)
+        with metrics.timer("bq_stage_seconds", mode="full_parallel", stage="export"):
+            results = await asyncio.gather(*[
+                _export_range(id_range, out_dir, pool, semaphore, ingested_at) for id_range in id_ranges
+            ])
+        paths = [path for range_paths in results for path in range_paths]
+        metrics.inc("bq_bytes_uploaded_total", sum(os.path.getsize(p) for p in paths), mode="full_parallel")
+        print(f"[FULL LOAD] exported {len(id_ranges)} id ranges into {len(paths)} parquet files")
+
+        # 2) staging 테이블 재생성 후 병렬 적재
+        client.delete_table(staging_id, not_found_ok=True)
+        client.create_table(bigquery.Table(staging_id, schema=BQ_RAW_SCHEMA))
+        with metrics.timer("bq_stage_seconds", mode="full_parallel", stage="load"):
+            _load_parts_parallel(client, paths, staging_id, workers)
+
+    # 3) staging -> raw 교체 (WRITE_TRUNCATE)
+    copy_config = bigquery.CopyJobConfig(write_disposition="WRITE_TRUNCATE")
+    with metrics.timer("bq_stage_seconds", mode="full_parallel", stage="copy"):
+        client.copy_table(staging_id, table_id, job_config=copy_config).result()
+    row_count = client.get_table(table_id).num_rows
+    metrics.inc("bq_rows_exported_total", row_count, mode="full_parallel")
+    print(f"[FULL LOAD] loaded {row_count} rows into {table_id}")
+
+
+async def run_full_load(workers: int = config.BQ_EXPORT_WORKERS) -> None:
+    client = bigquery.Client(project=config.GCP_PROJECT_ID)
+    table_id = f"{config.GCP_PROJECT_ID}.{config.BIGQUERY_DATASET_ID}.{config.TABLE_NEWS_RAW}"
+    try:
+        if workers > 1:
+            await _full_load_parallel(client, table_id, workers)
+        else:
+            await _full_load_single(client, table_id)
+    finally:
+        # AsyncEngine 정리
+        await async_engine.dispose()
+
+
+def notify_cache_invalidation() -> None:
+    """
+    [선택] 적재가 끝났음을 백엔드에 알려 응답 캐시를 비웁니다. (BACKEND_CACHE_INVALIDATE_URL이 있을 때만)
+    요청을 받은 인스턴스만 바로 비워지고, 나머지 인스턴스는 테이블 수정 시각을 주기적으로 확인해 반영합니다.
+    실패해도 적재 결과에는 영향 없음 (백엔드가 수정 시각 확인으로 어차피 갱신)
+    """
+    if not config.BACKEND_CACHE_INVALIDATE_URL:
+        return
+    request = urllib.request.Request(
+        config.BACKEND_CACHE_INVALIDATE_URL, method="POST",
+        headers={"X-Cache-Token": config.CACHE_INVALIDATE_TOKEN or ""},
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            print(f"[CACHE] backend cache invalidated: {response.read().decode()}")
+    except Exception as e:
+        print(f"[CACHE] backend cache invalidation failed: {e}")
 
 
 if __name__ == "__main__":
-    asyncio.run(run_full_load())
+    parser = argparse.ArgumentParser(description="Cloud SQL -> BigQuery news_articles export")
+    # 기본은 전체 적재: BQ 로더 Job이 플래그 없이 실행되므로, Job 인자에 --incremental을 명시한 경우에만 증분 적재
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--full", dest="incremental", action="store_false",
+        help="전체 테이블을 WRITE_TRUNCATE로 다시 적재합니다. (기본값)"
+    )
+    mode.add_argument(
+        "--incremental", dest="incremental", action="store_true",
+        help="updated_at 워터마크 이후 변경분만 staging에 올려 MERGE합니다."
+    )
+    parser.set_defaults(incremental=False)
+    parser.add_argument(
+        "--workers", type=int, default=config.BQ_EXPORT_WORKERS,
+        help="전체 적재 시 article_id 구간을 나눠 동시에 처리할 워커 수 (1이면 단일 스트림)"
+    )
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(run_incremental_load() if args.incremental else run_full_load(args.workers))
+        if config.TABLE_COMPANY_SUMMARY and config.TABLE_NEWS_COMBINED:
+            from apps.dataflow.company_rollup import run_rollup
+            run_rollup() # 새 기사 기준으로 기업별 요약 서빙 테이블 갱신
+        if config.TABLE_ARTICLE_DETAIL and config.TABLE_NEWS_COMBINED:
+            from apps.dataflow.article_detail import run_article_detail_rollup
+            run_article_detail_rollup() # 새 기사가 상세 화면에서도 바로 보이도록
+        notify_cache_invalidation()
+    finally:
+        metrics.write_report(config.METRICS_REPORT_DIR, "bq_full_load")
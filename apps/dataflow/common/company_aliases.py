@@ -0,0 +1,26 @@
+# apps/dataflow/common/company_aliases.py
+"""
+[기업 별칭] 기사 본문에서 기업을 찾을 때 정식 명칭(name_ko, name_en) 외에 함께 찾을 이름
+- 키 : DB의 'companies' 테이블 이름 (name_ko)
+- 값 : 기사에서 해당 기업을 가리키는 다른 표기
+[일반 단어 기업명] AMBIGUOUS_COMPANY_NAMES 의 이름은 본문 검색 패턴에서 제외합니다. ('대상', '한국' 등)
+  -> 해당 기업은 별칭/영문명/종목코드로만 본문에서 태깅되고, 정확한 이름 조회(lookup)는 그대로 가능
+이 파일이 바뀌면 기업명 인덱스(entity_index) 캐시도 자동으로 다시 만들어집니다.
+"""
+COMPANY_ALIASES = {
+    "삼성전자": ["Samsung Electronics"],
+    "SK하이닉스": ["하이닉스", "SK hynix"],
+    "SK텔레콤": ["SKT"],
+    "LG유플러스": ["LG U+", "엘지유플러스"],
+    "LG에너지솔루션": ["LG엔솔"],
+    "현대자동차": ["현대차", "Hyundai Motor"],
+    "기아": ["Kia"],
+    "POSCO홀딩스": ["포스코홀딩스"],
+    "NAVER": ["네이버"],
+    "카카오": ["Kakao"],
+}
+
+AMBIGUOUS_COMPANY_NAMES = {
+    "대상", "한국", "미래", "국제", "대한", "동양", "고려", "우리", "서울", "신성",
+    "태양", "동방", "대원", "삼일", "한일", "세방", "성문", "경방", "대성", "진도",
+}
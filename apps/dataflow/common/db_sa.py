@@ -64,12 +64,15 @@ async def load_company_map_async() -> Dict[str, int]:
     async with AsyncSessionLocal() as session:
         try:
             # [!!핵심 수정!!] Companies.name_ko와 Companies.id를 선택
+            # DISTINCT ON으로 이름별 1건만 DB에서 골라옴 (혹시 모를 이름 중복 시 id가 높은(최신) 것을 사용)
             stmt = select(
                 Companies.name_ko, 
                 Companies.id
+            ).distinct(
+                Companies.name_ko
             ).order_by( 
                 Companies.name_ko,
-                desc(Companies.id) # 혹시 모를 이름 중복 시 id가 높은(최신) 것을 사용
+                desc(Companies.id)
             )
 
             result = await session.execute(stmt)
@@ -79,12 +82,7 @@ async def load_company_map_async() -> Dict[str, int]:
             logging.info(f"[DB] companies rows: {len(rows)}")
             logging.info(f"[DB] sample companies: {rows[:3]}")
 
-            company_map: Dict[str, int] = {}
-
-            for name_ko, company_id in rows:
-                if name_ko in company_map:
-                    continue
-                company_map[name_ko] = company_id
+            company_map: Dict[str, int] = dict(rows)
 
             logging.info(f"Loaded {len(company_map)} unique company mappings.")
             if not company_map:
@@ -0,0 +1,272 @@
+# apps/dataflow/common/entity_index.py
+"""
+[기업명 인덱스] 기사 본문에 등장하는 모든 기업을 한 번의 순회로 찾기 위한 Aho–Corasick 오토마톤
+- 패턴: name_ko, name_en, stock_code, 별칭(company_aliases.py)
+- 대상: 상장사(stock_code 있음) + 이미 기사가 수집된 기업
+  (DART 전체 약 10만 개 회사명을 넣으면 '대상', '한국' 같은 일반 단어가 오탐으로 잡힘)
+  일반 단어와 같은 상장사 이름(AMBIGUOUS_COMPANY_NAMES)은 본문 패턴에서 빼고 별칭/종목코드로만 태깅
+- 단어 경계 : 영문/숫자는 영문/숫자와, 한글은 한글과 붙어 있으면 매칭하지 않음 ('SKT' 안의 'KT', '위기아' 안의 '기아')
+              단, 한글 이름 뒤의 조사/접미어는 허용 ('기아가', '삼성전자는', '현대차그룹의')
+- 인덱스는 디스크(JSON, 노드 배열)에 캐시하고, companies 내용(지문)이 바뀐 경우에만 다시 만듭니다.
+  (pickle은 로딩 시 코드 실행이 가능하므로 사용하지 않음. 캐시 디렉터리도 현재 사용자 소유만 읽음)
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import text
+
+from apps.dataflow import config
+from apps.dataflow.common.db_sa import AsyncSessionLocal
+from apps.dataflow.common.company_aliases import AMBIGUOUS_COMPANY_NAMES, COMPANY_ALIASES
+
+MIN_PATTERN_LENGTH = 2 # 한 글자 패턴은 오탐이 너무 많아서 제외
+_CACHE_FORMAT = 1      # 캐시 파일 구조가 바뀌면 올림 (다른 형식의 파일은 무시하고 다시 만듦)
+
+# 한글 이름 바로 뒤에 와도 단어 경계로 보는 조사/접미어
+_HANGUL_SUFFIXES = (
+    "은", "는", "이", "가", "을", "를", "의", "에", "와", "과", "도", "로", "으로",
+    "만", "까지", "부터", "보다", "처럼", "측", "그룹",
+)
+_AMBIGUOUS_PATTERNS = frozenset(name.strip().lower() for name in AMBIGUOUS_COMPANY_NAMES)
+
+# 인덱스 대상 기업 (fingerprint와 로딩 쿼리가 같은 집합을 보도록 공통 사용)
+_INDEXED_COMPANIES_SQL = """
+    FROM companies
+    WHERE stock_code IS NOT NULL
+       OR id IN (SELECT DISTINCT company_id FROM news_articles)
+"""
+
+
+def _normalize(value: str) -> str:
+    return value.strip().lower()
+
+
+def _char_class(ch: str) -> Optional[str]:
+    """단어 경계 판단용 글자 종류: 영문/숫자, 한글 음절, 그 외(None)"""
+    if ch.isascii() and ch.isalnum():
+        return "ascii"
+    if "가" <= ch <= "힣":
+        return "hangul"
+    return None
+
+
+def _boundary_classes(pattern: str) -> Tuple[Optional[str], Optional[str]]:
+    """패턴 첫 글자/마지막 글자의 종류 (같은 종류의 글자와 붙어 있으면 단어의 일부로 봄)"""
+    return _char_class(pattern[0]), _char_class(pattern[-1])
+
+
+def _at_word_boundary(haystack: str, start: int, end: int, classes: Tuple[Optional[str], Optional[str]]) -> bool:
+    first, last = classes
+    if start > 0 and first is not None and _char_class(haystack[start - 1]) == first:
+        return False # 'SKT' 안의 'KT', '위기아' 안의 '기아'
+    if end < len(haystack) and last is not None and _char_class(haystack[end]) == last:
+        return last == "hangul" and haystack.startswith(_HANGUL_SUFFIXES, end) # '기아가'는 허용
+    return True
+
+
+class CompanyIndex:
+    """
+    Aho–Corasick 오토마톤 + 정확한 이름 조회용 딕셔너리.
+    노드는 리스트 인덱스로 표현 (배열 그대로 JSON 캐시에 저장/복원)
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, int]], fingerprint: str = ""):
+        self.fingerprint = fingerprint
+
+        # 1. 정규화된 패턴 -> company_id 집합
+        pattern_ids: Dict[str, Set[int]] = {}
+        for name, company_id in entries:
+            if not name:
+                continue
+            pattern = _normalize(name)
+            if len(pattern) < MIN_PATTERN_LENGTH:
+                continue
+            pattern_ids.setdefault(pattern, set()).add(company_id)
+
+        self._exact: Dict[str, FrozenSet[int]] = {p: frozenset(ids) for p, ids in pattern_ids.items()}
+        self._set_patterns([p for p in pattern_ids if p not in _AMBIGUOUS_PATTERNS]) # 일반 단어는 lookup 전용
+
+        # 2. 트라이(goto) 구성
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        for pattern_no, (pattern, _, _) in enumerate(self._patterns):
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({}); self._fail.append(0); self._out.append(())
+                node = nxt
+            self._out[node] = self._out[node] + (pattern_no,)
+
+        # 3. BFS로 실패 링크(fail) 계산, 출력(out)은 실패 링크를 따라 합침
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def _set_patterns(self, patterns: List[str]) -> None:
+        self._patterns: List[Tuple[str, FrozenSet[int], Tuple[Optional[str], Optional[str]]]] = [
+            (p, self._exact[p], _boundary_classes(p)) for p in patterns
+        ]
+
+    def to_json(self) -> dict:
+        return {
+            "format": _CACHE_FORMAT,
+            "fingerprint": self.fingerprint,
+            "exact": {p: sorted(ids) for p, ids in self._exact.items()},
+            "patterns": [p for p, _, _ in self._patterns],
+            "goto": self._goto,
+            "fail": self._fail,
+            "out": self._out,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "CompanyIndex":
+        """to_json 결과로 복원 (오토마톤을 다시 만들지 않음). 형식이 다르면 ValueError"""
+        if data.get("format") != _CACHE_FORMAT:
+            raise ValueError(f"unsupported cache format {data.get('format')!r}")
+        index = cls.__new__(cls)
+        index.fingerprint = str(data["fingerprint"])
+        index._exact = {str(p): frozenset(int(i) for i in ids) for p, ids in data["exact"].items()}
+        index._set_patterns([str(p) for p in data["patterns"]])
+        index._goto = [{str(ch): int(n) for ch, n in node.items()} for node in data["goto"]]
+        index._fail = [int(n) for n in data["fail"]]
+        index._out = [tuple(int(n) for n in out) for out in data["out"]]
+        if not (len(index._goto) == len(index._fail) == len(index._out)):
+            raise ValueError("node arrays have different lengths")
+        return index
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def lookup(self, name: str) -> FrozenSet[int]:
+        """정확한 이름(대소문자 무시)으로 company_id 집합을 조회"""
+        return self._exact.get(_normalize(name), frozenset())
+
+    def find_company_ids(self, text_: str) -> Set[int]:
+        """
+        텍스트에 등장하는 모든 기업의 company_id를 한 번의 순회로 찾습니다.
+        겹치는 매칭은 더 긴 쪽만 인정합니다. ('SK하이닉스' 안의 'SK'는 따로 세지 않음)
+        """
+        if not text_:
+            return set()
+        haystack = text_.lower()
+
+        # 1. 오토마톤 순회 -> (시작, 끝, 패턴번호)
+        matches = []
+        node = 0
+        for i, ch in enumerate(haystack):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for pattern_no in self._out[node]:
+                pattern, _, classes = self._patterns[pattern_no]
+                start, end = i - len(pattern) + 1, i + 1
+                if not _at_word_boundary(haystack, start, end, classes):
+                    continue
+                matches.append((start, end, pattern_no))
+
+        # 2. 더 긴 매칭 안에 포함된 짧은 매칭 제거
+        matches.sort(key=lambda m: m[0] - m[1]) # 긴 것부터
+        kept: List[Tuple[int, int]] = []
+        company_ids: Set[int] = set()
+        for start, end, pattern_no in matches:
+            if any(s <= start and end <= e and (s, e) != (start, end) for s, e in kept):
+                continue
+            kept.append((start, end))
+            company_ids.update(self._patterns[pattern_no][1])
+        return company_ids
+
+
+# --- DB 로딩 + 디스크 캐시 ---
+
+async def _fetch_fingerprint() -> str:
+    """인덱스 대상 기업 목록 + 별칭의 지문(MD5). 값이 같으면 캐시를 그대로 사용"""
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(text(f"""
+            SELECT md5(string_agg(
+                id::text || '|' || name_ko || '|' || coalesce(name_en, '') || '|' || coalesce(stock_code, ''),
+                ',' ORDER BY id
+            ))
+            {_INDEXED_COMPANIES_SQL}
+        """))
+        db_fingerprint = result.scalar_one() or ""
+    aliases_fingerprint = hashlib.md5(
+        repr((sorted(COMPANY_ALIASES.items()), sorted(AMBIGUOUS_COMPANY_NAMES))).encode()
+    ).hexdigest()
+    return f"{db_fingerprint}:{aliases_fingerprint}"
+
+
+async def _fetch_entries() -> List[Tuple[str, int]]:
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(text(f"SELECT id, name_ko, name_en, stock_code {_INDEXED_COMPANIES_SQL}"))
+        rows = result.all()
+
+    entries: List[Tuple[str, int]] = []
+    for company_id, name_ko, name_en, stock_code in rows:
+        entries.append((name_ko, company_id))
+        if name_en: entries.append((name_en, company_id))
+        if stock_code: entries.append((stock_code, company_id))
+        for alias in COMPANY_ALIASES.get(name_ko, []):
+            entries.append((alias, company_id))
+    return entries
+
+
+def _read_cache(path: str) -> Optional[CompanyIndex]:
+    try:
+        if hasattr(os, "getuid") and os.stat(path).st_uid != os.getuid():
+            logging.warning(f"Company index cache {path} is not owned by the current user. Ignoring it.")
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return CompanyIndex.from_json(json.load(f))
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+        logging.info(f"Company index cache not usable ({e}). Rebuilding.")
+        return None
+
+
+def _write_cache(index: CompanyIndex, path: str) -> None:
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".company_index.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(index.to_json(), f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path) # 원자적 교체 (동시에 읽는 프로세스가 깨진 파일을 보지 않도록)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+async def load_company_index_async(cache_path: str = config.ENTITY_INDEX_CACHE_PATH) -> CompanyIndex:
+    """
+    [비동기] 기업명 인덱스를 반환합니다.
+    디스크 캐시의 지문이 현재 companies와 같으면 캐시를 쓰고, 다르면 다시 만들어 저장합니다.
+    """
+    fingerprint = await _fetch_fingerprint()
+
+    cached = _read_cache(cache_path) if os.path.exists(cache_path) else None
+    if cached is not None and cached.fingerprint == fingerprint:
+        logging.info(f"Loaded company index from cache ({len(cached)} patterns).")
+        return cached
+
+    index = CompanyIndex(await _fetch_entries(), fingerprint)
+    try:
+        _write_cache(index, cache_path)
+    except OSError as e:
+        logging.warning(f"Failed to write company index cache: {e}")
+    logging.info(f"Built company index ({len(index)} patterns).")
+    return index
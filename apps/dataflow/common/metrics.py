@@ -0,0 +1,213 @@
+# apps/dataflow/common/metrics.py
+"""
+[계측] 파이프라인 실행 1회의 카운터 / 게이지 / 히스토그램을 모아서
+JSON 실행 리포트와 Prometheus 텍스트 형식(node_exporter textfile collector용)으로 내보냅니다.
+
+- 외부 의존성 없이 프로세스 메모리에만 기록 (스레드 안전, Selenium/클러스터링 스레드에서도 사용)
+- 라벨은 host, stage처럼 값의 종류가 적은 것만 사용 (URL 등은 넣지 않음)
+
+사용 예
+    from apps.dataflow.common import metrics
+    metrics.inc("fetch_failures_total", kind="transient")
+    metrics.observe("fetch_seconds", 0.42, host="www.yna.co.kr", method="fast")
+    with metrics.timer("stage_seconds", stage="cluster"):
+        ...
+    metrics.write_report("/tmp/insightbee_metrics", "news_pipeline")
+"""
+import json
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+METRIC_PREFIX = "insightbee_"
+
+# 기본 버킷: 지연 시간(초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Histogram:
+    """누적 버킷 히스토그램 (Prometheus와 같은 le 버킷). 분위수는 버킷 안에서 선형 보간으로 추정"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.bucket_counts = [0] * (len(self.buckets) + 1) # 마지막 칸은 +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def observe(self, value: float) -> None:
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        self.bucket_counts[index] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.bucket_counts):
+            if n and seen + n >= rank:
+                lower = self.buckets[i - 1] if i > 0 else min(self.min, self.buckets[0])
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                estimate = lower + (upper - lower) * ((rank - seen) / n)
+                return min(max(estimate, self.min), self.max)
+            seen += n
+        return self.max
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, LabelKey], float] = {}
+        self._gauges: Dict[Tuple[str, LabelKey], List[float]] = {} # [현재값, 최대값]
+        self._histograms: Dict[Tuple[str, LabelKey], Histogram] = {}
+        self.started_at = datetime.now(timezone.utc)
+
+    # --- 기록 ---
+    def inc(self, name: str, amount: float = 1.0, **labels) -> None:
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + amount
+
+    def set_gauge(self, name: str, value: float, **labels) -> None:
+        key = (name, _label_key(labels))
+        with self._lock:
+            gauge = self._gauges.setdefault(key, [0.0, value])
+            gauge[0] = value
+            gauge[1] = max(gauge[1], value)
+
+    def add_gauge(self, name: str, amount: float, **labels) -> None:
+        """게이지 증감 (대기열 깊이 등). 리포트에는 현재값과 최대값이 함께 남음"""
+        key = (name, _label_key(labels))
+        with self._lock:
+            gauge = self._gauges.setdefault(key, [0.0, 0.0])
+            gauge[0] += amount
+            gauge[1] = max(gauge[1], gauge[0])
+
+    def observe(self, name: str, value: float, buckets: Tuple[float, ...] = LATENCY_BUCKETS, **labels) -> None:
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels) -> Iterator[None]:
+        """with 블록의 경과 시간(초)을 히스토그램에 기록 (예외가 나도 기록)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear(); self._gauges.clear(); self._histograms.clear()
+            self.started_at = datetime.now(timezone.utc)
+
+    # --- 내보내기 ---
+    def to_dict(self, run_name: str = "") -> Dict:
+        with self._lock:
+            finished_at = datetime.now(timezone.utc)
+            return {
+                "run": run_name,
+                "started_at": self.started_at.isoformat(),
+                "finished_at": finished_at.isoformat(),
+                "duration_seconds": round((finished_at - self.started_at).total_seconds(), 3),
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self._counters.items())
+                ],
+                "gauges": [
+                    {"name": name, "labels": dict(labels), "value": value, "max": peak}
+                    for (name, labels), (value, peak) in sorted(self._gauges.items())
+                ],
+                "histograms": [
+                    {
+                        "name": name, "labels": dict(labels),
+                        "count": h.count, "sum": round(h.sum, 6),
+                        "min": h.min if h.count else None, "max": h.max if h.count else None,
+                        "p50": h.quantile(0.5), "p95": h.quantile(0.95), "p99": h.quantile(0.99),
+                    }
+                    for (name, labels), h in sorted(self._histograms.items())
+                ],
+            }
+
+    def to_prometheus(self) -> str:
+        def fmt_labels(labels: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ""
+            escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+            return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+        lines: List[str] = []
+        typed = set()
+
+        def type_line(name: str, kind: str) -> None:
+            if name not in typed:
+                lines.append(f"# TYPE {METRIC_PREFIX}{name} {kind}")
+                typed.add(name)
+
+        with self._lock:
+            for (name, labels), value in sorted(self._counters.items()):
+                type_line(name, "counter")
+                lines.append(f"{METRIC_PREFIX}{name}{fmt_labels(labels)} {value}")
+            for (name, labels), (value, _) in sorted(self._gauges.items()):
+                type_line(name, "gauge")
+                lines.append(f"{METRIC_PREFIX}{name}{fmt_labels(labels)} {value}")
+            for (name, labels), h in sorted(self._histograms.items()):
+                type_line(name, "histogram")
+                cumulative = 0
+                for bound, n in zip(list(h.buckets) + ["+Inf"], h.bucket_counts):
+                    cumulative += n
+                    lines.append(f"{METRIC_PREFIX}{name}_bucket{fmt_labels(labels, (('le', str(bound)),))} {cumulative}")
+                lines.append(f"{METRIC_PREFIX}{name}_sum{fmt_labels(labels)} {h.sum}")
+                lines.append(f"{METRIC_PREFIX}{name}_count{fmt_labels(labels)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_report(self, directory: str, run_name: str) -> Tuple[str, str]:
+        """<directory>/<run_name>.json 과 <run_name>.prom 을 원자적으로 기록하고 경로를 반환합니다."""
+        os.makedirs(directory, exist_ok=True)
+        json_path = os.path.join(directory, f"{run_name}.json")
+        prom_path = os.path.join(directory, f"{run_name}.prom")
+        for path, body in (
+            (json_path, json.dumps(self.to_dict(run_name), ensure_ascii=False, indent=2)),
+            (prom_path, self.to_prometheus()),
+        ):
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+        logging.info(f"Wrote run report to {json_path} (Prometheus: {prom_path})")
+        return json_path, prom_path
+
+
+# 프로세스 전체 공유 레지스트리 + 모듈 수준 단축 함수
+REGISTRY = MetricsRegistry()
+inc = REGISTRY.inc
+set_gauge = REGISTRY.set_gauge
+add_gauge = REGISTRY.add_gauge
+observe = REGISTRY.observe
+timer = REGISTRY.timer
+write_report = REGISTRY.write_report
@@ -2,7 +2,8 @@
 from datetime import datetime
 from sqlalchemy import (
     Column, Integer, String, Text, DateTime, Date,
-    Boolean, BigInteger, ForeignKey # DB 컬럼 타입을 정의하는 도구들
+    Boolean, BigInteger, ForeignKey, Float, # DB 컬럼 타입을 정의하는 도구들
+    UniqueConstraint
 )
 from sqlalchemy.orm import relationship # 테이블 간의 관계(Join)를 정의하는 도구
 from sqlalchemy.ext.declarative import declarative_base # ORM 모델의 기반이 되는 클래스
@@ -106,6 +107,9 @@ class NewsArticle(Base):
     
     # [추가] 대표 기사 여부 (True면 보여주고, False면 중복이라 숨김)
     is_representative = Column(Boolean, default=True)
+
+    # [추가] 본문에 언급된 기업 목록 (entity_index로 태깅, article_companies 테이블)
+    mentions = relationship("ArticleCompanyMention", cascade="all, delete-orphan")
     
     
     def __repr__(self):
@@ -116,3 +120,121 @@ class NewsArticle(Base):
         """
         status = "PASSED" if self.is_passed_rule else "FAILED"
         return f"<News(id={self.article_id}, status={status}, score={self.score}, title='{self.title[:20]}...')>"
+
+
+# --- [테이블 3: 파이프라인 실행 상태 (체크포인트)] ---
+class PipelineRun(Base):
+    """
+    [파이프라인 실행 테이블 (pipeline_runs)]
+    main_pipeline 1회 실행이 어느 단계까지 진행되었는지 기록합니다.
+    컨테이너가 중단(pre-empt)되더라도 '--resume' 옵션으로 멈춘 단계부터 이어서 실행합니다.
+    """
+    __tablename__ = 'pipeline_runs'
+
+    # run_id (PK, 정수, 자동 증가)
+    run_id = Column(Integer, primary_key=True, autoincrement=True)
+    # shard (문자열, 필수) - 이 실행이 담당한 샤드 ('i/N'). 재개 시 같은 샤드의 실행만 이어받음
+    shard = Column(String(20), nullable=False, default='0/1', index=True)
+    # stage (문자열, 필수) - 현재 단계: scrape_fast -> scrape_robust -> cluster -> done (중단된 실행은 abandoned)
+    stage = Column(String(30), nullable=False, index=True)
+    # links_total (정수) - 링크 수집 단계에서 저장된 링크 개수
+    links_total = Column(Integer, nullable=False, default=0)
+    # created_at / updated_at (날짜/시간)
+    created_at = Column(DateTime, default=datetime.now)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+    def __repr__(self):
+        return f"<PipelineRun(id={self.run_id}, shard={self.shard}, stage={self.stage}, links={self.links_total})>"
+
+
+class PipelineRunLink(Base):
+    """
+    [실행별 링크 테이블 (pipeline_run_links)]
+    링크 수집 결과(link_info)와 링크별 처리 상태를 저장합니다.
+    - pending: 아직 고속 스크래핑 전
+    - robust : 고속 스크래핑 실패 -> Selenium 대기
+    - done   : DB 저장까지 완료
+    """
+    __tablename__ = 'pipeline_run_links'
+    __table_args__ = (UniqueConstraint('run_id', 'url_hash'),)
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    run_id = Column(Integer, ForeignKey('pipeline_runs.run_id'), nullable=False, index=True)
+    url_hash = Column(String(32), nullable=False)
+    # link_info (텍스트, 필수) - scraper.collect_all_links가 만든 링크 딕셔너리(JSON)
+    link_info = Column(Text, nullable=False)
+    status = Column(String(20), nullable=False, default='pending', index=True)
+
+
+class LinkClaim(Base):
+    """
+    [링크 점유 테이블 (link_claims)]
+    여러 샤드가 같은 기사 URL을 수집했을 때, 먼저 점유(claim)한 실행만 스크래핑하도록 합니다.
+    점유는 config.LINK_CLAIM_TTL_HOURS 동안 유효하며, 만료된 점유는 다른 실행이 가져갈 수 있습니다.
+    """
+    __tablename__ = 'link_claims'
+
+    url_hash = Column(String(32), primary_key=True)
+    run_id = Column(Integer, ForeignKey('pipeline_runs.run_id'), nullable=False)
+    claimed_at = Column(DateTime, nullable=False, default=datetime.now)
+
+
+class ArticleCompanyMention(Base):
+    """
+    [기사-기업 언급 테이블 (article_companies)]
+    기사 제목/본문에 등장한 기업을 기록합니다. (검색 키워드로 연결된 company_id와 별개)
+    하나의 기사가 여러 기업과 연결될 수 있습니다.
+    """
+    __tablename__ = 'article_companies'
+
+    article_id = Column(BigInteger, ForeignKey('news_articles.article_id', ondelete='CASCADE'), primary_key=True)
+    company_id = Column(Integer, ForeignKey('companies.id'), primary_key=True, index=True)
+
+
+# --- [테이블 4: 기업별 수집 통계 (크롤 스케줄러)] ---
+class CompanyCrawlStats(Base):
+    """
+    [기업별 수집 통계 테이블 (company_crawl_stats)]
+    crawl_scheduler가 기업마다 '얼마나 자주, 얼마나 깊게' 수집할지 정하는 데 사용합니다.
+    값은 수집할 때마다 지수이동평균(EMA)으로 갱신됩니다.
+    """
+    __tablename__ = 'company_crawl_stats'
+
+    company_id = Column(Integer, ForeignKey('companies.id'), primary_key=True)
+    # arrival_rate (실수) - 하루에 새로 올라오는 (허용 언론사) 기사 수 추정치
+    arrival_rate = Column(Float, nullable=False, default=0.0)
+    # link_yield (실수) - 요청한 기사 수 대비 실제 신규 링크 비율 (0~1)
+    link_yield = Column(Float, nullable=False, default=1.0)
+    # query_count (정수) - 최근 백엔드 조회 수 (수요). BigQuery 조회 실패 시 마지막 값을 사용
+    query_count = Column(Integer, nullable=False, default=0)
+    # last_crawled_at (날짜/시간) - 마지막 수집 시각 (다음 수집 여부는 실행마다 최신 수요로 다시 계산)
+    last_crawled_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return (f"<CompanyCrawlStats(company_id={self.company_id}, rate={self.arrival_rate:.2f}/day, "
+                f"yield={self.link_yield:.2f}, queries={self.query_count})>")
+
+
+# --- [테이블 5: 호스트별 스크래핑 통계 (라우팅)] ---
+class HostFetchStats(Base):
+    """
+    [호스트별 스크래핑 통계 테이블 (host_fetch_stats)]
+    host_router가 기사 URL을 aiohttp(fast)로 먼저 보낼지, 바로 Selenium(robust)으로 보낼지 정하는 데 사용합니다.
+    (host, method)마다 시도/성공 횟수와 지연 시간·본문 길이 합계를 누적하며,
+    시도 횟수가 config.HOST_ROUTER_WINDOW를 넘으면 비율을 유지한 채 줄여서 최근 결과 위주로 유지합니다.
+    """
+    __tablename__ = 'host_fetch_stats'
+
+    host = Column(String(255), primary_key=True)
+    # method (문자열) - 'fast' (aiohttp) / 'robust' (Selenium)
+    method = Column(String(10), primary_key=True)
+    attempts = Column(Float, nullable=False, default=0.0)
+    successes = Column(Float, nullable=False, default=0.0)
+    # latency_sum (실수, 초) - 모든 시도의 소요 시간 합계
+    latency_sum = Column(Float, nullable=False, default=0.0)
+    # text_length_sum (실수) - 성공한 시도의 본문 길이 합계
+    text_length_sum = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+    def __repr__(self):
+        return f"<HostFetchStats(host={self.host}, method={self.method}, {self.successes:.0f}/{self.attempts:.0f})>"
@@ -0,0 +1,218 @@
+"""
+[기업별 요약 서빙 테이블] TABLE_COMPANY_SUMMARY를 기업당 1행으로 다시 만듭니다.
+bq_full_load 적재 후(자동) 또는 주간 리포트 작업 후(`python -m apps.dataflow.company_rollup`) 실행합니다.
+
+백엔드 /report/summary는 이 테이블을 company_name으로 한 번 읽기만 하면 됩니다.
+(/analytics/points, /analytics/keywords는 새 주간 리포트를 바로 반영하도록 리포트 테이블에서 직접 읽음.
+ 리포트 컬럼은 다른 조회/분석용으로 함께 저장)
+- 기사 집계 (TABLE_NEWS_COMBINED) : 3개월 기사 수, 최근 2000건 기준 긍/부정 수와 대표 문장 3개, 토픽별 기사 수
+- 주간 리포트 (TABLE_WEEKLY_REPORT) : 가장 최근 리포트의 긍정/리스크 요인, 키워드
+  -> 문자열/리스트/튜플 문자열 등 제각각인 형식을 여기서 한 번만 ARRAY<STRING>으로 정규화
+"""
+import argparse
+import ast
+import json
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from google.cloud import bigquery
+
+from apps.dataflow.common import metrics
+from apps.dataflow import config
+
+RECENT_ARTICLE_LIMIT = 2000 # 긍/부정 비율/대표 문장 계산 대상 (백엔드 기존 기준과 동일)
+TOP_POINTS = 3
+TOP_TOPICS = 50
+
+# 백엔드 reports.py의 감정 분류 조건과 같아야 함
+_POSITIVE_SQL = "(LOWER(sentiment) LIKE '%positive%' OR sentiment LIKE '%긍정%')"
+_NEGATIVE_SQL = "(LOWER(sentiment) LIKE '%negative%' OR sentiment LIKE '%부정%')"
+
+SUMMARY_SCHEMA = [
+    bigquery.SchemaField("company_name", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("total_count_3m", "INT64"),
+    bigquery.SchemaField("fetched_count", "INT64"),
+    bigquery.SchemaField("positive_count", "INT64"),
+    bigquery.SchemaField("negative_count", "INT64"),
+    bigquery.SchemaField("article_positive_points", "STRING", mode="REPEATED"),
+    bigquery.SchemaField("article_risk_points", "STRING", mode="REPEATED"),
+    bigquery.SchemaField(
+        "topics", "RECORD", mode="REPEATED",
+        fields=[bigquery.SchemaField("topic", "STRING"), bigquery.SchemaField("article_count", "INT64")],
+    ),
+    bigquery.SchemaField("report_end_date", "DATE"),
+    bigquery.SchemaField("positive_points", "STRING", mode="REPEATED"),
+    bigquery.SchemaField("risk_factors", "STRING", mode="REPEATED"),
+    bigquery.SchemaField("keywords", "STRING", mode="REPEATED"),
+    bigquery.SchemaField("updated_at", "TIMESTAMP"),
+]
+
+
+def _table_id(name: str) -> str:
+    return f"{config.GCP_PROJECT_ID}.{config.BIGQUERY_DATASET_ID}.{name}"
+
+
+def article_rollup_sql(table_id: str) -> str:
+    """기업별 기사 집계 (빅쿼리 안에서 계산, 기업당 1행만 전송)"""
+    return f"""
+        WITH ranked AS (
+            SELECT
+                search_keyword AS company_name,
+                published_at,
+                COALESCE(NULLIF(topic, ''), '기타') AS topic,
+                {_POSITIVE_SQL} AS is_positive,
+                {_NEGATIVE_SQL} AS is_negative,
+                COALESCE(NULLIF(one_sentence_summary, ''), title) AS point,
+                ROW_NUMBER() OVER (PARTITION BY search_keyword ORDER BY published_at DESC) AS rn
+            FROM `{table_id}`
+            WHERE search_keyword IS NOT NULL
+        ),
+        topic_counts AS (
+            SELECT company_name, ARRAY_AGG(STRUCT(topic, article_count) ORDER BY article_count DESC LIMIT {TOP_TOPICS}) AS topics
+            FROM (SELECT company_name, topic, COUNT(*) AS article_count FROM ranked GROUP BY company_name, topic)
+            GROUP BY company_name
+        )
+        SELECT
+            r.company_name,
+            COUNTIF(r.published_at >= TIMESTAMP_SUB(TIMESTAMP(CURRENT_DATE()), INTERVAL 90 DAY)) AS total_count_3m,
+            COUNTIF(r.rn <= {RECENT_ARTICLE_LIMIT}) AS fetched_count,
+            COUNTIF(r.rn <= {RECENT_ARTICLE_LIMIT} AND r.is_positive) AS positive_count,
+            COUNTIF(r.rn <= {RECENT_ARTICLE_LIMIT} AND NOT r.is_positive AND r.is_negative) AS negative_count,
+            ARRAY_AGG(IF(r.rn <= {RECENT_ARTICLE_LIMIT} AND r.is_positive, r.point, NULL) IGNORE NULLS
+                      ORDER BY r.published_at DESC LIMIT {TOP_POINTS}) AS article_positive_points,
+            ARRAY_AGG(IF(r.rn <= {RECENT_ARTICLE_LIMIT} AND r.is_negative, r.point, NULL) IGNORE NULLS
+                      ORDER BY r.published_at DESC LIMIT {TOP_POINTS}) AS article_risk_points,
+            ANY_VALUE(t.topics) AS topics
+        FROM ranked r
+        LEFT JOIN topic_counts t USING (company_name)
+        GROUP BY r.company_name
+    """
+
+
+def latest_report_sql(table_id: str) -> str:
+    """기업별 가장 최근 주간 리포트 1건"""
+    return f"""
+        SELECT company_name, report_end_date, positive_points, risk_factors, keywords
+        FROM `{table_id}`
+        WHERE company_name IS NOT NULL
+        QUALIFY ROW_NUMBER() OVER (PARTITION BY company_name ORDER BY report_end_date DESC) = 1
+    """
+
+
+def normalize_points(value: Any) -> List[str]:
+    """리포트 요인(리스트 또는 줄바꿈 문자열, 마크다운 '- '/'* ' 접두어 포함)을 문장 리스트로"""
+    if not value:
+        return []
+    items = value if isinstance(value, list) else str(value).split('\n')
+    points = []
+    for item in items:
+        text = str(item).strip()
+        if text.startswith('- ') or text.startswith('* '):
+            text = text[2:].strip()
+        if text:
+            points.append(text)
+    return points
+
+
+def normalize_keywords(value: Any) -> List[str]:
+    """
+    키워드(ARRAY, STRUCT 배열, "['a', 'b']", "[('a', 10), ...]", "a, b" 등)를 키워드 문자열 리스트로.
+    (백엔드 deps.parse_keywords와 같은 규칙. 백엔드 키워드 API는 리포트 테이블을 직접 정규화하므로 함께 수정할 것)
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        try:
+            value = ast.literal_eval(value)
+        except (ValueError, SyntaxError, TypeError):
+            raw = value.replace('[', '').replace(']', '').replace("'", "").replace('"', "")
+            value = raw.split(',')
+    if not isinstance(value, (list, tuple)):
+        value = [value]
+
+    keywords = []
+    for item in value:
+        if isinstance(item, dict):
+            item = item.get('keyword')
+        elif isinstance(item, (list, tuple)):
+            item = item[0] if item else None # ('키워드', 10)
+        text = str(item).strip() if item is not None else ""
+        if text:
+            keywords.append(text)
+    return keywords
+
+
+def build_summary_rows(article_rows: List[Dict], report_rows: List[Dict], now: datetime) -> List[Dict]:
+    """[순수 함수] 기사 집계와 최근 리포트를 기업명으로 합쳐 서빙 테이블 행(JSON 적재용)을 만듭니다."""
+    merged: Dict[str, Dict] = {}
+    for r in article_rows:
+        merged[r["company_name"]] = {
+            "company_name": r["company_name"],
+            "total_count_3m": r["total_count_3m"] or 0,
+            "fetched_count": r["fetched_count"] or 0,
+            "positive_count": r["positive_count"] or 0,
+            "negative_count": r["negative_count"] or 0,
+            "article_positive_points": list(r["article_positive_points"] or []),
+            "article_risk_points": list(r["article_risk_points"] or []),
+            "topics": [dict(t) for t in (r["topics"] or [])],
+        }
+    for r in report_rows:
+        row = merged.setdefault(r["company_name"], {"company_name": r["company_name"]}) # 기사 없이 리포트만 있는 기업
+        report_end_date: Optional[date] = r["report_end_date"]
+        row.update({
+            "report_end_date": report_end_date.isoformat()[:10] if report_end_date else None, # DATE/TIMESTAMP 모두 날짜만
+            "positive_points": normalize_points(r["positive_points"]),
+            "risk_factors": normalize_points(r["risk_factors"]),
+            "keywords": normalize_keywords(r["keywords"]),
+        })
+    for row in merged.values():
+        row["updated_at"] = now.isoformat()
+    return list(merged.values())
+
+
+def compute_summary_rows(client: bigquery.Client) -> List[Dict]:
+    """빅쿼리에서 기사 집계/최근 리포트를 읽어 서빙 테이블 행을 만듭니다. (적재는 하지 않음)"""
+    with metrics.timer("bq_stage_seconds", mode="rollup", stage="aggregate"):
+        sql = article_rollup_sql(_table_id(config.TABLE_NEWS_COMBINED))
+        article_rows = [dict(r.items()) for r in client.query(sql).result()]
+        report_rows = []
+        if config.TABLE_WEEKLY_REPORT:
+            sql = latest_report_sql(_table_id(config.TABLE_WEEKLY_REPORT))
+            report_rows = [dict(r.items()) for r in client.query(sql).result()]
+    return build_summary_rows(article_rows, report_rows, datetime.now(timezone.utc))
+
+
+def run_rollup(client: Optional[bigquery.Client] = None) -> int:
+    """서빙 테이블을 통째로 다시 만들고(WRITE_TRUNCATE) 기업 수를 반환합니다."""
+    if not config.TABLE_COMPANY_SUMMARY:
+        print("[ROLLUP] TABLE_COMPANY_SUMMARY is not set. Skipping.")
+        return 0
+    client = client or bigquery.Client(project=config.GCP_PROJECT_ID)
+
+    rows = compute_summary_rows(client)
+    job_config = bigquery.LoadJobConfig(
+        schema=SUMMARY_SCHEMA,
+        source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
+        write_disposition="WRITE_TRUNCATE",
+        clustering_fields=["company_name"], # company_name 단건 조회 시 읽는 블록 최소화
+    )
+    with metrics.timer("bq_stage_seconds", mode="rollup", stage="load"):
+        client.load_table_from_json(rows, _table_id(config.TABLE_COMPANY_SUMMARY), job_config=job_config).result()
+    metrics.inc("bq_rows_exported_total", len(rows), mode="rollup")
+    print(f"[ROLLUP] wrote {len(rows)} company rows into {config.TABLE_COMPANY_SUMMARY}")
+    return len(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the per-company summary serving table in BigQuery")
+    parser.add_argument("--dry-run", action="store_true", help="적재하지 않고 첫 3행만 출력")
+    args = parser.parse_args()
+
+    try:
+        if args.dry_run:
+            for row in compute_summary_rows(bigquery.Client(project=config.GCP_PROJECT_ID))[:3]:
+                print(json.dumps(row, ensure_ascii=False, default=str))
+        else:
+            run_rollup()
+    finally:
+        metrics.write_report(config.METRICS_REPORT_DIR, "company_rollup")
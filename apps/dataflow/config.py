@@ -1,6 +1,7 @@
 # config.py
 # 비밀 키, DB 정보, API 키, 고정 설정값 등
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -9,6 +10,8 @@ load_dotenv()
 # --- Naver API 인증 키 ---
 NAVER_CLIENT_ID = os.getenv("NAVER_CLIENT_ID")
 NAVER_CLIENT_SECRET = os.getenv("NAVER_CLIENT_SECRET")
+# 부하 테스트 시 로컬 mock 서버(benchmarks/mock_server.py)로 바꿔서 사용 (e.g. http://127.0.0.1:8089)
+NAVER_API_BASE_URL = os.getenv("NAVER_API_BASE_URL", "https://openapi.naver.com")
 
 # --- Cloud SQL 접속 정보 ---
 DB_USER = os.getenv("DB_USER")
@@ -20,6 +23,19 @@ DB_NAME = os.getenv("DB_NAME")
 GCP_PROJECT_ID = os.getenv("GCP_PROJECT_ID")
 BIGQUERY_DATASET_ID = os.getenv("BIGQUERY_DATASET_ID")
 TABLE_NEWS_RAW = os.getenv("TABLE_NEWS_RAW")
+TABLE_NEWS_COMBINED = os.getenv("TABLE_NEWS_COMBINED") # 백엔드가 조회하는 기사 통합 뷰
+TABLE_WEEKLY_REPORT = os.getenv("TABLE_WEEKLY_REPORT") # 주간 리포트 테이블
+TABLE_COMPANY_SUMMARY = os.getenv("TABLE_COMPANY_SUMMARY") # (선택) 기업별 요약 서빙 테이블 (company_rollup.py가 생성)
+TABLE_ARTICLE_DETAIL = os.getenv("TABLE_ARTICLE_DETAIL") # (선택) 기사 상세 서빙 테이블 (article_detail.py가 생성)
+TABLE_COMPANY_DEMAND = os.getenv("TABLE_COMPANY_DEMAND") # (선택) 백엔드 기업 조회 수 테이블 (company_name, request_count, event_date)
+
+# --- BigQuery 적재 정책 ---
+BQ_EXPORT_CHUNK_SIZE = 5000 # 서버 사이드 커서로 한 번에 읽어올 행 수 (메모리 사용량 상한)
+BQ_STAGING_SUFFIX = "_staging" # 증분/병렬 적재 시 먼저 올리는 staging 테이블 접미사
+BQ_EXPORT_WORKERS = min(os.cpu_count() or 1, 8) # 전체 적재 시 동시에 읽고 변환할 워커 수 (DB 커넥션 풀 크기 이내)
+# (선택) 적재 완료 후 백엔드 응답 캐시 무효화 (e.g. https://<backend>/api/cache/invalidate, 토큰은 백엔드와 같은 값)
+BACKEND_CACHE_INVALIDATE_URL = os.getenv("BACKEND_CACHE_INVALIDATE_URL")
+CACHE_INVALIDATE_TOKEN = os.getenv("CACHE_INVALIDATE_TOKEN")
 
 if not all([DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, DB_NAME]):
   raise ValueError("DB 접속 환경 변수가 설정되지 않았습니다.")
@@ -30,16 +46,61 @@ DB_URL_ASYNC = os.getenv("DB_URL")
 ARTICLES_PER_PAGE = 100
 TARGET_ARTICLES_PER_COMPANY = 300 
 REQUEST_TIMEOUT = 20
+NAVER_API_PAGE_DELAY = float(os.getenv("NAVER_API_PAGE_DELAY", "0.5")) # Naver API 페이지 요청 간 대기(초)
+# (선택) 기사 URL을 이 주소 아래로 바꿔서 요청: https://www.yna.co.kr/view/1 -> {base}/press/www.yna.co.kr/view/1
+# 로컬 mock 서버로 언론사 사이트를 대신할 때만 설정 (링크/언론사 판별은 원래 URL 기준 그대로)
+SCRAPE_URL_REWRITE_BASE = os.getenv("SCRAPE_URL_REWRITE_BASE")
+
+# --- 크롤 스케줄러 (기업별 수집 주기/깊이) ---
+CRAWL_SCHEDULER_ENABLED = os.getenv("CRAWL_SCHEDULER_ENABLED", "true").lower() != "false"
+CRAWL_API_BUDGET = int(os.getenv("CRAWL_API_BUDGET", "20000")) # 1회 실행(전체 샤드 합계)에서 쓸 Naver API 호출(페이지) 수
+CRAWL_MIN_EXPECTED_NEW = 5.0   # 신규 기사가 이만큼 쌓였을 것으로 예상될 때 다시 수집
+CRAWL_MAX_INTERVAL_DAYS = 14   # 기사가 거의 없는 기업도 이 기간이 지나면 한 번은 수집
+CRAWL_MAX_PAGES = 10           # 한 기업당 최대 페이지 수 (Naver API는 start 1000까지만 허용)
+CRAWL_DEMAND_WINDOW_DAYS = 7   # 수요(조회 수)를 합산할 기간
+CRAWL_EMA_ALPHA = 0.3          # 통계 갱신 가중치 (클수록 최근 수집 결과를 더 크게 반영)
+
+# --- 호스트별 스크래핑 라우팅 (aiohttp vs Selenium) ---
+HOST_ROUTER_WINDOW = 200        # 호스트/방식별로 기억할 최근 시도 수 (넘으면 비율 유지한 채 축소)
+HOST_ROUTER_PRIOR_WEIGHT = 5.0  # 사전 확률(prior)의 가중치 (관측 횟수로 환산)
+HOST_ROUTER_PROBE_EVERY = 20    # Selenium으로 보내는 호스트도 이 횟수마다 한 번은 aiohttp를 다시 시도
+
+# --- 고속 스크래핑 재시도 / 헤징 (fetch_policy) ---
+FAST_MAX_RETRIES = 2              # 일시적 실패(타임아웃, 429, 5xx)의 기사당 최대 재시도 횟수
+FAST_BACKOFF_BASE = 0.5           # 지수 백오프 기본 대기 시간(초)
+FAST_BACKOFF_MAX = 8.0            # 백오프/Retry-After 대기 상한(초)
+FAST_RETRY_BUDGET_RATIO = 0.1     # 요청 1건당 적립되는 재시도 토큰 (재시도+헤징은 전체 요청의 약 10% 이내)
+FAST_RETRY_BUDGET_INITIAL = 20.0  # 시작 시 토큰
+FAST_RETRY_BUDGET_CAPACITY = 100.0 # 최대 토큰
+FAST_HEDGE_DELAY_DEFAULT = 3.0    # 지연 표본이 부족할 때의 헤징 대기 시간(초) (이후엔 최근 p95)
 
 # --- 동시성 제어 ---
 CONCURRENT_REQUESTS_LINKS = 2
 CONCURRENT_REQUESTS_SCRAPE_FAST = 50 
 CONCURRENT_SELENIUM_TASKS = 1  
 
+# --- 체크포인트 (중단 후 재개) ---
+CHECKPOINT_BATCH_SIZE = 500 # 이 개수만큼 스크래핑할 때마다 기사 + 링크 상태를 커밋
+LINK_CLAIM_TTL_HOURS = 24   # 샤드 간 링크 점유 유효 시간 (만료되면 다른 실행이 다시 가져갈 수 있음)
+
+# --- 기업명 인덱스 (기사-기업 태깅) ---
+# 공용 임시 디렉터리 대신 사용자 캐시 디렉터리(0700)에 저장
+ENTITY_INDEX_CACHE_PATH = os.getenv(
+    "ENTITY_INDEX_CACHE_PATH",
+    os.path.join(os.getenv("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "insightbee", "company_index.json"),
+)
+
+# --- 실행 리포트 (계측) ---
+# 실행이 끝나면 <dir>/<run>.json (JSON 리포트) 과 <run>.prom (Prometheus 텍스트) 을 기록
+METRICS_REPORT_DIR = os.getenv(
+    "METRICS_REPORT_DIR", os.path.join(tempfile.gettempdir(), "insightbee_metrics")
+)
+
 # --- 언론사 및 사이트 분류 ---
 ALLOWED_PRESS_HOSTS = {
     'chosun.com', 'joongang.co.kr', 'donga.com', 'hani.co.kr', 'khan.co.kr', 'seoul.co.kr', 'kmib.co.kr', 'munhwa.com', 'segye.com', 'hankookilbo.com', 'news.kbs.or.kr', 'imnews.imbc.com', 'news.sbs.co.kr', 'ytn.co.kr', 'yonhapnewstv.co.kr', 'jtbc.co.kr', 'ichannela.com', 'mbn.co.kr', 'tvchosun.com', 'yna.co.kr', 'newsis.com', 'news1.kr', 'hankyung.com', 'mk.co.kr', 'edaily.co.kr', 'asiae.co.kr', 'wowtv.co.kr', 'fnnews.com', 'sedaily.co.kr', 'heraldcorp.com', 'moneys.co.kr', 'sentv.co.kr', 'etoday.co.kr', 'zdnet.co.kr', 'etnews.co.kr', 'ddaily.co.kr', 'inews24.com', 'bloter.net', 'dt.co.kr', 'ciokorea.com', 'it.chosun.com',
 }
+# JS 렌더링이 필요하다고 알려진 사이트 (host_router의 초기값(prior)으로만 사용, 이후엔 관측 결과로 판단)
 JAVASCRIPT_REQUIRED_SITES = {'imnews.imbc.com', 'news.sbs.co.kr', 'jtbc.co.kr'}
 SPIDER_RULES = {'chosun.com': 'section.article-body',
                 'news.sbs.co.kr': 'div.text_area',
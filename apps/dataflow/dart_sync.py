@@ -0,0 +1,98 @@
+import asyncio
+import os
+import tempfile
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from sqlalchemy import text
+
+from apps.dataflow.common.db_sa import async_engine
+from apps.dataflow.common import dart
+
+STAGING_TABLE = "companies_staging"
+STAGING_COLUMNS = ["corp_code", "name_ko", "name_en", "stock_code"]
+
+# staging -> companies upsert
+# - corp_code 기준, 이름/영문명/종목코드 중 하나라도 바뀐 행만 UPDATE (변경 없는 행은 쓰지 않음)
+# - xmax = 0 이면 새로 INSERT된 행
+UPSERT_SQL = f"""
+    WITH upserted AS (
+        INSERT INTO companies (corp_code, name_ko, name_en, stock_code, created_at)
+        SELECT DISTINCT ON (corp_code) corp_code, name_ko, name_en, stock_code, now()
+        FROM {STAGING_TABLE}
+        ORDER BY corp_code
+        ON CONFLICT (corp_code) DO UPDATE SET
+            name_ko = EXCLUDED.name_ko,
+            name_en = EXCLUDED.name_en,
+            stock_code = EXCLUDED.stock_code
+        WHERE (companies.name_ko, companies.name_en, companies.stock_code)
+              IS DISTINCT FROM (EXCLUDED.name_ko, EXCLUDED.name_en, EXCLUDED.stock_code)
+        RETURNING (xmax = 0) AS inserted
+    )
+    SELECT
+        COUNT(*) FILTER (WHERE inserted) AS inserted,
+        COUNT(*) FILTER (WHERE NOT inserted) AS updated
+    FROM upserted
+"""
+
+
+def _to_copy_records(records: Iterable[Dict[str, Optional[str]]]) -> Iterator[Tuple]:
+    """COPY용 튜플로 변환 (필수값 누락 행 제외, 컬럼 길이에 맞게 자름)"""
+    for r in records:
+        if not r["corp_code"] or not r["name_ko"]:
+            continue
+        yield (
+            r["corp_code"][:50],
+            r["name_ko"][:100],
+            r["name_en"][:100] if r["name_en"] else None,
+            r["stock_code"][:20] if r["stock_code"] else None,
+        )
+
+
+async def sync_companies(records: Iterable[Dict[str, Optional[str]]]) -> Dict[str, int]:
+    """
+    DART 기업 레코드를 COPY로 임시 staging 테이블에 넣은 뒤, companies에 한 번에 upsert.
+    레코드는 제너레이터 그대로 COPY에 흘려보내므로 전체를 메모리에 올리지 않음.
+    """
+    async with async_engine.begin() as conn:
+        await conn.execute(text(f"""
+            CREATE TEMP TABLE {STAGING_TABLE} (
+                corp_code  VARCHAR(50),
+                name_ko    VARCHAR(100),
+                name_en    VARCHAR(100),
+                stock_code VARCHAR(20)
+            ) ON COMMIT DROP
+        """))
+
+        # SQLAlchemy 트랜잭션과 같은 커넥션의 asyncpg 드라이버로 COPY 실행
+        raw_conn = await conn.get_raw_connection()
+        await raw_conn.driver_connection.copy_records_to_table(
+            STAGING_TABLE, records=_to_copy_records(records), columns=STAGING_COLUMNS
+        )
+        staged = (await conn.execute(text(f"SELECT COUNT(*) FROM {STAGING_TABLE}"))).scalar_one()
+
+        result = (await conn.execute(text(UPSERT_SQL))).mappings().one()
+        return {"staged": staged, "inserted": result["inserted"], "updated": result["updated"]}
+
+
+async def run_dart_sync() -> None:
+    tmp = tempfile.NamedTemporaryFile(suffix=".zip", delete=False)
+    tmp.close()
+    try:
+        # 1) corpCode zip 다운로드 (파일로 스트리밍)
+        dart.download_corpcode_zip(tmp.name)
+        print(f"[DART SYNC] downloaded corpCode zip ({os.path.getsize(tmp.name)} bytes)")
+
+        # 2) iterparse -> COPY -> upsert
+        stats = await sync_companies(dart.iter_corpcode_records(tmp.name))
+        print(
+            f"[DART SYNC] staged {stats['staged']} companies: "
+            f"{stats['inserted']} inserted, {stats['updated']} updated, "
+            f"{stats['staged'] - stats['inserted'] - stats['updated']} unchanged"
+        )
+    finally:
+        os.remove(tmp.name)
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_dart_sync())
@@ -0,0 +1,190 @@
+# apps/dataflow/news_pipeline/checkpoint.py
+"""
+[체크포인트] main_pipeline의 진행 상태를 DB에 기록하고, 중단된 실행을 이어서 처리합니다.
+- pipeline_runs      : 실행 1회의 현재 단계(stage)
+- pipeline_run_links : 수집된 링크 목록 + 링크별 처리 상태(status)
+- link_claims        : 샤드 간 링크 점유 (같은 URL을 두 샤드가 중복 스크래핑하지 않도록)
+
+링크 상태 변경(mark_links)은 기사 저장과 '같은 세션'에서 실행되어야 합니다.
+그래야 기사 커밋과 체크포인트가 함께 반영되거나 함께 롤백됩니다.
+"""
+import asyncio
+import json
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import insert, or_, update
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from ..common.db_sa import AsyncSessionLocal
+from ..common.models import PipelineRun, PipelineRunLink, LinkClaim
+from .. import config
+
+# --- 실행 단계 ---
+STAGE_SCRAPE_FAST = 'scrape_fast'
+STAGE_SCRAPE_ROBUST = 'scrape_robust'
+STAGE_CLUSTER = 'cluster'
+STAGE_DONE = 'done'
+STAGE_ABANDONED = 'abandoned'
+
+# --- 링크 상태 ---
+LINK_PENDING = 'pending'
+LINK_ROBUST = 'robust'
+LINK_DONE = 'done'
+LINK_DROPPED = 'dropped' # 영구 실패(404/410/451): 저장하지 않고 재개 시에도 다시 받지 않음
+
+_INSERT_CHUNK_SIZE = 1000
+_DEADLOCK_RETRIES = 3 # 링크 점유 중 교착(deadlock)으로 중단된 start_run 재시도 횟수
+
+
+async def find_resumable_run(shard: str) -> Optional[PipelineRun]:
+    """
+    [비동기] 같은 샤드에서 아직 끝나지 않은(done/abandoned가 아닌) 가장 최근 실행을 반환합니다.
+    """
+    async with AsyncSessionLocal() as session:
+        stmt = (
+            select(PipelineRun)
+            .where(
+                PipelineRun.shard == shard,
+                PipelineRun.stage.notin_([STAGE_DONE, STAGE_ABANDONED])
+            )
+            .order_by(PipelineRun.run_id.desc())
+            .limit(1)
+        )
+        result = await session.execute(stmt)
+        return result.scalars().first()
+
+
+async def _claim_links(session, run_id: int, url_hashes: List[str]) -> set:
+    """
+    link_claims에 url_hash를 점유 등록하고, 이 실행이 점유에 성공한 해시만 반환합니다.
+    - 처음 보는 해시: INSERT 성공
+    - 점유가 만료되었거나, 점유한 실행이 이미 끝난(done/abandoned) 해시: UPDATE로 점유를 넘겨받음
+    - 유효한 점유가 있는 해시: 아무것도 반환되지 않음 (다른 샤드가 처리 중)
+    모든 샤드가 같은 순서(정렬)로 행을 잠그도록 해서, 서로 상대가 잠근 행을 기다리는 교착을 피합니다.
+    """
+    url_hashes = sorted(set(url_hashes)) # 잠금 순서 통일 + 한 문장 안의 중복 키 제거
+    now = datetime.now()
+    expired_before = now - timedelta(hours=config.LINK_CLAIM_TTL_HOURS)
+    finished_runs = select(PipelineRun.run_id).where(PipelineRun.stage.in_([STAGE_DONE, STAGE_ABANDONED]))
+    claimed = set()
+
+    for i in range(0, len(url_hashes), _INSERT_CHUNK_SIZE):
+        chunk = url_hashes[i:i + _INSERT_CHUNK_SIZE]
+        stmt = pg_insert(LinkClaim).values(
+            [{"url_hash": h, "run_id": run_id, "claimed_at": now} for h in chunk]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[LinkClaim.url_hash],
+            set_={"run_id": stmt.excluded.run_id, "claimed_at": stmt.excluded.claimed_at},
+            where=or_(LinkClaim.claimed_at < expired_before, LinkClaim.run_id.in_(finished_runs)),
+        ).returning(LinkClaim.url_hash)
+        result = await session.execute(stmt)
+        claimed.update(result.scalars().all())
+
+    return claimed
+
+
+def _is_deadlock(e: DBAPIError) -> bool:
+    orig = e.orig
+    code = getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)
+    return code == "40P01" or "deadlock detected" in str(orig)
+
+
+async def start_run(links: List[Dict], shard: str) -> int:
+    """
+    [비동기] 새 실행을 만들고 수집된 링크 목록을 저장합니다.
+    - 같은 샤드에서 끝나지 않은 이전 실행은 'abandoned'로 표시합니다. (새 실행이 링크를 다시 수집했으므로)
+    - 다른 샤드가 이미 점유한 링크는 저장하지 않습니다. (샤드 간 중복 스크래핑 방지)
+    - 교착으로 트랜잭션이 중단되면 전체를 롤백하고 잠시 뒤 다시 시도합니다.
+    """
+    for attempt in range(1, _DEADLOCK_RETRIES + 1):
+        try:
+            return await _start_run_once(links, shard)
+        except DBAPIError as e:
+            if not _is_deadlock(e) or attempt == _DEADLOCK_RETRIES:
+                raise
+            logging.warning(f"[Checkpoint] Deadlock while claiming links (attempt {attempt}). Retrying.")
+            await asyncio.sleep(random.uniform(0.1, 0.5) * attempt)
+
+
+async def _start_run_once(links: List[Dict], shard: str) -> int:
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(PipelineRun)
+            .where(
+                PipelineRun.shard == shard,
+                PipelineRun.stage.notin_([STAGE_DONE, STAGE_ABANDONED])
+            )
+            .values(stage=STAGE_ABANDONED)
+        )
+
+        run = PipelineRun(shard=shard, stage=STAGE_SCRAPE_FAST)
+        session.add(run)
+        await session.flush() # run_id 발급
+
+        claimed = await _claim_links(session, run.run_id, [link['url_hash'] for link in links])
+        if len(claimed) < len(links):
+            logging.info(f"[Checkpoint] {len(links) - len(claimed)} links already claimed by other shards. Skipping them.")
+        links = [link for link in links if link['url_hash'] in claimed]
+        run.links_total = len(links)
+
+        rows = [
+            {
+                "run_id": run.run_id,
+                "url_hash": link['url_hash'],
+                "link_info": json.dumps(link, ensure_ascii=False),
+                "status": LINK_PENDING,
+            }
+            for link in links
+        ]
+        for i in range(0, len(rows), _INSERT_CHUNK_SIZE):
+            await session.execute(insert(PipelineRunLink), rows[i:i + _INSERT_CHUNK_SIZE])
+
+        await session.commit()
+        logging.info(f"[Checkpoint] Started run {run.run_id} (shard {shard}) with {len(links)} links.")
+        return run.run_id
+
+
+async def load_links(run_id: int, status: str) -> List[Dict]:
+    """
+    [비동기] 특정 실행에서 주어진 상태(status)의 링크 목록(link_info)을 불러옵니다.
+    """
+    async with AsyncSessionLocal() as session:
+        stmt = (
+            select(PipelineRunLink.link_info)
+            .where(PipelineRunLink.run_id == run_id, PipelineRunLink.status == status)
+            .order_by(PipelineRunLink.id)
+        )
+        result = await session.execute(stmt)
+        return [json.loads(row) for row in result.scalars().all()]
+
+
+async def mark_links(db_session: AsyncSession, run_id: int, url_hashes: List[str], status: str) -> None:
+    """
+    [비동기] 링크 상태를 변경합니다. (커밋은 호출한 쪽에서 기사와 함께 수행)
+    """
+    if not url_hashes:
+        return
+    await db_session.execute(
+        update(PipelineRunLink)
+        .where(PipelineRunLink.run_id == run_id, PipelineRunLink.url_hash.in_(url_hashes))
+        .values(status=status)
+    )
+
+
+async def set_stage(run_id: int, stage: str) -> None:
+    """
+    [비동기] 실행의 현재 단계를 기록합니다.
+    """
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(PipelineRun).where(PipelineRun.run_id == run_id).values(stage=stage)
+        )
+        await session.commit()
+    logging.info(f"[Checkpoint] Run {run_id} -> stage '{stage}'")
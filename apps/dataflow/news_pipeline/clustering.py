@@ -1,38 +1,63 @@
 # apps/dataflow/news_pipeline/clustering.py
 import logging
-import pandas as pd
-import numpy as np
-from sqlalchemy import text
-from sentence_transformers import SentenceTransformer, util
+from typing import List, Optional, TYPE_CHECKING
+from sqlalchemy import text, bindparam
 from apps.dataflow.common.db_sa import async_engine
+from apps.dataflow.common import metrics
+
+# pandas / sentence_transformers(torch)는 import만 수 초가 걸리므로 클러스터링할 기사가 있을 때만 로드
+if TYPE_CHECKING:
+    import pandas as pd
+
+MODEL_NAME = "distiluse-base-multilingual-cased-v1"
+_model = None # 프로세스당 한 번만 로드 (실행마다 모델을 다시 읽지 않도록)
+
+
+def get_model():
+    """문장 임베딩 모델 (처음 호출 시 로드 후 재사용)"""
+    global _model
+    if _model is None:
+        from sentence_transformers import SentenceTransformer
+        with metrics.timer("clustering_seconds", step="load_model"):
+            _model = SentenceTransformer(MODEL_NAME)
+    return _model
+
 
 # 동기(Sync) 함수: 실제 데이터 분석 및 클러스터링 수행
-def _perform_clustering_logic(df: pd.DataFrame):
+def _perform_clustering_logic(df: "pd.DataFrame", model=None):
     """
     Pandas DataFrame을 받아 AI 유사도 분석 후, 
     업데이트할 기사 ID 목록(대표/중복)을 반환합니다.
+    model: encode(문장 리스트) -> 임베딩 을 제공하는 객체 (없으면 MODEL_NAME 로드. 벤치마크에서는 가짜 인코더 주입)
     """
     if df.empty or len(df) < 2:
         return []
+    from sentence_transformers import util
 
     # 1. 임베딩 생성 (CPU/GPU 작업)
-    # (매번 로드하면 느리므로, 실제 운영 시에는 모델을 전역 로드하거나 별도 서버로 분리 권장)
-    model = SentenceTransformer("distiluse-base-multilingual-cased-v1")
-    embeddings = model.encode(df["content"].tolist())
+    if model is None:
+        model = get_model()
+    with metrics.timer("clustering_seconds", step="encode"):
+        embeddings = model.encode(df["content"].tolist())
 
     # 2. 클러스터링 (유사도 80% 이상)
     # min_community_size=2: 최소 2개 이상 묶여야 클러스터로 인정
-    clusters = util.community_detection(embeddings, min_community_size=2, threshold=0.8)
+    with metrics.timer("clustering_seconds", step="community_detection"):
+        clusters = util.community_detection(embeddings, min_community_size=2, threshold=0.8)
+    metrics.set_gauge("clustering_clusters", len(clusters))
 
     updates = []
     
     # 3. 결과 정리
-    for cluster_id, cluster_indices in enumerate(clusters):
+    for cluster_indices in clusters:
         # cluster_indices: [0, 5, 12] 같은 DataFrame의 행 인덱스 리스트
         
         # 첫 번째 기사를 '대표 기사'로 선정
         rep_idx = cluster_indices[0]
         rep_article_id = df.iloc[rep_idx]['article_id']
+        # 클러스터 ID = 대표 기사의 article_id
+        # (실행/샤드마다 0부터 번호를 매기면 서로 다른 그룹의 ID가 겹치므로 전역에서 유일한 값을 사용)
+        cluster_id = int(rep_article_id)
         
         updates.append({
             "article_id": int(rep_article_id),
@@ -52,20 +77,34 @@ def _perform_clustering_logic(df: pd.DataFrame):
     return updates
 
 # 비동기(Async) 래퍼 함수: Main.py에서 호출
-async def run_clustering_process():
+async def run_clustering_process(company_ids: Optional[List[int]] = None):
+    """
+    company_ids가 주어지면 해당 기업들의 기사만 클러스터링합니다.
+    (샤딩 실행 시 각 샤드가 자기 담당 기업만 처리하여 서로 겹치지 않게 함)
+    """
     logging.info("Starting AI Deduplication (Clustering)...")
     
     async with async_engine.begin() as conn:
         # 1. 아직 클러스터링 되지 않은(cluster_id IS NULL) + 필터 통과한(is_passed_rule=True) 기사 조회
         # (성능을 위해 최근 3일치만 조회하는 조건을 추가할 수도 있음)
-        query = text("""
+        sql = """
             SELECT article_id, content 
             FROM news_articles 
             WHERE cluster_id IS NULL 
               AND is_passed_rule = true
               AND content IS NOT NULL
-        """)
-        result = await conn.execute(query)
+        """
+        params = {}
+        if company_ids is not None:
+            if not company_ids:
+                logging.info("No companies assigned for clustering.")
+                return
+            sql += " AND company_id IN :company_ids"
+            params["company_ids"] = list(company_ids)
+        query = text(sql)
+        if params:
+            query = query.bindparams(bindparam("company_ids", expanding=True))
+        result = await conn.execute(query, params)
         rows = result.fetchall()
         
         if not rows:
@@ -73,8 +112,10 @@ async def run_clustering_process():
             return
 
         # Pandas DataFrame 변환
+        import pandas as pd
         df = pd.DataFrame(rows, columns=['article_id', 'content'])
         logging.info(f"Loaded {len(df)} articles for clustering.")
+        metrics.set_gauge("clustering_articles", len(df))
 
         # 2. CPU 집약적인 AI 작업은 별도 실행 (blocking 방지)
         # 데이터가 많으면 여기서 시간이 좀 걸립니다.
@@ -93,11 +134,16 @@ async def run_clustering_process():
         
         # 임시 테이블이나 CASE WHEN 구문을 쓰기보다, 간단하게 건별 업데이트 쿼리 실행 (또는 executemany)
         # SQLAlchemy async session의 execute는 리스트 파라미터를 지원함
+        # raw SQL이라 ORM onupdate가 적용되지 않으므로 updated_at을 직접 갱신 (증분 적재가 클러스터 변경을 내보내도록)
+        # 값이 그대로인 행은 건너뛰어, 매 실행마다 같은 기사를 다시 내보내지 않음
         update_stmt = text("""
             UPDATE news_articles
-            SET cluster_id = :cluster_id, is_representative = :is_representative
+            SET cluster_id = :cluster_id, is_representative = :is_representative, updated_at = NOW()
             WHERE article_id = :article_id
+              AND (cluster_id IS DISTINCT FROM :cluster_id OR is_representative IS DISTINCT FROM :is_representative)
         """)
         
-        await conn.execute(update_stmt, updates)
+        with metrics.timer("clustering_seconds", step="update"):
+            await conn.execute(update_stmt, updates)
+        metrics.inc("clustering_updates_total", len(updates))
         logging.info("AI Deduplication update complete.")
\ No newline at end of file
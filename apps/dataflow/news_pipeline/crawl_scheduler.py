@@ -0,0 +1,239 @@
+# apps/dataflow/news_pipeline/crawl_scheduler.py
+"""
+[크롤 스케줄러] 기업마다 '이번 실행에서 수집할지'와 '몇 건까지 수집할지'를 정합니다.
+모든 기업을 매번 TARGET_ARTICLES_PER_COMPANY(300건)씩 수집하는 대신,
+기업별 통계(company_crawl_stats)를 보고 전체 API 예산(config.CRAWL_API_BUDGET) 안에서 배분합니다.
+
+- arrival_rate : 하루 신규 기사 수 (EMA). 마지막 수집 후 쌓였을 기사 수 = arrival_rate * 경과일
+- link_yield   : 요청한 기사 수 대비 신규 링크 비율 (EMA). 필요한 요청 건수(깊이) 계산에 사용
+- 수요(demand) : 백엔드 기업 조회 수 (config.TABLE_COMPANY_DEMAND, 백엔드 app/api/demand.py가 적재).
+                 많이 조회되는 기업일수록 더 자주 수집
+
+수집 기준
+  1) 예상 신규 기사 수 >= CRAWL_MIN_EXPECTED_NEW / (1 + log(1 + 조회 수))
+  2) 또는 마지막 수집 후 CRAWL_MAX_INTERVAL_DAYS 경과
+  3) 한 번도 수집하지 않은 기업은 기본 깊이(TARGET_ARTICLES_PER_COMPANY)로 수집
+우선순위(예상 신규 기사 수 * 수요 가중치)가 높은 기업부터 예산이 소진될 때까지 배정합니다.
+"""
+import asyncio
+import logging
+import math
+from collections import Counter
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.future import select
+
+from ..common.db_sa import AsyncSessionLocal
+from ..common.models import CompanyCrawlStats
+from .. import config
+
+_UPSERT_CHUNK_SIZE = 2000
+_MIN_WINDOW_DAYS = 1 / 24 # 도착률 계산 시 최소 관측 기간 (1시간)
+_MIN_YIELD = 0.05         # 깊이 계산 시 yield 하한 (0에 가까우면 깊이가 폭주하므로)
+
+
+def _demand_weight(query_count: int) -> float:
+    return 1.0 + math.log1p(max(query_count, 0))
+
+
+def _default_pages() -> int:
+    return max(1, math.ceil(config.TARGET_ARTICLES_PER_COMPANY / config.ARTICLES_PER_PAGE))
+
+
+# --- 1. 통계 / 수요 로딩 ---
+
+async def load_crawl_stats() -> Dict[int, CompanyCrawlStats]:
+    """[비동기] company_id -> CompanyCrawlStats"""
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(select(CompanyCrawlStats))
+        return {row.company_id: row for row in result.scalars().all()}
+
+
+def _query_demand() -> Dict[str, int]:
+    """[동기] BigQuery 수요 테이블에서 최근 기간의 기업별 조회 수를 합산합니다."""
+    from google.cloud import bigquery # 수요 테이블을 쓰는 경우에만 필요
+
+    client = bigquery.Client(project=config.GCP_PROJECT_ID)
+    table_id = f"{config.GCP_PROJECT_ID}.{config.BIGQUERY_DATASET_ID}.{config.TABLE_COMPANY_DEMAND}"
+    query = f"""
+        SELECT company_name, SUM(request_count) AS requests
+        FROM `{table_id}`
+        WHERE event_date >= DATE_SUB(CURRENT_DATE(), INTERVAL @days DAY)
+        GROUP BY company_name
+    """
+    job_config = bigquery.QueryJobConfig(
+        query_parameters=[bigquery.ScalarQueryParameter("days", "INT64", config.CRAWL_DEMAND_WINDOW_DAYS)]
+    )
+    try:
+        return {row.company_name: int(row.requests or 0) for row in client.query(query, job_config=job_config).result()}
+    finally:
+        client.close()
+
+
+async def load_demand() -> Optional[Dict[str, int]]:
+    """
+    [비동기] 기업명 -> 최근 조회 수. 수요 테이블이 설정되지 않았거나 조회에 실패하면 None
+    (None이면 company_crawl_stats에 저장된 마지막 조회 수를 사용)
+    """
+    if not config.TABLE_COMPANY_DEMAND:
+        return None
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(None, _query_demand)
+    except Exception as e:
+        logging.warning(f"Failed to load company demand from BigQuery. Using stored counts: {e}")
+        return None
+
+
+# --- 2. 계획 (순수 함수) ---
+
+def plan_crawl(
+    company_map: Dict[str, int],
+    stats: Dict[int, CompanyCrawlStats],
+    demand: Optional[Dict[str, int]],
+    budget_pages: int,
+    now: Optional[datetime] = None,
+) -> Dict[str, int]:
+    """
+    이번 실행에서 수집할 기업과 기업별 최대 수집 건수(max_articles)를 반환합니다.
+    반환값: {기업명: max_articles} (우선순위 높은 순)
+    """
+    now = now or datetime.now()
+    candidates = [] # (우선순위, 기업명, 페이지 수)
+
+    for name, company_id in company_map.items():
+        s = stats.get(company_id)
+        query_count = demand.get(name, 0) if demand is not None else (s.query_count if s else 0)
+        weight = _demand_weight(query_count)
+
+        # 한 번도 수집하지 않은 기업: 기본 깊이, '방금 수집 기준을 넘은' 기업과 같은 우선순위
+        if s is None or s.last_crawled_at is None:
+            candidates.append((config.CRAWL_MIN_EXPECTED_NEW * weight, name, _default_pages()))
+            continue
+
+        elapsed_days = max((now - s.last_crawled_at).total_seconds() / 86400, 0.0)
+        expected_new = s.arrival_rate * elapsed_days
+        threshold = config.CRAWL_MIN_EXPECTED_NEW / weight
+        if expected_new < threshold and elapsed_days < config.CRAWL_MAX_INTERVAL_DAYS:
+            continue
+
+        # 예상 신규 기사를 모두 받으려면 몇 건을 요청해야 하는지 (여유분 20%)
+        articles_needed = expected_new / max(s.link_yield, _MIN_YIELD) * 1.2
+        pages = min(max(1, math.ceil(articles_needed / config.ARTICLES_PER_PAGE)), config.CRAWL_MAX_PAGES)
+        candidates.append((expected_new * weight, name, pages))
+
+    candidates.sort(key=lambda c: c[0], reverse=True)
+
+    plan: Dict[str, int] = {}
+    remaining = budget_pages
+    for _, name, pages in candidates:
+        if remaining <= 0:
+            break
+        pages = min(pages, remaining)
+        plan[name] = pages * config.ARTICLES_PER_PAGE
+        remaining -= pages
+
+    logging.info(
+        f"Crawl plan: {len(plan)} of {len(candidates)} due companies "
+        f"({len(company_map)} total), {budget_pages - remaining}/{budget_pages} API pages."
+    )
+    return plan
+
+
+async def build_crawl_plan(
+    company_map: Dict[str, int], demand: Optional[Dict[str, int]], shard_count: int = 1
+) -> Dict[str, int]:
+    """[비동기] 통계를 읽어 계획을 만듭니다. 전체 예산은 샤드 수로 나눠 씁니다."""
+    stats = await load_crawl_stats()
+    budget_pages = max(1, config.CRAWL_API_BUDGET // max(shard_count, 1))
+    return plan_crawl(company_map, stats, demand, budget_pages)
+
+
+# --- 3. 수집 후 통계 갱신 ---
+
+def _parse_pub_date(value: str) -> Optional[datetime]:
+    """Naver API pubDate (RFC 822, e.g. 'Mon, 06 Oct 2025 10:00:00 +0900') -> naive 로컬 시각"""
+    try:
+        return parsedate_to_datetime(value).astimezone().replace(tzinfo=None)
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def _ema(old: float, observed: float) -> float:
+    return (1 - config.CRAWL_EMA_ALPHA) * old + config.CRAWL_EMA_ALPHA * observed
+
+
+def update_stats(
+    company_map: Dict[str, int],
+    plan: Dict[str, int],
+    links: List[Dict[str, str]],
+    stats: Dict[int, CompanyCrawlStats],
+    demand: Optional[Dict[str, int]],
+    now: Optional[datetime] = None,
+) -> List[Dict]:
+    """
+    수집 결과(신규 링크 목록)로 계획에 포함된 기업의 새 통계 행을 계산합니다.
+    도착률 관측 기간 = 가장 오래된 신규 기사 발행 시각 ~ 지금 (마지막 수집 시각 이전으로는 늘리지 않음)
+    -> 요청 깊이가 부족해 일부만 받았을 때도 도착률을 과소평가하지 않음
+    """
+    now = now or datetime.now()
+    new_counts = Counter(link['search_keyword'] for link in links)
+    oldest_pub: Dict[str, datetime] = {}
+    for link in links:
+        published = _parse_pub_date(link.get('api_pubDate', ''))
+        name = link['search_keyword']
+        if published and (name not in oldest_pub or published < oldest_pub[name]):
+            oldest_pub[name] = published
+
+    rows = []
+    for name, requested in plan.items():
+        company_id = company_map[name]
+        s = stats.get(company_id)
+        new = new_counts.get(name, 0)
+
+        since_last = (now - s.last_crawled_at).total_seconds() / 86400 if s and s.last_crawled_at else None
+        window = since_last if since_last is not None else config.CRAWL_MAX_INTERVAL_DAYS
+        if name in oldest_pub:
+            window = min(window, (now - oldest_pub[name]).total_seconds() / 86400)
+        observed_rate = new / max(window, _MIN_WINDOW_DAYS)
+        observed_yield = min(new / requested, 1.0) if requested else 0.0
+
+        if s is None or s.last_crawled_at is None:
+            arrival_rate, link_yield = observed_rate, observed_yield
+        else:
+            arrival_rate, link_yield = _ema(s.arrival_rate, observed_rate), _ema(s.link_yield, observed_yield)
+
+        rows.append({
+            "company_id": company_id,
+            "arrival_rate": arrival_rate,
+            "link_yield": link_yield,
+            "query_count": demand.get(name, 0) if demand is not None else (s.query_count if s else 0),
+            "last_crawled_at": now,
+        })
+    return rows
+
+
+async def record_crawl(
+    company_map: Dict[str, int],
+    plan: Dict[str, int],
+    links: List[Dict[str, str]],
+    demand: Optional[Dict[str, int]],
+) -> None:
+    """[비동기] 링크 수집이 끝난 뒤 계획에 포함된 기업의 통계를 upsert합니다."""
+    if not plan:
+        return
+    rows = update_stats(company_map, plan, links, await load_crawl_stats(), demand)
+
+    async with AsyncSessionLocal() as session:
+        for i in range(0, len(rows), _UPSERT_CHUNK_SIZE):
+            stmt = pg_insert(CompanyCrawlStats).values(rows[i:i + _UPSERT_CHUNK_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[CompanyCrawlStats.company_id],
+                set_={col: stmt.excluded[col] for col in rows[0] if col != "company_id"},
+            )
+            await session.execute(stmt)
+        await session.commit()
+    logging.info(f"Updated crawl stats for {len(rows)} companies.")
@@ -0,0 +1,202 @@
+# apps/dataflow/news_pipeline/fetch_policy.py
+"""
+[고속 스크래핑 실패 정책] aiohttp 기사 다운로드의 실패 분류 / 재시도 / 헤징(hedged request)
+
+실패 분류
+- permanent : 404, 410, 451, 잘못된 URL  -> 재시도하지 않고 링크를 버림 (기사로 저장하지 않고 계측에만 집계)
+- transient : 타임아웃, 연결 오류, 408/425/429, 5xx -> aiohttp로 지수 백오프 재시도
+- render    : 403 등 그 외 4xx, 본문/제목 파싱 실패, 인코딩 오류 -> Selenium으로 넘김
+
+재시도와 헤징은 프로세스 전체가 공유하는 재시도 예산(RetryBudget)에서 토큰을 써야만 실행됩니다.
+(요청 1건당 FAST_RETRY_BUDGET_RATIO개씩 적립 -> 장애 시 재시도가 트래픽을 몇 배로 불리지 않음)
+헤징: 최근 다운로드 지연의 p95가 지나도 응답이 없으면 같은 요청을 하나 더 보내고 먼저 온 응답을 사용합니다.
+"""
+import asyncio
+import random
+from collections import deque
+from typing import Optional, Tuple
+from urllib.parse import urlparse
+
+import aiohttp
+
+from ..common import metrics
+from .. import config
+
+FAIL_PERMANENT = 'permanent'
+FAIL_TRANSIENT = 'transient'
+FAIL_RENDER = 'render'
+
+_PERMANENT_STATUSES = {404, 410, 451}
+_TRANSIENT_STATUSES = {408, 425, 429}
+
+
+class FetchError(Exception):
+    """분류된 다운로드 실패. kind: FAIL_PERMANENT / FAIL_TRANSIENT / FAIL_RENDER"""
+
+    def __init__(self, kind: str, reason: str, retry_after: Optional[float] = None):
+        super().__init__(f"{kind}: {reason}")
+        self.kind = kind
+        self.retry_after = retry_after
+
+
+def classify_status(status: int) -> Optional[str]:
+    """HTTP 상태 코드 분류. 2xx/3xx는 None (실패 아님)"""
+    if status < 400:
+        return None
+    if status in _PERMANENT_STATUSES:
+        return FAIL_PERMANENT
+    if status in _TRANSIENT_STATUSES or status >= 500:
+        return FAIL_TRANSIENT
+    return FAIL_RENDER # 403 등: 봇 차단/쿠키 요구인 경우가 많아 브라우저로 재시도
+
+
+def classify_exception(exc: BaseException) -> str:
+    if isinstance(exc, FetchError):
+        return exc.kind
+    if isinstance(exc, aiohttp.InvalidURL):
+        return FAIL_PERMANENT
+    if isinstance(exc, (asyncio.TimeoutError, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)):
+        return FAIL_TRANSIENT
+    return FAIL_RENDER # 파싱 실패(ValueError), 인코딩 오류, 리다이렉트 과다 등
+
+
+class RetryBudget:
+    """
+    프로세스 전체 재시도 예산 (토큰 버킷).
+    일반 요청마다 ratio개 적립, 재시도/헤징 1회마다 1개 소모. 토큰이 없으면 재시도하지 않음.
+    """
+
+    def __init__(self, ratio: float, initial: float, capacity: float):
+        self.ratio = ratio
+        self.capacity = capacity
+        self._tokens = initial
+        self.spent = 0
+        self.denied = 0
+
+    def on_request(self) -> None:
+        self._tokens = min(self._tokens + self.ratio, self.capacity)
+
+    def try_spend(self) -> bool:
+        if self._tokens >= 1:
+            self._tokens -= 1
+            self.spent += 1
+            return True
+        self.denied += 1
+        return False
+
+
+class LatencyTracker:
+    """최근 다운로드 지연(초)을 기억하고 분위수를 계산 (헤징 대기 시간 결정용)"""
+
+    def __init__(self, size: int = 500, min_samples: int = 20):
+        self._samples = deque(maxlen=size)
+        self._min_samples = min_samples
+
+    def add(self, latency: float) -> None:
+        self._samples.append(latency)
+
+    def quantile(self, q: float, default: float) -> float:
+        if len(self._samples) < self._min_samples:
+            return default
+        ordered = sorted(self._samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+# 프로세스 전체 공유 인스턴스
+retry_budget = RetryBudget(
+    config.FAST_RETRY_BUDGET_RATIO, config.FAST_RETRY_BUDGET_INITIAL, config.FAST_RETRY_BUDGET_CAPACITY
+)
+latency_tracker = LatencyTracker()
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """지수 백오프 + full jitter. 서버가 Retry-After를 주면 그 값을 따름 (상한 FAST_BACKOFF_MAX)"""
+    if retry_after is not None:
+        return min(retry_after, config.FAST_BACKOFF_MAX)
+    return random.uniform(0, min(config.FAST_BACKOFF_MAX, config.FAST_BACKOFF_BASE * (2 ** attempt)))
+
+
+def resolve_fetch_url(url: str) -> str:
+    """실제로 요청할 URL. config.SCRAPE_URL_REWRITE_BASE가 있으면 mock 서버 경로로 바꿈"""
+    if not config.SCRAPE_URL_REWRITE_BASE:
+        return url
+    parsed = urlparse(url)
+    path = parsed.path + (f"?{parsed.query}" if parsed.query else "")
+    return f"{config.SCRAPE_URL_REWRITE_BASE.rstrip('/')}/press/{parsed.hostname}{path}"
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None # HTTP-date 형식은 무시하고 기본 백오프 사용
+
+
+async def _get_once(session: aiohttp.ClientSession, url: str) -> Tuple[int, str, Optional[float]]:
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    host = (urlparse(url).hostname or '').lower()
+    async with session.get(resolve_fetch_url(url), timeout=config.REQUEST_TIMEOUT) as response:
+        metrics.inc("fetch_responses_total", host=host, status=response.status)
+        if response.status >= 400:
+            return response.status, "", _parse_retry_after(response.headers.get("Retry-After"))
+        body = await response.read()
+        html = await response.text() # read()한 본문을 그대로 디코딩 (다시 받지 않음)
+    elapsed = loop.time() - started
+    latency_tracker.add(elapsed)
+    metrics.observe("fetch_seconds", elapsed, host=host, method="fast")
+    metrics.inc("fetch_bytes_total", len(body), host=host)
+    return response.status, html, None
+
+
+async def _hedged_get(session: aiohttp.ClientSession, url: str) -> Tuple[int, str, Optional[float]]:
+    """p95 지연 안에 응답이 없으면 헤지 요청을 하나 더 보내고, 먼저 성공한 쪽을 반환합니다."""
+    primary = asyncio.ensure_future(_get_once(session, url))
+    hedge_delay = latency_tracker.quantile(0.95, config.FAST_HEDGE_DELAY_DEFAULT)
+    done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+    if done or not retry_budget.try_spend():
+        return await primary
+
+    metrics.inc("fetch_hedges_total")
+    pending = {primary, asyncio.ensure_future(_get_once(session, url))}
+    last_exc: Optional[BaseException] = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                last_exc = task.exception()
+        raise last_exc
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def fetch_html(session: aiohttp.ClientSession, url: str) -> str:
+    """
+    [비동기] 기사 HTML을 다운로드합니다. transient 실패만 백오프 후 재시도합니다.
+    실패 시 분류된 FetchError를 발생시킵니다.
+    """
+    retry_budget.on_request()
+    attempt = 0
+    while True:
+        try:
+            status, html, retry_after = await _hedged_get(session, url)
+            kind = classify_status(status)
+            if kind is None:
+                return html
+            error = FetchError(kind, f"HTTP {status}", retry_after)
+        except Exception as e:
+            error = e if isinstance(e, FetchError) else FetchError(classify_exception(e), repr(e))
+
+        if (
+            error.kind != FAIL_TRANSIENT
+            or attempt >= config.FAST_MAX_RETRIES
+            or not retry_budget.try_spend()
+        ):
+            metrics.inc("fetch_failures_total", kind=error.kind)
+            raise error
+        metrics.inc("fetch_retries_total", kind=error.kind)
+        await asyncio.sleep(backoff_delay(attempt, error.retry_after))
+        attempt += 1
@@ -2,6 +2,7 @@ import logging
 import re
 from typing import Dict, Any
 
+from ..common import metrics
 from . import keywords
 from . import filter_rules
 
@@ -35,6 +36,7 @@ def filter_and_score_article(scraped_article: Dict[str, Any]) -> Dict[str, Any]:
     for exclusion_keyword in exclusion_list:
         if exclusion_keyword.lower() in title.lower():
             logging.debug(f"[Filtered-Rule] '{title}' (contains: {exclusion_keyword})")
+            metrics.inc("filter_outcomes_total", rule="exclusion")
             return {
                 "passed": False, "score": 0,
                 "matched_keywords": f"ExclusionRule: {exclusion_keyword}"
@@ -53,6 +55,7 @@ def filter_and_score_article(scraped_article: Dict[str, Any]) -> Dict[str, Any]:
     # 만약 매칭된 키워드가 하나도 없다면, 즉시 탈락
     if not unique_found_words_lower:
         logging.debug(f"[Filtered-LowScore] No keywords found for '{title}'")
+        metrics.inc("filter_outcomes_total", rule="no_keywords")
         return {"passed": False, "score": 0, "matched_keywords": "[]"}
 
     # 찾은 키워드들(소문자)을 순회하며 점수 합산
@@ -66,6 +69,7 @@ def filter_and_score_article(scraped_article: Dict[str, Any]) -> Dict[str, Any]:
         # 즉시 탈락(-999) 로직은 여기서 함께 처리
         if value <= -999:
             logging.debug(f"[Filtered-Irrelevant] '{title}' (contains: {original_keyword})")
+            metrics.inc("filter_outcomes_total", rule="irrelevant")
             return {
                 "passed": False, "score": value,
                 "matched_keywords": str(matched_keywords_list)
@@ -74,6 +78,7 @@ def filter_and_score_article(scraped_article: Dict[str, Any]) -> Dict[str, Any]:
     # 3단계: 최종 임계값(Threshold) 검사
     if score < keywords.PASS_THRESHOLD:
         logging.debug(f"[Filtered-LowScore] Score {score} < {keywords.PASS_THRESHOLD} for '{title}'")
+        metrics.inc("filter_outcomes_total", rule="low_score")
         return {
             "passed": False, "score": score,
             "matched_keywords": str(matched_keywords_list)
@@ -81,6 +86,7 @@ def filter_and_score_article(scraped_article: Dict[str, Any]) -> Dict[str, Any]:
 
     # 4단계: 최종 통과
     logging.info(f"[PASSED] Score {score} for '{title}'")
+    metrics.inc("filter_outcomes_total", rule="passed")
     return {
         "passed": True, "score": score,
         "matched_keywords": str(matched_keywords_list)
@@ -0,0 +1,147 @@
+# apps/dataflow/news_pipeline/host_router.py
+"""
+[호스트별 스크래핑 라우팅] 기사 URL을 aiohttp(fast)로 먼저 시도할지, 바로 Selenium(robust)으로 보낼지 정합니다.
+config.JAVASCRIPT_REQUIRED_SITES는 초기값(prior)으로만 쓰고, 이후엔 host_fetch_stats에 쌓인
+호스트·방식별 성공률 / 지연 시간 / 본문 길이로 판단합니다.
+
+- fast 예상 비용   = fast 평균 지연 + (1 - fast 성공률) * robust 평균 지연  (실패하면 Selenium으로 넘어가므로)
+- robust 예상 비용 = robust 평균 지연
+- fast 본문이 robust 본문보다 눈에 띄게 짧으면(JS로 채워지는 본문 등) 그만큼 fast 성공률을 낮춰서 봄
+- robust로 보내는 호스트도 HOST_ROUTER_PROBE_EVERY번마다 한 번은 fast를 다시 시도 (사이트 개편 대응)
+
+통계는 메모리에서 갱신하고, save()가 호출될 때 증가분만 DB에 더합니다. (여러 샤드가 동시에 써도 합산됨)
+"""
+import logging
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.future import select
+
+from ..common.db_sa import AsyncSessionLocal
+from ..common.models import HostFetchStats
+from .. import config
+
+METHOD_FAST = 'fast'
+METHOD_ROBUST = 'robust'
+
+_STAT_FIELDS = ("attempts", "successes", "latency_sum", "text_length_sum")
+
+# 관측이 없을 때의 기본값 (성공률, 평균 지연(초))
+_PRIOR_SUCCESS = {METHOD_FAST: 0.8, METHOD_ROBUST: 0.9}
+_PRIOR_SUCCESS_JS_SITE = 0.05 # JAVASCRIPT_REQUIRED_SITES의 fast 성공률
+_PRIOR_LATENCY = {METHOD_FAST: 3.0, METHOD_ROBUST: 15.0}
+
+
+def host_of(url: str) -> str:
+    """라우팅 키: URL의 전체 호스트명 (e.g. 'news.sbs.co.kr')"""
+    return (urlparse(url).hostname or '').lower()
+
+
+def _is_js_site(host: str) -> bool:
+    return any(host == site or host.endswith('.' + site) for site in config.JAVASCRIPT_REQUIRED_SITES)
+
+
+def _empty_stats() -> Dict[str, float]:
+    return {field: 0.0 for field in _STAT_FIELDS}
+
+
+class HostRouter:
+    """호스트별 방식(fast/robust) 선택기. 통계는 (host, method) -> {attempts, successes, ...}"""
+
+    def __init__(self, stats: Optional[Dict[Tuple[str, str], Dict[str, float]]] = None):
+        self._stats: Dict[Tuple[str, str], Dict[str, float]] = stats or {}
+        self._pending: Dict[Tuple[str, str], Dict[str, float]] = {} # 아직 DB에 더하지 않은 증가분
+        self._robust_routed: Counter = Counter() # 호스트별 robust 배정 횟수 (재시도(probe) 주기 계산용)
+
+    # --- 통계 조회 ---
+    def success_rate(self, host: str, method: str) -> float:
+        prior = _PRIOR_SUCCESS_JS_SITE if method == METHOD_FAST and _is_js_site(host) else _PRIOR_SUCCESS[method]
+        s = self._stats.get((host, method)) or _empty_stats()
+        weight = config.HOST_ROUTER_PRIOR_WEIGHT
+        return (s["successes"] + prior * weight) / (s["attempts"] + weight)
+
+    def mean_latency(self, host: str, method: str) -> float:
+        s = self._stats.get((host, method)) or _empty_stats()
+        weight = config.HOST_ROUTER_PRIOR_WEIGHT
+        return (s["latency_sum"] + _PRIOR_LATENCY[method] * weight) / (s["attempts"] + weight)
+
+    def mean_text_length(self, host: str, method: str) -> Optional[float]:
+        s = self._stats.get((host, method))
+        if not s or s["successes"] < 1:
+            return None
+        return s["text_length_sum"] / s["successes"]
+
+    # --- 선택 ---
+    def choose(self, host: str) -> str:
+        """이 호스트의 기사를 어떤 방식으로 먼저 가져올지 반환합니다. (METHOD_FAST / METHOD_ROBUST)"""
+        p_fast = self.success_rate(host, METHOD_FAST)
+
+        # fast가 '성공'해도 본문이 robust보다 훨씬 짧다면 일부만 받아온 것으로 보고 성공률을 깎음
+        fast_len = self.mean_text_length(host, METHOD_FAST)
+        robust_len = self.mean_text_length(host, METHOD_ROBUST)
+        if fast_len is not None and robust_len:
+            p_fast *= min(1.0, fast_len / robust_len)
+
+        robust_latency = self.mean_latency(host, METHOD_ROBUST)
+        cost_fast = self.mean_latency(host, METHOD_FAST) + (1 - p_fast) * robust_latency
+        if cost_fast <= robust_latency:
+            return METHOD_FAST
+
+        self._robust_routed[host] += 1
+        if self._robust_routed[host] % config.HOST_ROUTER_PROBE_EVERY == 0:
+            return METHOD_FAST # 주기적으로 싼 경로를 다시 확인
+        return METHOD_ROBUST
+
+    # --- 기록 ---
+    def record(self, host: str, method: str, ok: bool, latency: float, text_length: int = 0) -> None:
+        delta = {"attempts": 1.0, "successes": 1.0 if ok else 0.0,
+                 "latency_sum": latency, "text_length_sum": float(text_length) if ok else 0.0}
+        for target in (self._stats, self._pending):
+            s = target.setdefault((host, method), _empty_stats())
+            for field, value in delta.items():
+                s[field] += value
+
+        # 최근 HOST_ROUTER_WINDOW번 정도만 반영되도록 비율을 유지한 채 축소 (DB 쪽은 save()에서 같은 방식)
+        s = self._stats[(host, method)]
+        if s["attempts"] > config.HOST_ROUTER_WINDOW:
+            scale = config.HOST_ROUTER_WINDOW / s["attempts"]
+            for field in _STAT_FIELDS:
+                s[field] *= scale
+
+    async def save(self) -> None:
+        """[비동기] 마지막 저장 이후의 증가분을 host_fetch_stats에 더합니다."""
+        if not self._pending:
+            return
+        rows = [
+            {"host": host[:255], "method": method, **delta}
+            for (host, method), delta in self._pending.items()
+        ]
+        stmt = pg_insert(HostFetchStats).values(rows)
+        total = HostFetchStats.attempts + stmt.excluded.attempts
+        scale = func.least(1.0, config.HOST_ROUTER_WINDOW / func.greatest(total, 1.0))
+        set_ = {field: (getattr(HostFetchStats, field) + stmt.excluded[field]) * scale for field in _STAT_FIELDS}
+        set_["updated_at"] = datetime.now()
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[HostFetchStats.host, HostFetchStats.method], set_=set_
+        )
+
+        async with AsyncSessionLocal() as session:
+            await session.execute(stmt)
+            await session.commit()
+        self._pending.clear()
+
+
+async def load_router() -> HostRouter:
+    """[비동기] host_fetch_stats를 읽어 라우터를 만듭니다."""
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(select(HostFetchStats))
+        stats = {
+            (row.host, row.method): {field: getattr(row, field) for field in _STAT_FIELDS}
+            for row in result.scalars().all()
+        }
+    logging.info(f"Loaded host routing stats for {len({host for host, _ in stats})} hosts.")
+    return HostRouter(stats)
@@ -1,7 +1,9 @@
 # apps/dataflow/news_pipeline/main.py
+import argparse
 import asyncio
 import logging
 import time
+from typing import Dict, List, Optional
 import aiohttp
 from tqdm.asyncio import tqdm
 
@@ -16,11 +18,18 @@ from ..common.db_sa import (
     async_engine 
 )
 from ..common.models import NewsArticle, Base 
+from ..common.entity_index import CompanyIndex, load_company_index_async
+from ..common import metrics # 실행 리포트 (JSON + Prometheus)
 
 # 파이프라인 모듈
 from . import scraper # 1. 링크 수집 2. 본문 스크래핑
 from . import filter  # 3. 기사 필터링
 from . import clustering # [NEW] 4. AI 중복 제거 모듈 추가
+from . import checkpoint # 실행 상태 기록 (중단 후 재개)
+from . import sharding # 여러 컨테이너 간 작업 분할
+from . import fetch_policy # 고속 스크래핑 재시도 예산
+from . import crawl_scheduler # 기업별 수집 주기/깊이 결정
+from .host_router import HostRouter, load_router # 호스트별 aiohttp/Selenium 선택
 from .. import config
 
 # 로깅 설정
@@ -45,91 +54,214 @@ async def setup_database_tables():
             raise 
 
 
-async def main_pipeline():
+def _batches(items: List[Dict], size: int):
+    """리스트를 size 단위로 잘라서 반환 (배치마다 커밋하기 위함)"""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+async def run_fast_phase(
+    run_id: int, links: List[Dict], company_map: Dict[str, int], company_index: Optional[CompanyIndex],
+    router: Optional[HostRouter] = None
+) -> None:
+    """
+    [Phase 1] 고속 스크래핑(aiohttp)을 배치 단위로 실행합니다.
+    배치마다 기사와 링크 상태(done / robust / dropped)를 한 트랜잭션으로 커밋하므로,
+    중간에 중단되어도 완료된 배치는 다시 스크래핑하지 않습니다.
+    """
+    logging.info(f"Starting Phase 1: Fast Scrape (aiohttp) for {len(links)} links...")
+    semaphore_fast = asyncio.Semaphore(config.CONCURRENT_REQUESTS_SCRAPE_FAST)
+    batches = list(_batches(links, config.CHECKPOINT_BATCH_SIZE))
+    total_retries = 0
+    total_dropped = 0
+
+    async with aiohttp.ClientSession() as aio_session:
+        for batch_no, batch in enumerate(batches, start=1):
+            async for session in get_db_session():
+                fast_tasks = []
+                for link in batch:
+                    task = scraper.scrape_and_process_fast(
+                        aio_session, 
+                        link, 
+                        semaphore_fast, 
+                        session, 
+                        company_map, 
+                        filter.filter_and_score_article,
+                        company_index,
+                        router
+                    )
+                    fast_tasks.append(task)
+
+                with metrics.timer("batch_seconds", stage="scrape_fast"):
+                    results = await tqdm.gather(*fast_tasks, desc=f"2. Fast Scrape (aiohttp) [{batch_no}/{len(batches)}]")
+                failed_links_for_selenium = [res for res in results if isinstance(res, dict)]
+                failed_hashes = {link['url_hash'] for link in failed_links_for_selenium}
+                dropped_hashes = {link['url_hash'] for link, res in zip(batch, results) if res is scraper.DROPPED}
+
+                # 성공한 링크는 done, 실패한 링크는 Selenium 대기(robust), 영구 실패는 dropped로 표시 후 기사와 함께 커밋
+                await checkpoint.mark_links(
+                    session, run_id,
+                    [link['url_hash'] for link in batch if link['url_hash'] not in failed_hashes | dropped_hashes],
+                    checkpoint.LINK_DONE
+                )
+                await checkpoint.mark_links(session, run_id, list(failed_hashes), checkpoint.LINK_ROBUST)
+                await checkpoint.mark_links(session, run_id, list(dropped_hashes), checkpoint.LINK_DROPPED)
+                await session.commit()
+                if router is not None:
+                    await router.save()
+                total_retries += len(failed_links_for_selenium)
+                total_dropped += len(dropped_hashes)
+
+    logging.info(
+        f"Phase 1 Complete. {len(links) - total_retries - total_dropped} success, "
+        f"{total_retries} retries, {total_dropped} dropped."
+    )
+    budget = fetch_policy.retry_budget
+    logging.info(f"Fast scrape retry budget: {budget.spent} retries/hedges used, {budget.denied} denied.")
+
+
+async def run_robust_phase(
+    run_id: int, links: List[Dict], company_map: Dict[str, int], company_index: Optional[CompanyIndex],
+    router: Optional[HostRouter] = None
+) -> None:
+    """
+    [Phase 2] 고속 스크래핑에 실패한 링크를 Selenium으로 배치 단위 재시도합니다.
+    """
+    logging.info(f"Starting Phase 2: Robust Scrape (Selenium) for {len(links)} links...")
+    semaphore_robust = asyncio.Semaphore(config.CONCURRENT_SELENIUM_TASKS)
+    loop = asyncio.get_running_loop()
+    batches = list(_batches(links, config.CHECKPOINT_BATCH_SIZE))
+
+    for batch_no, batch in enumerate(batches, start=1):
+        async for session in get_db_session():
+            robust_tasks = []
+            for link in batch:
+                task = scraper.scrape_and_process_robust(
+                    link, semaphore_robust, session, company_map, 
+                    filter.filter_and_score_article, loop, company_index, router
+                )
+                robust_tasks.append(task)
+
+            with metrics.timer("batch_seconds", stage="scrape_robust"):
+                await tqdm.gather(*robust_tasks, desc=f"3. Robust Scrape (Selenium) [{batch_no}/{len(batches)}]")
+
+            await checkpoint.mark_links(session, run_id, [link['url_hash'] for link in batch], checkpoint.LINK_DONE)
+            await session.commit()
+            if router is not None:
+                await router.save()
+
+
+async def main_pipeline(resume: bool = False, shard: sharding.Shard = (0, 1)):
     start_time = time.time() # 전체 실행 시간 측정 시작
+    shard_label = sharding.format_shard(shard)
     
-    # --- 0. DB 준비 (초기 데이터 로드) ---
+    # --- 0. DB 준비 (테이블 확인 + 초기 데이터 로드) ---
     try:
+        await setup_database_tables() # 체크포인트 테이블 등 없는 테이블만 생성
+
         company_map = await load_company_map_async()
         if not company_map:
             logging.error("Company map is empty. Cannot proceed."); return
-        
-        existing_url_hashes = await get_existing_url_hashes_async()
+
+        # 이 샤드가 담당하는 기업만 남김 (단일 실행이면 전체)
+        shard_company_map = sharding.select_shard(company_map, shard)
+        logging.info(f"Shard {shard_label}: {len(shard_company_map)} of {len(company_map)} companies assigned.")
+
+        run = await checkpoint.find_resumable_run(shard_label) if resume else None
         
     except Exception as e:
         logging.critical(f"Failed to connect or load initial data: {e}"); return 
 
-    # --- 1. 수집 대상 기업 선정 ---
-    target_companies = list(company_map.keys()) 
-    if not target_companies:
-        logging.info("No target companies found. Exiting."); return
-        
-    logging.info(f"Starting pipeline for {len(target_companies)} companies.")
+    # 본문 속 기업 태깅용 인덱스 (실패해도 태깅만 생략하고 파이프라인은 진행)
+    try:
+        company_index = await load_company_index_async()
+    except Exception as e:
+        logging.warning(f"Failed to load company index. Skipping company tagging: {e}")
+        company_index = None
 
-    # --- 2. 링크 수집 (Naver API) ---
-    links_to_scrape = await scraper.collect_all_links(target_companies, existing_url_hashes)
-    
-    # 신규 링크가 없더라도 클러스터링(중복제거) 로직은 돌려야 할 수 있으므로 바로 리턴하지 않고 체크
-    if links_to_scrape:
-        
-        # --- 단일 DB 트랜잭션 시작 (스크래핑용) ---
-        async for session in get_db_session():
-            async with aiohttp.ClientSession() as aio_session: 
-                try:
-                    # --- 3. 고속 스크래핑 (aiohttp) ---
-                    logging.info(f"Starting Phase 1: Fast Scrape (aiohttp) for {len(links_to_scrape)} links...")
-                    semaphore_fast = asyncio.Semaphore(config.CONCURRENT_REQUESTS_SCRAPE_FAST)
-                    
-                    fast_tasks = []
-                    for link in links_to_scrape:
-                        task = scraper.scrape_and_process_fast(
-                            aio_session, 
-                            link, 
-                            semaphore_fast, 
-                            session, 
-                            company_map, 
-                            filter.filter_and_score_article
-                        )
-                        fast_tasks.append(task)
-                    
-                    results = await tqdm.gather(*fast_tasks, desc="2. Fast Scrape (aiohttp)")
-                    failed_links_for_selenium = [res for res in results if res is not None]
-                    
-                    logging.info(f"Phase 1 Complete. {len(links_to_scrape) - len(failed_links_for_selenium)} success, {len(failed_links_for_selenium)} retries.")
-
-                    # --- 4. 안정 스크래핑 (Selenium) ---
-                    if failed_links_for_selenium: 
-                        logging.info(f"Starting Phase 2: Robust Scrape (Selenium) for {len(failed_links_for_selenium)} links...")
-                        semaphore_robust = asyncio.Semaphore(config.CONCURRENT_SELENIUM_TASKS)
-                        loop = asyncio.get_running_loop()
-                        robust_tasks = []
-
-                        for link in failed_links_for_selenium:
-                            task = scraper.scrape_and_process_robust(
-                                link, semaphore_robust, session, company_map, 
-                                filter.filter_and_score_article, loop
-                            )
-                            robust_tasks.append(task)
-                        
-                        await tqdm.gather(*robust_tasks, desc="3. Robust Scrape (Selenium)")
-                    
-                    # --- 5. 스크래핑 결과 커밋 ---
-                    logging.info("All scraping finished. Committing changes to DB...")
-                    await session.commit()
-                    logging.info("Successfully committed all articles to DB.")
-
-                except Exception as e:
-                    logging.error(f"An error occurred during the pipeline: {e}")
-                    await session.rollback()
-                    logging.warning("Session rolled back due to error.")
+    # 호스트별 스크래핑 방식 라우터 (실패 시 config.JAVASCRIPT_REQUIRED_SITES 기준으로 동작)
+    try:
+        router = await load_router()
+    except Exception as e:
+        logging.warning(f"Failed to load host routing stats. Using static JS site list: {e}")
+        router = None
+
+    if run:
+        # --- 1~2. (재개) 저장된 링크 목록을 사용하므로 링크 수집을 건너뜀 ---
+        run_id, stage = run.run_id, run.stage
+        logging.info(f"Resuming run {run_id} from stage '{stage}' ({run.links_total} links collected).")
     else:
-        logging.info("No new links to scrape. Skipping scraping phase.")
+        if resume:
+            logging.info("No interrupted run found. Starting a new run.")
+
+        # --- 1. 수집 대상 기업 선정 ---
+        # 스케줄러 사용 시: 통계/수요 기준으로 수집 시점이 된 기업만, 기업별 깊이와 함께 선정
+        crawl_plan, demand = None, None
+        if config.CRAWL_SCHEDULER_ENABLED:
+            demand = await crawl_scheduler.load_demand()
+            crawl_plan = await crawl_scheduler.build_crawl_plan(shard_company_map, demand, shard[1])
+            target_companies = list(crawl_plan.keys())
+        else:
+            target_companies = list(shard_company_map.keys()) 
+        if not target_companies:
+            # 수집할 기업이 없어도 클러스터링과 실행 리포트는 남기도록 빈 링크 목록으로 진행
+            logging.info("No target companies due for crawling. Skipping link collection.")
+            links_to_scrape = []
+        else:
+            logging.info(f"Starting pipeline for {len(target_companies)} companies.")
+
+            # --- 2. 링크 수집 (Naver API) ---
+            existing_url_hashes = await get_existing_url_hashes_async()
+            with metrics.timer("stage_seconds", stage="collect"):
+                links_to_scrape = await scraper.collect_all_links(target_companies, existing_url_hashes, crawl_plan)
+            if crawl_plan is not None:
+                await crawl_scheduler.record_crawl(shard_company_map, crawl_plan, links_to_scrape, demand)
 
-    # --- 6. [NEW] 후처리: AI 중복 제거 (클러스터링) ---
+        # 수집된 링크 목록을 체크포인트로 저장 (재개 시 API 재호출 불필요)
+        run_id = await checkpoint.start_run(links_to_scrape, shard_label)
+        stage = checkpoint.STAGE_SCRAPE_FAST
+
+    # 신규 링크가 없더라도 클러스터링(중복제거) 로직은 돌려야 할 수 있으므로 바로 리턴하지 않고 진행
+    scrape_ok = True
+    try:
+        # --- 3. 고속 스크래핑 (aiohttp) ---
+        if stage == checkpoint.STAGE_SCRAPE_FAST:
+            pending_links = await checkpoint.load_links(run_id, checkpoint.LINK_PENDING)
+            metrics.set_gauge("links_queued", len(pending_links), stage="scrape_fast")
+            if pending_links:
+                with metrics.timer("stage_seconds", stage="scrape_fast"):
+                    await run_fast_phase(run_id, pending_links, company_map, company_index, router)
+            else:
+                logging.info("No new links to scrape. Skipping scraping phase.")
+            await checkpoint.set_stage(run_id, checkpoint.STAGE_SCRAPE_ROBUST)
+            stage = checkpoint.STAGE_SCRAPE_ROBUST
+
+        # --- 4. 안정 스크래핑 (Selenium) ---
+        if stage == checkpoint.STAGE_SCRAPE_ROBUST:
+            failed_links_for_selenium = await checkpoint.load_links(run_id, checkpoint.LINK_ROBUST)
+            metrics.set_gauge("links_queued", len(failed_links_for_selenium), stage="scrape_robust")
+            if failed_links_for_selenium:
+                with metrics.timer("stage_seconds", stage="scrape_robust"):
+                    await run_robust_phase(run_id, failed_links_for_selenium, company_map, company_index, router)
+            await checkpoint.set_stage(run_id, checkpoint.STAGE_CLUSTER)
+            stage = checkpoint.STAGE_CLUSTER
+
+    except Exception as e:
+        # 완료된 배치는 이미 커밋되었으므로, '--resume'으로 남은 링크부터 이어서 처리 가능
+        scrape_ok = False
+        logging.error(f"An error occurred during the pipeline: {e}")
+        logging.warning(f"Run {run_id} stopped at stage '{stage}'. Re-run with --resume to continue.")
+
+    # --- 5. 후처리: AI 중복 제거 (클러스터링) ---
     # 스크래핑 트랜잭션과 별도로 실행하여, 스크래핑이 성공했다면 클러스터링도 시도
     try:
         logging.info("--- Starting Post-Processing Phase ---")
-        await clustering.run_clustering_process()
+        # 샤딩 실행이면 담당 기업의 기사만 클러스터링 (샤드 간 겹침 방지)
+        company_ids = list(shard_company_map.values()) if shard[1] > 1 else None
+        with metrics.timer("stage_seconds", stage="cluster"):
+            await clustering.run_clustering_process(company_ids)
+        if scrape_ok:
+            await checkpoint.set_stage(run_id, checkpoint.STAGE_DONE)
     except Exception as e:
         # 클러스터링 실패가 전체 파이프라인의 실패로 간주되진 않도록 로그만 남김
         logging.error(f"Clustering process failed: {e}")
@@ -137,9 +269,26 @@ async def main_pipeline():
     end_time = time.time()
     logging.info(f"Total execution time: {end_time - start_time:.2f} seconds")
 
+    # --- 6. 실행 리포트 (단계/호스트별 지연, 대기열, 폴백, 필터 결과 등) ---
+    metrics.set_gauge("pipeline_seconds", end_time - start_time)
+    metrics.set_gauge("scrape_ok", 1 if scrape_ok else 0)
+    try:
+        metrics.write_report(config.METRICS_REPORT_DIR, f"news_pipeline_shard{shard[0]}of{shard[1]}")
+    except OSError as e:
+        logging.warning(f"Failed to write run report: {e}")
+
 if __name__ == "__main__":
-    # 1. (최초 1회) 테이블 생성
-    # asyncio.run(setup_database_tables()) 
-    
-    # 2. 메인 파이프라인 실행
-    asyncio.run(main_pipeline())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="InsightBee news pipeline")
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="중단된 마지막 실행을 체크포인트부터 이어서 실행합니다."
+    )
+    parser.add_argument(
+        "--shard", type=sharding.parse_shard, default=None, metavar="i/N",
+        help="전체 기업 중 i번째 샤드(N개 중)만 처리합니다. "
+             "생략 시 CLOUD_RUN_TASK_INDEX/CLOUD_RUN_TASK_COUNT 환경변수를 사용합니다."
+    )
+    args = parser.parse_args()
+
+    # 메인 파이프라인 실행 (필요한 테이블은 시작 시 자동 생성)
+    asyncio.run(main_pipeline(resume=args.resume, shard=args.shard or sharding.default_shard()))
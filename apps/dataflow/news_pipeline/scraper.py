@@ -3,26 +3,24 @@ import asyncio
 import aiohttp
 import logging
 import hashlib
-from typing import List, Dict, Set, Optional, Any, Callable
+import time
+from typing import List, Dict, Set, Optional, Any, Callable, Union, TYPE_CHECKING
 from urllib.parse import urlparse
 from tqdm.asyncio import tqdm
 from datetime import datetime
 
-# 스크래핑 라이브러리
-import trafilatura # HTML에서 본문을 추출
-from newspaper import Article # HTML에서 제목, 날짜 등을 추출
-from bs4 import BeautifulSoup # 특정 규칙(SPIDER_RULES)을 적용하기 위한 HTML 파서
-from selenium import webdriver # Javascript 렌더링이 필요한 사이트용
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager # ChromeDriver 자동 설치/관리
+# 스크래핑 라이브러리 (trafilatura, newspaper, bs4, selenium)는 무겁기 때문에 실제로 쓰는 함수 안에서 import
+# -> 스크래핑할 기사가 없는 실행이나 Selenium을 쓰지 않는 실행은 이 비용을 치르지 않음 (benchmarks/import_time.py)
+if TYPE_CHECKING:
+    from selenium import webdriver
 
 # 비동기 DB 세션 및 모델 임포트
 from sqlalchemy.ext.asyncio import AsyncSession
-from ..common.models import NewsArticle # DB에 저장될 Article 객체 모델
+from ..common.models import NewsArticle, ArticleCompanyMention # DB에 저장될 Article 객체 모델
+from ..common.entity_index import CompanyIndex # 본문 속 기업 태깅용 인덱스
+from ..common import metrics # 실행 리포트용 계측
+from .host_router import HostRouter, host_of, METHOD_FAST, METHOD_ROBUST # 호스트별 fast/robust 선택
+from . import fetch_policy # 실패 분류 / 재시도 / 헤징
 
 from .. import config # 설정 임포트
 
@@ -37,10 +35,12 @@ def parse_date(date_obj: Any) -> Optional[datetime]:
 def create_db_object(
     scraped_data: Dict[str, Any], 
     filter_result: Dict[str, Any], 
-    company_map: Dict[str, int]
+    company_map: Dict[str, int],
+    company_index: Optional[CompanyIndex] = None
 ) -> Optional[NewsArticle]:
     """
     스크래핑된 데이터와 필터링 결과를 바탕으로 NewsArticle DB 객체를 생성합니다.
+    company_index가 주어지면 제목/본문에 언급된 기업도 함께 태깅합니다. (article_companies)
     """
     company_name = scraped_data['search_keyword']
     company_id = company_map.get(company_name) # 회사명(str)을 company_id(int)로 변환
@@ -50,10 +50,18 @@ def create_db_object(
         logging.warning(f"Skipping article (company_id not found for '{company_name}'): {scraped_data['url']}")
         return None
 
+    title = scraped_data.get('title', scraped_data.get('api_title', '제목 없음')) # 파싱 실패 시 API 제목 사용
+
+    # 제목 + 본문에 등장하는 모든 기업을 한 번의 순회로 태깅
+    mentions = []
+    if company_index is not None:
+        mentioned_ids = company_index.find_company_ids(f"{title}\n{scraped_data.get('content') or ''}")
+        mentions = [ArticleCompanyMention(company_id=cid) for cid in sorted(mentioned_ids)]
+
     # NewsArticle 모델 인스턴스 생성
     return NewsArticle(
         company_id=company_id,
-        title=scraped_data.get('title', scraped_data.get('api_title', '제목 없음')), # 파싱 실패 시 API 제목 사용
+        title=title,
         url=scraped_data['url'],
         url_hash=scraped_data['url_hash'],
         content=scraped_data.get('content'),
@@ -63,31 +71,41 @@ def create_db_object(
         score=filter_result['score'],
         matched_keywords=filter_result['matched_keywords'],
         
-        is_passed_rule=filter_result['passed']          
+        is_passed_rule=filter_result['passed'],
+
+        mentions=mentions
     )
 
 # --- 1. Naver API 링크 수집 ---
-async def fetch_naver_links_for_company(session: aiohttp.ClientSession, company: str, semaphore: asyncio.Semaphore) -> List[Dict[str, str]]:
+async def fetch_naver_links_for_company(
+    session: aiohttp.ClientSession, company: str, semaphore: asyncio.Semaphore,
+    max_articles: int = config.TARGET_ARTICLES_PER_COMPANY
+) -> List[Dict[str, str]]:
     headers = {"X-Naver-Client-Id": config.NAVER_CLIENT_ID, "X-Naver-Client-Secret": config.NAVER_CLIENT_SECRET}
     all_valid_links = [] # 수집된 링크(dict)를 저장 리스트
     
     # start_index 1부터 (최대 1000까지) 100개(ARTICLES_PER_PAGE)씩 증가하며 API 호출
-    for start_index in range(1, config.TARGET_ARTICLES_PER_COMPANY + 1, config.ARTICLES_PER_PAGE):
+    # max_articles: 이 기업에서 요청할 최대 건수 (crawl_scheduler가 기업별로 정함)
+    for start_index in range(1, max_articles + 1, config.ARTICLES_PER_PAGE):
         if start_index > 1000: break # Naver API는 1000 이상 조회를 막음
-        await asyncio.sleep(0.5) # Naver API 속도 제한 (0.1 -> 0.2)(초당 10회)
+        await asyncio.sleep(config.NAVER_API_PAGE_DELAY) # Naver API 속도 제한 (0.1 -> 0.2)(초당 10회)
 
-        api_url = f"https://openapi.naver.com/v1/search/news.json?query={company}&display={config.ARTICLES_PER_PAGE}&start={start_index}&sort=date"
+        api_url = f"{config.NAVER_API_BASE_URL}/v1/search/news.json?query={company}&display={config.ARTICLES_PER_PAGE}&start={start_index}&sort=date"
         
         async with semaphore: # 동시 요청 수 제어
             try:
+                started = time.perf_counter()
                 async with session.get(api_url, headers=headers, timeout=config.REQUEST_TIMEOUT) as response:
                     if response.status == 429: # 429: Rate Limit (요청 한도 초과)
                         logging.warning(f"Rate limit hit for '{company}'. Retrying...")
+                        metrics.inc("naver_api_requests_total", status=429)
                         await asyncio.sleep(1) # 1초 대기 후 재시도
                         response = await session.get(api_url, headers=headers, timeout=config.REQUEST_TIMEOUT)
 
+                    metrics.inc("naver_api_requests_total", status=response.status)
                     response.raise_for_status() # 4xx, 5xx 에러 시 예외 발생
                     data = await response.json()
+                    metrics.observe("naver_api_seconds", time.perf_counter() - started)
                     items = data.get('items', [])
                     if not items: break
                     for item in items:
@@ -110,31 +128,51 @@ async def fetch_naver_links_for_company(session: aiohttp.ClientSession, company:
                 break
     return all_valid_links
 
-async def collect_all_links(companies: List[str], existing_url_hashes: Set[str]) -> List[Dict[str, str]]:
+def dedupe_links(results: List[List[Dict[str, str]]], existing_url_hashes: Set[str]) -> List[Dict[str, str]]:
+    """
+    [순수 함수] 기업별 링크 목록(results)을 하나로 합치면서 중복을 제거합니다.
+    DB에 이미 있는 링크(existing_url_hashes)와 이번 결과 안의 중복(여러 기업 검색에 같은 기사)을 모두 제외하고,
+    남은 링크에 'url_hash'를 채워서 반환합니다.
+    """
+    unique_new_links = []
+    seen_hashes = set(existing_url_hashes)
+
+    # 2차원 리스트(results)를 1차원으로 풀면서 순회
+    for link_info in (link for sublist in results for link in sublist):
+        url_hash = hashlib.md5(link_info['url'].encode()).hexdigest() # URL 해시 생성
+        if url_hash not in seen_hashes: # 이번에 새로 수집된 링크인지 확인
+            link_info['url_hash'] = url_hash
+            unique_new_links.append(link_info)
+            seen_hashes.add(url_hash)# 방금 추가한 해시도 seen에 추가 (API 결과 내 중복 방지)
+    return unique_new_links
+
+async def collect_all_links(
+    companies: List[str], existing_url_hashes: Set[str], max_articles: Optional[Dict[str, int]] = None
+) -> List[Dict[str, str]]:
     """
     [비동기] 모든 대상 회사(companies)에 대해 링크 수집을 병렬로 실행합니다.
     DB에 이미 수집된 링크(existing_url_hashes)는 제외하고 신규 링크만 반환합니다.
+    max_articles: 기업별 최대 수집 건수 (없으면 모두 TARGET_ARTICLES_PER_COMPANY)
     """
     logging.info(f"Starting link collection for {len(companies)} companies...")
     semaphore = asyncio.Semaphore(config.CONCURRENT_REQUESTS_LINKS) # API 동시 요청 수 제어
     async with aiohttp.ClientSession() as session:
         # 모든 회사에 대해 fetch_naver_links_for_company 태스크 생성
-        tasks = [fetch_naver_links_for_company(session, company, semaphore) for company in companies]
+        tasks = [
+            fetch_naver_links_for_company(
+                session, company, semaphore,
+                (max_articles or {}).get(company, config.TARGET_ARTICLES_PER_COMPANY)
+            )
+            for company in companies
+        ]
         # tqdm으로 진행률을 표시하며 모든 태스크를 병렬 실행
         results = await tqdm.gather(*tasks, desc="1. Fetching Links (API)")
+        metrics.inc("links_fetched_total", sum(len(r) for r in results))
 
         # -- 중복 제거 --
-        unique_new_links = []
-        seen_hashes = set(existing_url_hashes)
-
-        # 2차원 리스트(results)를 1차원으로 풀면서 순회
-        for link_info in (link for sublist in results for link in sublist):
-            url_hash = hashlib.md5(link_info['url'].encode()).hexdigest() # URL 해시 생성
-            if url_hash not in seen_hashes: # 이번에 새로 수집된 링크인지 확인
-                link_info['url_hash'] = url_hash
-                unique_new_links.append(link_info)
-                seen_hashes.add(url_hash)# 방금 추가한 해시도 seen에 추가 (API 결과 내 중복 방지)
+        unique_new_links = dedupe_links(results, existing_url_hashes)
 
+        metrics.inc("links_new_total", len(unique_new_links))
         logging.info(f"Collected {len(unique_new_links)} new unique links to scrape.")
         return unique_new_links
 
@@ -144,24 +182,35 @@ def _parse_content_common(url: str, html: str, press: str) -> Dict[str, Any]:
     [동기] HTML 문자열을 받아 본문, 제목, 날짜를 파싱하는 공통 로직
     (aiohttp, Selenium 스크래퍼가 모두 이 함수를 사용)
     """
-    text = ""; soup = BeautifulSoup(html, 'html.parser')
+    import trafilatura # HTML에서 본문을 추출
+    from newspaper import Article # HTML에서 제목, 날짜 등을 추출
+    from bs4 import BeautifulSoup # 특정 규칙(SPIDER_RULES)을 적용하기 위한 HTML 파서
+
+    cpu_started = time.thread_time() # 이 스레드의 CPU 시간 (Selenium 스레드와 섞이지 않도록)
+    try:
+        text = ""; soup = BeautifulSoup(html, 'html.parser')
+
+        # 1. 특정 언론사 규칙(SPIDER_RULES)이 있으면 우선 적용
+        if press in config.SPIDER_RULES:
+            text_area = soup.select_one(config.SPIDER_RULES[press])
+            if text_area: text = text_area.get_text(strip=True)
+        # 2. 규칙이 없거나 실패 -> trafilatura 로 본문 자동 추출
+        if not text: text = trafilatura.extract(html)
 
-    # 1. 특정 언론사 규칙(SPIDER_RULES)이 있으면 우선 적용
-    if press in config.SPIDER_RULES:
-        text_area = soup.select_one(config.SPIDER_RULES[press])
-        if text_area: text = text_area.get_text(strip=True)
-    # 2. 규칙이 없거나 실패 -> trafilatura 로 본문 자동 추출
-    if not text: text = trafilatura.extract(html)
+        # 3. 본문 추출 실패 시 (너무 짧아서) 에러 발생
+        if not text or len(text) < 100: raise ValueError("Extracted text is too short.")
 
-    # 3. 본문 추출 실패 시 (너무 짧아서) 에러 발생
-    if not text or len(text) < 100: raise ValueError("Extracted text is too short.")
+        # 4. newspaper 라이브러리로 제목(title)과 발행일(publish_date) 추출
+        article = Article(url, language='ko'); article.set_html(html); article.parse()
+        if not article.title: raise ValueError("Failed to parse article title.")
+        return {"title": article.title, "content": text, "published_at": article.publish_date}
+    finally:
+        metrics.observe("parse_cpu_seconds", time.thread_time() - cpu_started, press=press)
 
-    # 4. newspaper 라이브러리로 제목(title)과 발행일(publish_date) 추출
-    article = Article(url, language='ko'); article.set_html(html); article.parse()
-    if not article.title: raise ValueError("Failed to parse article title.")
-    return {"title": article.title, "content": text, "published_at": article.publish_date}
+def _create_selenium_driver() -> "webdriver.Chrome":
+    from selenium import webdriver # Javascript 렌더링이 필요한 사이트용
+    from selenium.webdriver.chrome.options import Options
 
-def _create_selenium_driver() -> webdriver.Chrome:
     options = Options()
     options.add_argument("--headless")
     options.add_argument("--no-sandbox"); options.add_argument("--disable-dev-shm-usage"); options.add_argument("--disable-gpu")
@@ -181,10 +230,14 @@ def scrape_article_robust_sync(link_info: Dict) -> Optional[Dict]:
     [동기] Selenium을 사용하여 기사 1개를 스크래핑합니다.
     (이 함수는 동기 함수이므로, 비동기 loop.run_in_executor를 통해 별도 스레드에서 실행되어야 함)
     """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
     url = link_info['url']; driver = None
     try:
         # 드라이버 생성 및 페이지 접속
-        driver = _create_selenium_driver(); driver.get(url)
+        driver = _create_selenium_driver(); driver.get(fetch_policy.resolve_fetch_url(url))
         # config의 TIMEOUT 시간 동안 <body> 태그가 로드될 때 까지 대기
         WebDriverWait(driver, config.REQUEST_TIMEOUT).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
 
@@ -202,58 +255,149 @@ def scrape_article_robust_sync(link_info: Dict) -> Optional[Dict]:
     finally:
         if driver: driver.quit()
 
-# --- 3."스트림" 방식의 파이프라인 ---
-# main.py가 이 함수들을 호출.
+# --- 3. 단일 기사 스크래핑 (DB 저장 없음) ---
+# main.py의 스트림 파이프라인과 stages.py의 단계별 CLI가 함께 사용.
 
-async def scrape_and_process_fast(
-    session: aiohttp.ClientSession, # main.py의 aiohttp 세션
+class _Dropped:
+    """영구 실패(404/410/451)로 버리는 링크 표시. 기사로 저장하지 않고 Selenium 재시도도 하지 않음"""
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "DROPPED"
+
+DROPPED = _Dropped()
+
+async def scrape_fast(
+    session: aiohttp.ClientSession, # aiohttp 세션
     link_info: Dict,                # 수집된 링크 정보
     semaphore: asyncio.Semaphore,   # 동시 실행 제어용 세마포
-    db_session: AsyncSession,       # main.py의 DB 세션
-    company_map: Dict[str, int],    # 회사-ID 맵
-    filter_func: Callable           # filter.py의 필터링 함수
-) -> Optional[Dict]:
+    router: Optional[HostRouter] = None # 호스트별 라우터 (없으면 config.JAVASCRIPT_REQUIRED_SITES 기준)
+) -> Union[Dict, _Dropped, None]:
     """
-    [고속 스트림] aiohttp 스크래핑 -> 필터링 -> DB 세션에 추가
-    - 성공 시: None 반환
-    - 실패/JS 필요 시: Selenium 재시도를 위해 link_info 딕셔너리 반환
+    [고속 스크래핑] aiohttp로 기사 1개를 다운로드하고 파싱합니다.
+    - 성공 시: link_info + 파싱 결과(title, content, published_at) 딕셔너리 반환
+    - 영구 실패(404/410/451 등) 시: DROPPED 반환 (저장하지 않음, Selenium 재시도 안 함. 계측에만 집계)
+    - JS 필요/렌더링 필요 실패(403, 파싱 실패) 또는 재시도 소진 시: None 반환 (Selenium 재시도 대상)
     """
     url = link_info['url']
+    host = host_of(url)
+
+    # 1. 이 호스트는 Selenium으로 바로 보내는 게 나은지 확인 (타임아웃까지 기다리지 않도록 세마포 전에 판단)
+    if router is not None:
+        if router.choose(host) == METHOD_ROBUST:
+            metrics.inc("selenium_fallbacks_total", reason="routed")
+            return None # Selenium 재시도 (즉시 반환)
+    elif link_info['press'] in config.JAVASCRIPT_REQUIRED_SITES:
+        metrics.inc("selenium_fallbacks_total", reason="routed")
+        return None
+
+    metrics.add_gauge("scrape_queue_depth", 1, stage="fast") # 세마포 대기 중인 기사 수
     async with semaphore: # 동시 실행 제어
-        scraped_data = None
+        metrics.add_gauge("scrape_queue_depth", -1, stage="fast")
+        started = time.monotonic()
         try:
-            # 1. config에 지정된 'JS 필요 사이트'인지 확인
-            if link_info['press'] in config.JAVASCRIPT_REQUIRED_SITES:
-                return link_info # Selenium 재시도 (즉시 반환)
-            
-            # 2. [aiohttp] 비동기로 HTML 다운로드
-            async with session.get(url, timeout=config.REQUEST_TIMEOUT) as response:
-                html_content = await response.text()
+            # 2. [aiohttp] 비동기로 HTML 다운로드 (일시적 실패는 백오프 재시도, 느린 요청은 헤징)
+            html_content = await fetch_policy.fetch_html(session, url)
             
             # 3. [파싱] 공통 파싱 함수 호출
             parsed_data = _parse_content_common(url, html_content, link_info['press'])
-            scraped_data = {**link_info, **parsed_data}# 원본 link_info와 파싱 결과 결합
+            if router is not None:
+                router.record(host, METHOD_FAST, True, time.monotonic() - started, len(parsed_data['content']))
+            metrics.inc("scrape_results_total", method="fast", outcome="success")
+            return {**link_info, **parsed_data} # 원본 link_info와 파싱 결과 결합
             
         except Exception as e:
-            # aiohttp 실패 (타임아웃, 본문/제목 파싱 실패 등)
+            kind = fetch_policy.classify_exception(e)
+            metrics.inc("scrape_results_total", method="fast", outcome=kind)
+            if kind == fetch_policy.FAIL_PERMANENT:
+                # 없는 기사(404 등): 브라우저로도 받을 수 없고, 본문 없는 빈 기사로 저장하지도 않음
+                logging.warning(f"Fast Scrape GAVE UP for {url} (Reason: {e}). Dropping link.")
+                return DROPPED
+
+            # 렌더링 필요(403, 파싱 실패) 또는 일시적 실패의 재시도 소진 -> Selenium
+            if router is not None:
+                router.record(host, METHOD_FAST, False, time.monotonic() - started)
+            metrics.inc("selenium_fallbacks_total", reason=kind)
             logging.error(f"Fast Scrape FAILED for {url} (Reason: {e}). Retrying with Selenium.")
-            return link_info # Selenium 재시도
+            return None # Selenium 재시도
 
-        # [스크래핑 성공 시]
+async def scrape_robust(
+    link_info: Dict,                # 재시도 대상 링크 정보
+    semaphore: asyncio.Semaphore,   # Selenium용 세마포 (동시 실행 수 적음)
+    loop: asyncio.AbstractEventLoop, # run_in_executor용 이벤트 루프
+    router: Optional[HostRouter] = None # 호스트별 라우터 (결과 기록용)
+) -> Optional[Dict]:
+    """
+    [안정 스크래핑] Selenium으로 기사 1개를 스크래핑합니다.
+    - 본문 파싱에 실패해도 API 제목 등 기본 정보(link_info)는 반환
+    - 스레드 실행 자체가 실패한 경우에만 None 반환
+    """
+    url = link_info['url']
+    metrics.add_gauge("scrape_queue_depth", 1, stage="robust")
+    async with semaphore: # 동시 실행 제어
+        metrics.add_gauge("scrape_queue_depth", -1, stage="robust")
         try:
-            # 4. [필터링] main.py로부터 전달받은 filter_func 즉시 호출
-            filter_result = filter_func(scraped_data)
-
-            # 5. [DB 객체 생성]
-            db_article = create_db_object(scraped_data, filter_result, company_map)
-            if db_article:
-                # 6. [DB 세션에 추가] main.py의 세션에 객체를 추가 (커밋X, 추가만)
-                db_session.add(db_article)
-            return None # 성공
-        # 필터링 또는 DB 객체 생성/추가 실패 시
+            # [Selenium] 동기 함수인 scrape_article_robust_sync를
+            # 별도 스레드에서 실행 (비동기 루프를 막지 않기 위함)
+            started = time.monotonic()
+            result = await loop.run_in_executor(None, scrape_article_robust_sync, link_info)
+            content = result.get('content') if result else None
+            elapsed = time.monotonic() - started
+            if router is not None:
+                router.record(host_of(url), METHOD_ROBUST, bool(content), elapsed, len(content or ''))
+            metrics.observe("fetch_seconds", elapsed, host=host_of(url), method="robust")
+            metrics.inc("scrape_results_total", method="robust", outcome="success" if content else "failed")
+            return result
         except Exception as e:
-            logging.error(f"Fast Scrape Filtering/DB-Add FAILED for {url}: {e}")
-            return None # DB 저장 실패 시 재시도 안 함
+            logging.error(f"Robust Scrape Executor FAILED for {url}: {e}")
+            return None # 스레드 실행 자체 실패 시 중단
+
+def _filter_and_add(
+    scraped_data: Dict,
+    db_session: AsyncSession,
+    company_map: Dict[str, int],
+    filter_func: Callable,
+    company_index: Optional[CompanyIndex] = None
+) -> None:
+    """스크래핑 결과를 필터링하고 DB 세션에 추가합니다. (커밋X, 추가만)"""
+    filter_result = filter_func(scraped_data)
+    db_article = create_db_object(scraped_data, filter_result, company_map, company_index)
+    if db_article:
+        db_session.add(db_article)
+
+# --- 4."스트림" 방식의 파이프라인 ---
+# main.py가 이 함수들을 호출.
+
+async def scrape_and_process_fast(
+    session: aiohttp.ClientSession, # main.py의 aiohttp 세션
+    link_info: Dict,                # 수집된 링크 정보
+    semaphore: asyncio.Semaphore,   # 동시 실행 제어용 세마포
+    db_session: AsyncSession,       # main.py의 DB 세션
+    company_map: Dict[str, int],    # 회사-ID 맵
+    filter_func: Callable,          # filter.py의 필터링 함수
+    company_index: Optional[CompanyIndex] = None, # 기업 태깅용 인덱스 (없으면 태깅 생략)
+    router: Optional[HostRouter] = None # 호스트별 라우터
+) -> Union[Dict, _Dropped, None]:
+    """
+    [고속 스트림] aiohttp 스크래핑 -> 필터링 -> DB 세션에 추가
+    - 성공 시: None 반환
+    - 영구 실패(404 등) 시: DROPPED 반환 (DB에 추가하지 않음)
+    - 실패/JS 필요 시: Selenium 재시도를 위해 link_info 딕셔너리 반환
+    """
+    scraped_data = await scrape_fast(session, link_info, semaphore, router)
+    if scraped_data is None:
+        return link_info # Selenium 재시도
+    if scraped_data is DROPPED:
+        return DROPPED
+
+    # [스크래핑 성공 시] 필터링 -> DB 세션에 추가
+    try:
+        _filter_and_add(scraped_data, db_session, company_map, filter_func, company_index)
+        return None # 성공
+    # 필터링 또는 DB 객체 생성/추가 실패 시
+    except Exception as e:
+        logging.error(f"Fast Scrape Filtering/DB-Add FAILED for {link_info['url']}: {e}")
+        return None # DB 저장 실패 시 재시도 안 함
 
 async def scrape_and_process_robust(
     link_info: Dict,                # 재시도 대상 링크 정보
@@ -261,39 +405,22 @@ async def scrape_and_process_robust(
     db_session: AsyncSession,       # main.py의 DB 세션
     company_map: Dict[str, int],    # 회사-ID 맵
     filter_func: Callable,          # filter.py의 필터링 함수
-    loop: asyncio.AbstractEventLoop # run_in_executor용 이벤트 루프
+    loop: asyncio.AbstractEventLoop, # run_in_executor용 이벤트 루프
+    company_index: Optional[CompanyIndex] = None, # 기업 태깅용 인덱스 (없으면 태깅 생략)
+    router: Optional[HostRouter] = None # 호스트별 라우터
 ):
     """
     [안정 스트림] Selenium 스크래핑 -> 필터링 -> DB 세션에 추가
     (이 함수는 반환값이 없음. 성공/실패 모두 여기서 처리)
     """
-    url = link_info['url']
-    async with semaphore: # 동시 실행 제어
-        scraped_data = None
-        try:
-            # 1. [Selenium] 동기 함수인 scrape_article_robust_sync를
-            #    별도 스레드에서 실행 (비동기 루프를 막지 않기 위함)
-            scraped_data = await loop.run_in_executor(None, scrape_article_robust_sync, link_info)
+    scraped_data = await scrape_robust(link_info, semaphore, loop, router)
+    if not scraped_data:
+        return # 스레드 실행 자체 실패 시 중단
 
-            if not scraped_data:
-                # scrape_article_robust_sync가 치명적 오류로 None을 반환한 경우)
-                return 
-            
-        except Exception as e:
-            logging.error(f"Robust Scrape Executor FAILED for {url}: {e}")
-            return # 스레드 실행 자체 실패 시 중단
-
-        # [스크래핑 성공 (또는 부분 성공) 시]
-        try:
-            # 2. [필터링] main.py로부터 전달받은 filter_func 즉시 호출
-            # (Selenium이 본문 파싱에 실패했더라도, API 제목이라도 있으면 필터링 시도)
-            filter_result = filter_func(scraped_data)
-            # 3. 즉시 DB 객체 생성
-            db_article = create_db_object(scraped_data, filter_result, company_map)
-            if db_article:
-                # 4. 즉시 DB 세션에 추가 (커밋은 main에서 한 번에)
-                db_session.add(db_article)
-
-        except Exception as e:
-            # 필터링 또는 DB 객체 생성/추가 실패 시
-            logging.error(f"Robust Scrape Filtering/DB-Add FAILED for {url}: {e}")
\ No newline at end of file
+    # [스크래핑 성공 (또는 부분 성공) 시]
+    # (Selenium이 본문 파싱에 실패했더라도, API 제목이라도 있으면 필터링 시도)
+    try:
+        _filter_and_add(scraped_data, db_session, company_map, filter_func, company_index)
+    except Exception as e:
+        # 필터링 또는 DB 객체 생성/추가 실패 시
+        logging.error(f"Robust Scrape Filtering/DB-Add FAILED for {link_info['url']}: {e}")
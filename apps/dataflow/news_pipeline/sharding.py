@@ -0,0 +1,49 @@
+# apps/dataflow/news_pipeline/sharding.py
+"""
+[샤딩] 여러 dataflow 컨테이너가 기업 목록을 겹치지 않게 나눠서 처리하도록 합니다.
+- '--shard i/N' 옵션 또는 Cloud Run Jobs의 CLOUD_RUN_TASK_INDEX / CLOUD_RUN_TASK_COUNT 환경변수 사용
+- 기업명의 MD5 해시로 샤드를 정하므로 프로세스/실행이 달라도 항상 같은 샤드에 배정됨
+  (파이썬 내장 hash()는 프로세스마다 값이 달라서 사용하면 안 됨)
+"""
+import hashlib
+import os
+from typing import Dict, Tuple
+
+Shard = Tuple[int, int] # (shard_index, shard_count)
+
+
+def parse_shard(spec: str) -> Shard:
+    """'i/N' 문자열을 (i, N) 튜플로 변환합니다. (0 <= i < N)"""
+    try:
+        index_str, count_str = spec.split('/')
+        index, count = int(index_str), int(count_str)
+    except ValueError:
+        raise ValueError(f"Invalid shard spec '{spec}' (expected 'i/N', e.g. '0/4')")
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Invalid shard spec '{spec}' (need 0 <= i < N)")
+    return index, count
+
+
+def default_shard() -> Shard:
+    """Cloud Run Jobs 태스크 환경변수로 샤드를 정합니다. (없으면 단일 샤드 0/1)"""
+    index = int(os.getenv("CLOUD_RUN_TASK_INDEX", "0"))
+    count = int(os.getenv("CLOUD_RUN_TASK_COUNT", "1"))
+    return index, count
+
+
+def shard_of(key: str, shard_count: int) -> int:
+    """문자열 키가 속하는 샤드 번호를 반환합니다."""
+    digest = hashlib.md5(key.encode('utf-8')).hexdigest()
+    return int(digest, 16) % shard_count
+
+
+def select_shard(company_map: Dict[str, int], shard: Shard) -> Dict[str, int]:
+    """company_map 중 이 샤드가 담당하는 기업만 남깁니다."""
+    index, count = shard
+    if count == 1:
+        return dict(company_map)
+    return {name: cid for name, cid in company_map.items() if shard_of(name, count) == index}
+
+
+def format_shard(shard: Shard) -> str:
+    return f"{shard[0]}/{shard[1]}"
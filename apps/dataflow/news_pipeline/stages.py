@@ -0,0 +1,258 @@
+# apps/dataflow/news_pipeline/stages.py
+"""
+[단계별 CLI] 파이프라인을 collect / scrape / filter / export / cluster 단계로 나눠서 실행합니다.
+각 단계는 Parquet 파일로 데이터를 주고받으므로, 단계마다 다른 사양의 머신에서 실행하거나
+실패한 단계만 다시 실행하거나, 단계별로 따로 성능을 측정할 수 있습니다.
+
+    collect : Naver API 링크 수집            -> links.parquet
+    scrape  : links.parquet 본문 스크래핑     -> scraped.parquet   (DB 저장 없음)
+    filter  : scraped.parquet 필터링/스코어링 -> filtered.parquet
+    export  : filtered.parquet -> news_articles 테이블 저장 (이미 있는 url_hash는 건너뜀)
+    cluster : news_articles의 미처리 기사 AI 중복 제거
+
+사용 예)
+    python -m apps.dataflow.news_pipeline.stages collect --output links.parquet --shard 0/4
+    python -m apps.dataflow.news_pipeline.stages scrape --input links.parquet --output scraped.parquet
+    python -m apps.dataflow.news_pipeline.stages filter --input scraped.parquet --output filtered.parquet
+    python -m apps.dataflow.news_pipeline.stages export --input filtered.parquet
+    python -m apps.dataflow.news_pipeline.stages cluster --shard 0/4
+"""
+import argparse
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List
+
+import aiohttp
+from tqdm.asyncio import tqdm
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from sqlalchemy.future import select
+
+from ..common.db_sa import (
+    get_db_session,
+    load_company_map_async,
+    get_existing_url_hashes_async,
+    async_engine
+)
+from ..common.models import NewsArticle
+from ..common.entity_index import load_company_index_async
+from . import scraper
+from . import filter
+from . import clustering
+from . import sharding
+from . import crawl_scheduler
+from .host_router import load_router
+from .main import setup_database_tables
+from ..common import metrics
+from .. import config
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+# --- 단계별 산출물 컬럼 ---
+LINK_COLUMNS = ['url', 'url_hash', 'press', 'search_keyword', 'api_title', 'api_pubDate']
+SCRAPED_COLUMNS = LINK_COLUMNS + ['title', 'content', 'published_at', 'scrape_method']
+FILTERED_COLUMNS = SCRAPED_COLUMNS + ['score', 'matched_keywords', 'passed']
+
+
+def write_artifact(records: List[Dict[str, Any]], path: str, columns: List[str]) -> None:
+    """레코드 리스트를 Parquet 파일로 저장합니다."""
+    import pandas as pd # 무거운 의존성이라 산출물을 다룰 때만 로드
+    df = pd.DataFrame.from_records(records, columns=columns)
+    df.to_parquet(path, index=False)
+    logging.info(f"Wrote {len(df)} rows to {path}")
+
+
+def read_artifact(path: str) -> List[Dict[str, Any]]:
+    """Parquet 파일을 레코드 리스트로 읽습니다. (NaN/NaT는 None으로 변환)"""
+    import pandas as pd
+    df = pd.read_parquet(path)
+    df = df.astype(object).where(df.notna(), None)
+    records = df.to_dict('records')
+    for record in records:
+        if record.get('published_at') is not None:
+            record['published_at'] = pd.Timestamp(record['published_at']).to_pydatetime()
+    logging.info(f"Read {len(records)} rows from {path}")
+    return records
+
+
+# --- 1. collect ---
+async def run_collect(output: str, shard: sharding.Shard) -> None:
+    company_map = sharding.select_shard(await load_company_map_async(), shard)
+    if not company_map:
+        logging.error("Company map is empty. Cannot proceed."); return
+
+    crawl_plan, demand = None, None
+    if config.CRAWL_SCHEDULER_ENABLED:
+        await setup_database_tables() # company_crawl_stats가 없으면 생성
+        demand = await crawl_scheduler.load_demand()
+        crawl_plan = await crawl_scheduler.build_crawl_plan(company_map, demand, shard[1])
+    targets = list(crawl_plan.keys()) if crawl_plan is not None else list(company_map.keys())
+
+    existing_url_hashes = await get_existing_url_hashes_async()
+    links = await scraper.collect_all_links(targets, existing_url_hashes, crawl_plan)
+    if crawl_plan is not None:
+        await crawl_scheduler.record_crawl(company_map, crawl_plan, links, demand)
+    write_artifact(links, output, LINK_COLUMNS)
+
+
+# --- 2. scrape ---
+async def run_scrape(input_path: str, output: str) -> None:
+    links = read_artifact(input_path)
+    scraped: List[Dict[str, Any]] = []
+    await setup_database_tables() # host_fetch_stats가 없으면 생성
+    router = await load_router()
+
+    # Phase 1: 고속 스크래핑 (aiohttp)
+    semaphore_fast = asyncio.Semaphore(config.CONCURRENT_REQUESTS_SCRAPE_FAST)
+    async with aiohttp.ClientSession() as aio_session:
+        results = await tqdm.gather(
+            *[scraper.scrape_fast(aio_session, link, semaphore_fast, router) for link in links],
+            desc="2. Fast Scrape (aiohttp)"
+        )
+
+    failed_links = []
+    dropped = 0
+    for link, result in zip(links, results):
+        if result is None:
+            failed_links.append(link)
+        elif result is scraper.DROPPED:
+            dropped += 1 # 영구 실패(404 등)는 산출물에 남기지 않음 (계측에만 집계)
+        else:
+            scraped.append({**result, 'scrape_method': 'fast'})
+    logging.info(f"Phase 1 Complete. {len(scraped)} success, {len(failed_links)} retries, {dropped} dropped.")
+
+    # Phase 2: 안정 스크래핑 (Selenium)
+    if failed_links:
+        semaphore_robust = asyncio.Semaphore(config.CONCURRENT_SELENIUM_TASKS)
+        loop = asyncio.get_running_loop()
+        results = await tqdm.gather(
+            *[scraper.scrape_robust(link, semaphore_robust, loop, router) for link in failed_links],
+            desc="3. Robust Scrape (Selenium)"
+        )
+        for result in results:
+            if result:
+                # 본문 파싱까지 실패한 경우에도 API 제목으로 필터링할 수 있도록 남김
+                method = 'selenium' if result.get('content') else 'failed'
+                scraped.append({**result, 'scrape_method': method})
+
+    await router.save()
+
+    for record in scraped:
+        record['published_at'] = scraper.parse_date(record.get('published_at'))
+    write_artifact(scraped, output, SCRAPED_COLUMNS)
+
+
+# --- 3. filter ---
+def run_filter(input_path: str, output: str) -> None:
+    records = read_artifact(input_path)
+    filtered = []
+    for record in records:
+        # filter_and_score_article은 None 대신 빈 문자열을 기대함
+        article = {k: v for k, v in record.items() if v is not None}
+        filter_result = filter.filter_and_score_article(article)
+        filtered.append({**record, **filter_result})
+    logging.info(f"Filtered {len(filtered)} articles ({sum(r['passed'] for r in filtered)} passed).")
+    write_artifact(filtered, output, FILTERED_COLUMNS)
+
+
+# --- 4. export ---
+async def run_export(input_path: str) -> None:
+    records = read_artifact(input_path)
+    company_map = await load_company_map_async()
+    company_index = await load_company_index_async()
+    inserted = 0
+
+    for i in range(0, len(records), config.CHECKPOINT_BATCH_SIZE):
+        batch = records[i:i + config.CHECKPOINT_BATCH_SIZE]
+        async for session in get_db_session():
+            # 이미 저장된 기사는 건너뜀 (export를 다시 실행해도 중복 저장되지 않음)
+            result = await session.execute(
+                select(NewsArticle.url_hash).where(NewsArticle.url_hash.in_([r['url_hash'] for r in batch]))
+            )
+            existing = set(result.scalars().all())
+
+            for record in batch:
+                if record['url_hash'] in existing:
+                    continue
+                filter_result = {
+                    'score': int(record['score']),
+                    'matched_keywords': record['matched_keywords'],
+                    'passed': bool(record['passed']),
+                }
+                scraped_data = {k: v for k, v in record.items() if v is not None}
+                db_article = scraper.create_db_object(scraped_data, filter_result, company_map, company_index)
+                if db_article:
+                    session.add(db_article)
+                    inserted += 1
+            await session.commit()
+
+    logging.info(f"Exported {inserted} new articles to DB ({len(records) - inserted} skipped).")
+
+
+# --- 5. cluster ---
+async def run_cluster(shard: sharding.Shard) -> None:
+    company_ids = None
+    if shard[1] > 1:
+        company_map = sharding.select_shard(await load_company_map_async(), shard)
+        company_ids = list(company_map.values())
+    await clustering.run_clustering_process(company_ids)
+
+
+async def _run_async(coro) -> None:
+    try:
+        await coro
+    finally:
+        await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="InsightBee news pipeline (stage-by-stage)")
+    subparsers = parser.add_subparsers(dest="stage", required=True)
+
+    p = subparsers.add_parser("collect", help="Naver API 링크 수집")
+    p.add_argument("--output", required=True)
+    p.add_argument("--shard", type=sharding.parse_shard, default=None, metavar="i/N")
+
+    p = subparsers.add_parser("scrape", help="본문 스크래핑 (aiohttp -> Selenium)")
+    p.add_argument("--input", required=True)
+    p.add_argument("--output", required=True)
+
+    p = subparsers.add_parser("filter", help="기사 필터링/스코어링")
+    p.add_argument("--input", required=True)
+    p.add_argument("--output", required=True)
+
+    p = subparsers.add_parser("export", help="필터링 결과를 news_articles에 저장")
+    p.add_argument("--input", required=True)
+
+    p = subparsers.add_parser("cluster", help="AI 중복 제거 (클러스터링)")
+    p.add_argument("--shard", type=sharding.parse_shard, default=None, metavar="i/N")
+
+    args = parser.parse_args()
+    start_time = time.time()
+
+    if args.stage == "collect":
+        asyncio.run(_run_async(run_collect(args.output, args.shard or sharding.default_shard())))
+    elif args.stage == "scrape":
+        asyncio.run(_run_async(run_scrape(args.input, args.output)))
+    elif args.stage == "filter":
+        run_filter(args.input, args.output)
+    elif args.stage == "export":
+        asyncio.run(_run_async(run_export(args.input)))
+    elif args.stage == "cluster":
+        asyncio.run(_run_async(run_cluster(args.shard or sharding.default_shard())))
+
+    elapsed = time.time() - start_time
+    logging.info(f"Stage '{args.stage}' finished in {elapsed:.2f} seconds")
+    metrics.observe("stage_seconds", elapsed, stage=args.stage)
+    metrics.write_report(config.METRICS_REPORT_DIR, f"stage_{args.stage}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# apps/dataflow/tests/test_sharding.py
+"""
+[다중 프로세스 테스트] 여러 샤드가 동시에 돌아도 같은 기업/기사를 두 번 가져가지 않는지 확인합니다.
+- 기업 분할 : 프로세스마다 PYTHONHASHSEED가 달라도 '--shard i/N' 결과가 서로 겹치지 않고 전체를 덮어야 함
+- 링크 점유 : 모든 샤드가 같은 URL 목록을 동시에 start_run 해도 link_claims 덕분에 각 URL은 한 실행에만 저장되어야 함
+              (Postgres 필요 -> TEST_DB_URL 환경변수가 있을 때만 실행. 테스트 전용 DB를 사용할 것, 점유 테이블을 비움)
+
+실행: python -m unittest apps.dataflow.tests.test_sharding
+      TEST_DB_URL=postgresql+asyncpg://user:pw@localhost:5432/insightbee_test python -m unittest apps.dataflow.tests.test_sharding
+"""
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import unittest
+
+SHARD_COUNT = 3
+COMPANIES = {f"테스트기업{i}": i + 1 for i in range(60)}
+LINKS = [
+    {"url_hash": f"{i:032x}", "url": f"https://news.example.com/{i}", "company_name": f"테스트기업{i % 60}"}
+    for i in range(500)
+]
+TEST_DB_URL = os.getenv("TEST_DB_URL")
+
+_SELECT_SHARD_SCRIPT = """
+import json, sys
+from apps.dataflow.news_pipeline import sharding
+companies = json.loads(sys.stdin.read())
+print(json.dumps(sorted(sharding.select_shard(companies, sharding.parse_shard(sys.argv[1])))))
+"""
+
+
+def _use_test_db_env() -> None:
+    """config import 전에 호출: DB 접속 주소는 테스트 DB, 나머지 필수 값은 더미"""
+    from apps.dataflow.benchmarks import use_dummy_db_env
+    os.environ["DB_URL"] = TEST_DB_URL
+    use_dummy_db_env()
+
+
+def _start_run_worker(shard_index: int, barrier, results) -> None:
+    """[자식 프로세스] 모든 샤드가 모이면 동시에 같은 링크 목록으로 start_run"""
+    _use_test_db_env()
+    from apps.dataflow.common.db_sa import async_engine
+    from apps.dataflow.news_pipeline import checkpoint
+
+    links = list(LINKS)
+    random.Random(shard_index).shuffle(links) # 샤드마다 다른 순서로 점유 시도
+
+    async def run():
+        try:
+            barrier.wait()
+            return await checkpoint.start_run(links, f"{shard_index}/{SHARD_COUNT}")
+        finally:
+            await async_engine.dispose()
+
+    results.put(asyncio.run(run()))
+
+
+class ShardPartitionTest(unittest.TestCase):
+    def test_shards_are_disjoint_and_cover_all_companies_across_processes(self):
+        assigned = []
+        for index in range(SHARD_COUNT):
+            env = dict(os.environ, PYTHONHASHSEED=str(index + 1)) # 내장 hash()에 의존하면 프로세스마다 결과가 달라짐
+            out = subprocess.run(
+                [sys.executable, "-c", _SELECT_SHARD_SCRIPT, f"{index}/{SHARD_COUNT}"],
+                input=json.dumps(COMPANIES), capture_output=True, text=True, env=env, check=True,
+            )
+            assigned.append(set(json.loads(out.stdout)))
+
+        for i in range(SHARD_COUNT):
+            for j in range(i + 1, SHARD_COUNT):
+                overlap = assigned[i] & assigned[j]
+                self.assertEqual(len(overlap), 0, f"shards {i} and {j} share companies: {sorted(overlap)[:5]}")
+        self.assertEqual(set().union(*assigned), set(COMPANIES))
+
+
+@unittest.skipUnless(TEST_DB_URL, "TEST_DB_URL is not set (link claim test needs a disposable Postgres database)")
+class LinkClaimRaceTest(unittest.TestCase):
+    def setUp(self):
+        _use_test_db_env()
+        from sqlalchemy import text
+        from apps.dataflow.common.db_sa import async_engine
+        from apps.dataflow.common.models import Base
+
+        async def reset():
+            async with async_engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+                await conn.execute(text("TRUNCATE link_claims, pipeline_run_links, pipeline_runs CASCADE"))
+            await async_engine.dispose()
+
+        asyncio.run(reset())
+
+    def _links_by_run(self, run_ids):
+        from sqlalchemy import select
+        from apps.dataflow.common.db_sa import async_engine
+        from apps.dataflow.common.models import PipelineRunLink
+
+        async def load():
+            async with async_engine.connect() as conn:
+                result = await conn.execute(
+                    select(PipelineRunLink.run_id, PipelineRunLink.url_hash).where(PipelineRunLink.run_id.in_(run_ids))
+                )
+                rows = result.all()
+            await async_engine.dispose()
+            return rows
+
+        links = {run_id: set() for run_id in run_ids}
+        for run_id, url_hash in asyncio.run(load()):
+            links[run_id].add(url_hash)
+        return links
+
+    def test_concurrent_shards_never_store_the_same_link(self):
+        ctx = multiprocessing.get_context("spawn")
+        barrier = ctx.Barrier(SHARD_COUNT)
+        results = ctx.Queue()
+        workers = [ctx.Process(target=_start_run_worker, args=(i, barrier, results)) for i in range(SHARD_COUNT)]
+        for worker in workers:
+            worker.start()
+        run_ids = [results.get(timeout=120) for _ in workers]
+        for worker in workers:
+            worker.join(timeout=60)
+            self.assertEqual(worker.exitcode, 0)
+
+        links = self._links_by_run(run_ids)
+        claimed = list(links.values())
+        for i in range(len(claimed)):
+            for j in range(i + 1, len(claimed)):
+                overlap = claimed[i] & claimed[j]
+                self.assertEqual(len(overlap), 0, f"two runs stored the same {len(overlap)} links (double fetch)")
+        self.assertEqual(set().union(*claimed), {link["url_hash"] for link in LINKS})
+
+
+if __name__ == "__main__":
+    unittest.main()